@@ -2,32 +2,404 @@
 API_ROUTES.PY - FastAPI রাউটস (Android App এর জন্য)
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse, FileResponse
-from typing import List, Optional
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends, Request, Response
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
+import gzip
 import logging
 import json
+import mimetypes
+import os
+import orjson
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
 
 from config import Config
-from database import DatabaseManager
-from cloudinary_handler import CloudinaryManager
-from security import SecurityManager
-from file_manager import FileManager
+from database import ACTIVITY_COLUMNS, FILE_COLUMNS, ROLLUP_GROUPS
+from profiler import ProfilingMiddleware, list_profiles
+from reconciler import ISSUE_KINDS, CloudReconciler
+from metrics import REGISTRY, DELETE_QUEUE_DEPTH, UPLOAD_QUEUE_DEPTH, MetricsMiddleware
+from archive_export import ARCHIVE_FORMATS, ArchiveExporter
+from charts import CHART_METRICS, GRANULARITIES, MATPLOTLIB_AVAILABLE, max_periods, render_png, upload_chart
+from chunk_store import CODEC_CHUNKED
+from cloud_gc import CloudGarbageCollector
+from download_cache import DownloadCache
+from live_events import EventPublisher
+from services import log_startup_report, services, startup_report
+from metadata_export import EXPORT_FORMATS, GZIP_MEDIA_TYPE, encode_rows, export_filename
+from thumbnails import ThumbnailService
+from upload_timing import UploadTimeline, slowest_uploads
+from upload_queue import UploadQueueWorker, create_spool_path, remove_spool_path
 
 app = FastAPI(title="Auto Backup Pro API")
-db = DatabaseManager()
-cloudinary = CloudinaryManager()
-security = SecurityManager()
-file_manager = FileManager()
+# শেয়ার্ড লেজি ইনস্ট্যান্স (বটের সাথে একই) - প্রথম ব্যবহারে তৈরি
+db = services.lazy('db')
+cloudinary = services.lazy('cloudinary')
+security = services.lazy('security')
+file_manager = services.lazy('file_manager')
+chunk_store = services.lazy('chunk_store')
+
+app.add_middleware(ProfilingMiddleware, verify_api_key=lambda key: security.verify_api_key(key))
+app.add_middleware(MetricsMiddleware)
 
 logger = logging.getLogger(__name__)
 
+
+class UploadTracker:
+    """চলমান আপলোড ট্র্যাকার - শাটডাউনের আগে ড্রেইন করার জন্য"""
+    
+    def __init__(self):
+        self.active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+    
+    @asynccontextmanager
+    async def track(self):
+        self.active += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            if self.active == 0:
+                self._idle.set()
+    
+    async def wait_idle(self, timeout: float) -> bool:
+        """সব আপলোড শেষ হওয়া পর্যন্ত অপেক্ষা (টাইমআউট হলে False)"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+upload_tracker = UploadTracker()
+
+
+def iter_original(file_info: Dict) -> Iterator[bytes]:
+    """স্টোর করা ফাইলের অরিজিনাল বাইট (চাংক জোড়া, ডিক্রিপ্ট, ডিকম্প্রেস - যা লাগে)"""
+    if file_info.get('codec') == CODEC_CHUNKED:
+        return chunk_store.iter_file(file_info['file_hash'])
+    return cloudinary.iter_file(
+        file_info['cloudinary_url'], file_info.get('codec'), file_info.get('key_id')
+    )
+
+
+def fetch_original(file_info: Dict, dest_path: str):
+    """অরিজিনাল ফাইল লোকাল পাথে (ব্লকিং)"""
+    with open(dest_path, 'wb') as f:
+        for block in iter_original(file_info):
+            f.write(block)
+
+
+thumbnail_service = ThumbnailService(fetch_original)
+download_cache = DownloadCache(fetch_original)
+archive_exporter = ArchiveExporter(iter_original, download_cache.path)
+
+
+def store_upload(temp_path: str, device_id: str, timeline: UploadTimeline = None) -> Dict:
+    """টেম্প ফাইল Cloudinary-তে আপলোড করে ডাটাবেজে সেভ (ব্লকিং)"""
+    timings = {}
+    # বড় ডকুমেন্ট/আর্কাইভ চাংক স্টোরে (শুধু বদলানো অংশ আপলোড)
+    uploader = chunk_store if chunk_store.should_chunk(temp_path) else cloudinary
+    upload_result = uploader.upload_file(temp_path, tags=[f"device:{device_id}"], timings=timings)
+    
+    if timeline:
+        for name, seconds in timings.items():
+            timeline.add(name, seconds)
+        timeline.file_size = upload_result.get('file_size', 0)
+    
+    if not upload_result['success']:
+        raise RuntimeError(upload_result['error'])
+    
+    # ডাটাবেজে সেভ
+    file_data = {
+        'file_hash': upload_result['file_hash'],
+        'filename': upload_result['filename'],
+        'file_size': upload_result['file_size'],
+        'file_type': upload_result['file_type'],
+        'cloudinary_id': upload_result['cloudinary_id'],
+        'cloudinary_url': upload_result['cloudinary_url'],
+        'original_path': upload_result['original_path'],
+        'device_name': device_id,
+        'codec': upload_result.get('codec'),
+        'key_id': upload_result.get('key_id'),
+        'stored_size': upload_result.get('stored_size'),
+        'resource_type': upload_result.get('resource_type')
+    }
+    
+    if timeline:
+        with timeline.stage('db'):
+            db.add_file(file_data)
+    else:
+        db.add_file(file_data)
+    
+    # থাম্বনেইল প্রসেস পুলে তৈরি হবে - আপলোড অপেক্ষা করে না
+    try:
+        thumbnail_service.schedule(upload_result['file_hash'], temp_path)
+    except Exception as e:
+        logger.error(f"❌ থাম্বনেইল শিডিউল এরর: {e}")
+    
+    event_publisher.notify()
+    return upload_result
+
+
+def process_queued_upload(job: Dict) -> Dict:
+    """কিউ জব হ্যান্ডলার"""
+    timeline = UploadTimeline(Path(job['spool_path']).name, job['device_name'])
+    try:
+        result = store_upload(job['spool_path'], job['device_name'], timeline)
+    except Exception:
+        timeline.finish("error")
+        raise
+    timeline.finish("queued")
+    return result
+
+
+upload_queue_worker = UploadQueueWorker(db, process_queued_upload, tracker=upload_tracker)
+event_publisher = EventPublisher(db)
+reconciler = CloudReconciler(db, cloudinary)
+cloud_gc = CloudGarbageCollector(db, cloudinary)
+
+UPLOAD_QUEUE_DEPTH.set_function(lambda: upload_tracker.active, state="in_flight")
+if Config.UPLOAD_QUEUE_ENABLED:
+    UPLOAD_QUEUE_DEPTH.set_function(lambda: db.count_pending_uploads(), state="queued")
+DELETE_QUEUE_DEPTH.set_group_function(
+    lambda: db.get_delete_queue_stats(Config.DELETE_GC_MAX_ATTEMPTS), label="state"
+)
+
+
+background_tasks: List[asyncio.Task] = []
+
+
+async def compact_change_feed_periodically():
+    """চেঞ্জ ফিড নিয়মিত কমপ্যাক্ট (সব ওয়ার্কারে চললেও নিরাপদ)"""
+    while True:
+        await asyncio.sleep(Config.CHANGE_FEED_COMPACT_INTERVAL_SECONDS)
+        try:
+            removed = await run_in_threadpool(
+                db.compact_changes, Config.CHANGE_TOMBSTONE_RETENTION_DAYS
+            )
+            if removed:
+                logger.info(f"🧹 চেঞ্জ ফিড কমপ্যাক্ট: {removed}টি এন্ট্রি মোছা হয়েছে")
+        except Exception as e:
+            logger.error(f"❌ চেঞ্জ ফিড কমপ্যাকশন এরর: {e}")
+
+
+async def prune_rollups_periodically():
+    """পুরনো ঘণ্টার রোলআপ ও শূন্য বাকেট মোছা"""
+    while True:
+        await asyncio.sleep(Config.ROLLUP_PRUNE_INTERVAL_SECONDS)
+        try:
+            removed = await run_in_threadpool(db.prune_rollups, Config.ROLLUP_HOURLY_RETENTION_DAYS)
+            if removed:
+                logger.info(f"🧹 {removed}টি পুরনো রোলআপ বাকেট মোছা হয়েছে")
+        except Exception as e:
+            logger.error(f"❌ রোলআপ প্রুন এরর: {e}")
+
+
+async def collect_chunks_periodically():
+    """রেফারেন্সহীন CDC চাংক ক্লাউড ডিলিট কিউতে"""
+    while True:
+        await asyncio.sleep(Config.CHUNK_GC_INTERVAL_SECONDS)
+        try:
+            queued = await run_in_threadpool(chunk_store.collect_garbage)
+            if queued:
+                logger.info(f"🧹 {queued}টি অব্যবহৃত চাংক ডিলিট কিউতে")
+        except Exception as e:
+            logger.error(f"❌ চাংক GC এরর: {e}")
+
+
+async def collect_deletions_periodically():
+    """ডিলিট কিউর ক্লাউড অবজেক্ট ব্যাচে মোছা, রিটেনশন পার হওয়া সফট-ডিলিট সারি পার্জ"""
+    while True:
+        await asyncio.sleep(Config.DELETE_GC_INTERVAL_SECONDS)
+        try:
+            deleted = await run_in_threadpool(cloud_gc.run_once)
+            purged = await run_in_threadpool(cloud_gc.purge)
+            if deleted or purged:
+                logger.info(f"🗑️ ডিলিট GC: {deleted}টি ক্লাউড অবজেক্ট, {purged}টি পুরনো সারি")
+        except Exception as e:
+            logger.error(f"❌ ডিলিট GC এরর: {e}")
+
+
+async def reconcile_periodically():
+    """ক্যাটালগ বনাম ক্লাউড ইনভেন্টরি - সময় হলে নতুন রান, থেমে থাকা রান রিজিউম"""
+    while True:
+        await asyncio.sleep(Config.RECONCILE_POLL_SECONDS)
+        await run_reconciler()
+
+
+async def run_reconciler(force: bool = False):
+    try:
+        await reconciler.run(force)
+    except Exception as e:
+        # কার্সর সেভ করা আছে - পরের বার এখান থেকেই রিজিউম
+        logger.error(f"❌ রিকনসিলিয়েশন এরর: {e}")
+
+
+@app.on_event("startup")
+async def on_startup():
+    """স্টার্টআপ - কিউ চালু থাকলে এই প্রসেসের কনজিউমার ও ব্যাকগ্রাউন্ড কাজ শুরু"""
+    if Config.UPLOAD_QUEUE_ENABLED:
+        await upload_queue_worker.start()
+    
+    background_tasks.append(asyncio.create_task(compact_change_feed_periodically()))
+    background_tasks.append(asyncio.create_task(collect_deletions_periodically()))
+    background_tasks.append(asyncio.create_task(prune_rollups_periodically()))
+    if Config.CHUNKING_ENABLED:
+        background_tasks.append(asyncio.create_task(collect_chunks_periodically()))
+    if Config.RECONCILE_ENABLED:
+        background_tasks.append(asyncio.create_task(reconcile_periodically()))
+    event_publisher.start()
+    # ওয়ার্কার মোডে (api_server.py) প্রতিটি প্রসেস নিজের রিপোর্ট দেয়
+    if Config.API_WORKERS > 1:
+        log_startup_report()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """শাটডাউন - চলমান আপলোড শেষ করে পেন্ডিং ডেটা ফ্লাশ"""
+    for task in background_tasks:
+        task.cancel()
+    event_publisher.close()
+    
+    # নতুন কিউ জব নেওয়া বন্ধ, হাতে থাকা জব শেষ হবে
+    if upload_queue_worker.is_running:
+        await upload_queue_worker.stop()
+    
+    if upload_tracker.active:
+        logger.info(f"⏳ {upload_tracker.active}টি আপলোড শেষ হওয়ার অপেক্ষা...")
+    
+    if not await upload_tracker.wait_idle(Config.SHUTDOWN_TIMEOUT_SECONDS):
+        logger.warning(f"⚠️ {upload_tracker.active}টি আপলোড অসম্পূর্ণ রেখে শাটডাউন")
+    
+    thumbnail_service.shutdown()
+    if services.is_loaded('file_manager'):
+        file_manager.save_processed_files()
+    db.log_activity('SERVER_SHUTDOWN', "API server stopped")
+
+
+def save_upload_to_temp(file: UploadFile, temp_path: str):
+    """আপলোড স্ট্রিম টেম্প ফাইলে লেখা (থ্রেডপুলে চলে)"""
+    with open(temp_path, "wb") as buffer:
+        for chunk in iter(lambda: file.file.read(1024 * 1024), b""):
+            buffer.write(chunk)
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """fields= প্যারামিটার থেকে কলাম লিস্ট (হোয়াইটলিস্ট চেক)"""
+    if not fields:
+        return list(FILE_COLUMNS)
+    
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in FILE_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"অজানা ফিল্ড: {', '.join(unknown)}")
+    return selected
+
+def validate_dates(*values: Optional[str]):
+    """এক্সপোর্ট/সার্চ ফিল্টারের তারিখ YYYY-MM-DD কিনা"""
+    for value in values:
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(status_code=400, detail="তারিখ YYYY-MM-DD ফরম্যাটে দিন")
+
+
+def rows_to_records(columns: List[str], rows: List[tuple]) -> List[Dict]:
+    """টাপল রো থেকে রেকর্ড - tags কলামের JSON আবার পার্স না করে সরাসরি বসানো"""
+    records = [dict(zip(columns, row)) for row in rows]
+    if 'tags' in columns:
+        for record in records:
+            record['tags'] = orjson.Fragment(record['tags'] or '[]')
+    return records
+
+
+def fast_json_response(request: Request, payload: Dict) -> Response:
+    """orjson দিয়ে এনকোড, বড় রেসপন্স gzip (ক্লায়েন্ট সাপোর্ট করলে)"""
+    body = orjson.dumps(payload)
+    headers = {"Vary": "Accept-Encoding"}
+    
+    if len(body) >= Config.GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=Config.GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Range হেডার থেকে (start, end) - ইনক্লুসিভ। একাধিক রেঞ্জ হলে None (পুরো ফাইল)"""
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    
+    start_text, _, end_text = range_header[6:].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+        else:
+            # bytes=-500 → শেষ ৫০০ বাইট
+            start, end = max(size - int(end_text), 0), size - 1
+    except ValueError:
+        return None
+    
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="রেঞ্জ ফাইলের বাইরে",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def iter_file_range(f, start: int, end: int, block_size: int = 256 * 1024) -> Iterator[bytes]:
+    """খোলা ফাইল থেকে রেঞ্জ (থ্রেডপুলে ইটারেট হয়), শেষে ফাইল বন্ধ"""
+    try:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+    finally:
+        f.close()
+
 # Dependency for API key verification
 def verify_api_key(x_api_key: str = Header(...)):
     if not security.verify_api_key(x_api_key):
         raise HTTPException(status_code=403, detail="Invalid API Key")
     return True
 
+# <a>/<img> লিংক হেডার পাঠাতে পারে না - মাস্টার কি-র বদলে এই পাথের স্বল্পমেয়াদি সিগনেচার
+def verify_api_key_or_signature(
+    request: Request,
+    x_api_key: Optional[str] = Header(None),
+    expires: Optional[int] = None,
+    signature: Optional[str] = None
+):
+    if x_api_key and security.verify_api_key(x_api_key):
+        return True
+    if expires is not None and signature and \
+            security.verify_path_signature(request.url.path, expires, signature):
+        return True
+    raise HTTPException(status_code=403, detail="Invalid API Key")
+
+def signed_link(path: str) -> Dict:
+    """পাথের স্বল্পমেয়াদি সাইন করা URL (verify_api_key_or_signature যাচাই করে)"""
+    expires = int(time.time()) + Config.SIGNED_LINK_TTL_SECONDS
+    return {
+        "url": f"{path}?expires={expires}&signature={security.sign_path(path, expires)}",
+        "expires": expires
+    }
+
 @app.get("/")
 async def root():
     """রুট এন্ডপয়েন্ট"""
@@ -38,6 +410,72 @@ async def root():
         "owner": Config.YOUR_TELEGRAM_USER_ID
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(x_api_key: Optional[str] = Header(None)):
+    """Prometheus মেট্রিক্স"""
+    if not Config.METRICS_PUBLIC and not security.verify_api_key(x_api_key or ""):
+        raise HTTPException(status_code=403, detail="Invalid API Key")
+    
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@app.get("/api/profiles")
+async def get_profiles(verified: bool = Depends(verify_api_key)):
+    """সেভ করা রিকোয়েস্ট প্রোফাইল লিস্ট"""
+    return {"profiles": list_profiles()}
+
+@app.get("/api/profiles/{name}", response_class=PlainTextResponse)
+async def get_profile(
+    name: str,
+    verified: bool = Depends(verify_api_key)
+):
+    """একটি প্রোফাইল (folded stacks - flamegraph.pl / speedscope)"""
+    path = Path(Config.PROFILE_DIR) / Path(name).name
+    if path.suffix != ".folded" or not path.exists():
+        raise HTTPException(status_code=404, detail="প্রোফাইল পাওয়া যায়নি")
+    return PlainTextResponse(path.read_text())
+
+@app.get("/api/slow-queries")
+async def get_slow_queries(
+    limit: int = 50,
+    verified: bool = Depends(verify_api_key)
+):
+    """সাম্প্রতিক স্লো SQL কুয়েরি"""
+    return {
+        "threshold_ms": Config.SLOW_QUERY_THRESHOLD_MS,
+        "queries": db.get_slow_queries(limit)
+    }
+
+@app.get("/api/startup")
+async def get_startup_timings(verified: bool = Depends(verify_api_key)):
+    """স্টার্টআপে প্রতিটি ইমপোর্ট ও ইনিশিয়ালাইজারের সময়"""
+    return {"timings": startup_report()}
+
+@app.get("/api/reconcile")
+async def get_reconcile_report(
+    kind: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+    verified: bool = Depends(verify_api_key)
+):
+    """সর্বশেষ রিকনসিলিয়েশন ও খোলা ইস্যু (ক্লাউডে নেই / ট্র্যাক করা নেই)"""
+    if kind and kind not in ISSUE_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind হবে {' বা '.join(ISSUE_KINDS)}")
+    limit = max(1, min(limit, Config.API_MAX_PAGE_SIZE))
+    status = await run_in_threadpool(db.get_reconcile_status)
+    issues = await run_in_threadpool(db.get_reconcile_issues, kind, limit, max(offset, 0))
+    return {**status, "issues": issues}
+
+@app.post("/api/reconcile", status_code=202)
+async def start_reconcile(verified: bool = Depends(verify_api_key)):
+    """এখনই রিকনসিলিয়েশন শুরু (ব্যাকগ্রাউন্ডে, ইন্টারভাল না মেনে)"""
+    task = asyncio.create_task(run_reconciler(force=True))
+    background_tasks.append(task)
+    task.add_done_callback(background_tasks.remove)
+    return {"started": True}
+
 @app.get("/api/status")
 async def get_status(verified: bool = Depends(verify_api_key)):
     """সিস্টেম স্ট্যাটাস"""
@@ -49,100 +487,520 @@ async def get_status(verified: bool = Depends(verify_api_key)):
         "last_backup": stats.get('last_backup_time')
     }
 
+@app.get("/api/charts/uploads")
+async def get_upload_chart(
+    granularity: str = "day",
+    periods: Optional[int] = None,
+    group_by: Optional[str] = "file_type",
+    metric: str = "bytes",
+    format: str = "json",
+    device: Optional[str] = None,
+    file_type: Optional[str] = None,
+    verified: bool = Depends(verify_api_key)
+):
+    """আপলোড সংখ্যা ও বাইটের টাইম-সিরিজ (দিন/ঘণ্টা) - রোলআপ থেকে, ফাঁকা বাকেট শূন্য"""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity হবে {' বা '.join(GRANULARITIES)}")
+    if group_by not in ROLLUP_GROUPS + ("none",):
+        raise HTTPException(status_code=400, detail=f"group_by হবে {', '.join(ROLLUP_GROUPS)} বা none")
+    if metric not in CHART_METRICS:
+        raise HTTPException(status_code=400, detail=f"metric হবে {' বা '.join(CHART_METRICS)}")
+    if format not in ("json", "png"):
+        raise HTTPException(status_code=400, detail="format হবে json বা png")
+    
+    default_periods = Config.CHART_DEFAULT_DAYS if granularity == "day" else Config.CHART_DEFAULT_HOURS
+    periods = max(1, min(periods or default_periods, max_periods(granularity)))
+    chart = await run_in_threadpool(
+        upload_chart, db, granularity, periods, None if group_by == "none" else group_by, device, file_type
+    )
+    if format == "json":
+        return chart
+    
+    if not MATPLOTLIB_AVAILABLE:
+        raise HTTPException(status_code=503, detail="PNG চার্টের জন্য matplotlib ইনস্টল নেই")
+    png = await run_in_threadpool(render_png, chart, metric, f"Uploads ({metric}) per {granularity}")
+    return Response(content=png, media_type="image/png", headers={"Cache-Control": "no-cache"})
+
 @app.post("/api/upload")
 async def upload_file(
+    request: Request,
+    response: Response,
     file: UploadFile = File(...),
     device_id: str = Header(...),
     verified: bool = Depends(verify_api_key)
 ):
     """ফাইল আপলোড"""
-    try:
-        # টেম্প ফাইল সেভ
-        temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Cloudinary-তে আপলোড
-        upload_result = cloudinary.upload_file(temp_path, tags=[f"device:{device_id}"])
-        
-        if not upload_result['success']:
-            raise HTTPException(status_code=500, detail=upload_result['error'])
-        
-        # ডাটাবেজে সেভ
-        file_data = {
-            'file_hash': upload_result['file_hash'],
-            'filename': upload_result['filename'],
-            'file_size': upload_result['file_size'],
-            'file_type': upload_result['file_type'],
-            'cloudinary_id': upload_result['cloudinary_id'],
-            'cloudinary_url': upload_result['cloudinary_url'],
-            'original_path': upload_result['original_path'],
-            'device_name': device_id
-        }
-        
-        db.add_file(file_data)
-        
-        # টেম্প ফাইল ডিলিট
-        import os
-        os.remove(temp_path)
-        
-        return {
-            "success": True,
-            "message": "ফাইল আপলোড সফল",
-            "file_id": upload_result['cloudinary_id'],
-            "download_url": upload_result['cloudinary_url']
-        }
+    timeline = UploadTimeline(file.filename, device_id, request.scope.get('backup.request_start'))
+    
+    async with upload_tracker.track():
+        temp_path = create_spool_path(file.filename)
+        queued = False
+        try:
+            # টেম্প ফাইল সেভ
+            with timeline.stage('write'):
+                await run_in_threadpool(save_upload_to_temp, file, temp_path)
+            
+            # কিউ মোড - যেকোনো ওয়ার্কার প্রসেস ক্লাউডে পাঠাবে
+            if Config.UPLOAD_QUEUE_ENABLED:
+                with timeline.stage('enqueue'):
+                    job_id = await run_in_threadpool(db.enqueue_upload, temp_path, device_id)
+                queued = True
+                timeline.finish("enqueued")
+                response.headers["Server-Timing"] = timeline.server_timing()
+                return {
+                    "success": True,
+                    "queued": True,
+                    "message": "ফাইল আপলোড কিউতে যুক্ত",
+                    "job_id": job_id
+                }
+            
+            # Cloudinary-তে আপলোড ও ডাটাবেজে সেভ (ব্লকিং কল, ইভেন্ট লুপের বাইরে)
+            upload_result = await run_in_threadpool(store_upload, temp_path, device_id, timeline)
+            
+            timeline.finish()
+            response.headers["Server-Timing"] = timeline.server_timing()
+            return {
+                "success": True,
+                "message": "ফাইল আপলোড সফল",
+                "file_id": upload_result['cloudinary_id'],
+                "download_url": upload_result['cloudinary_url']
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ API আপলোড এরর: {e}")
+            timeline.finish("error")
+            raise HTTPException(
+                status_code=500,
+                detail=str(e),
+                headers={"Server-Timing": timeline.server_timing()}
+            )
         
-    except Exception as e:
-        logger.error(f"❌ API আপলোড এরর: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            # টেম্প ফাইল ডিলিট (কিউতে গেলে ওয়ার্কার ডিলিট করবে)
+            if not queued:
+                remove_spool_path(temp_path)
+
+@app.get("/api/uploads/slowest")
+async def get_slowest_uploads(
+    limit: int = 20,
+    verified: bool = Depends(verify_api_key)
+):
+    """সাম্প্রতিক আপলোডের মধ্যে সবচেয়ে ধীরগুলো (ধাপভিত্তিক সময় সহ)"""
+    return {
+        "window": slowest_uploads.entries.maxlen,
+        "average_stages_ms": slowest_uploads.stage_summary(),
+        "uploads": slowest_uploads.slowest(limit)
+    }
+
+@app.get("/api/upload/{job_id}")
+async def get_upload_job(
+    job_id: int,
+    verified: bool = Depends(verify_api_key)
+):
+    """কিউ করা আপলোডের স্ট্যাটাস"""
+    job = await run_in_threadpool(db.get_upload_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="জব পাওয়া যায়নি")
+    
+    return {
+        "job_id": job['id'],
+        "status": job['status'],
+        "attempts": job['attempts'],
+        "file_hash": job['file_hash'],
+        "download_url": job['cloudinary_url'],
+        "error": job['error']
+    }
 
 @app.get("/api/files")
 async def get_files(
+    request: Request,
     limit: int = 50,
     offset: int = 0,
+    fields: Optional[str] = None,
     verified: bool = Depends(verify_api_key)
 ):
-    """ফাইল লিস্ট"""
-    files = db.get_all_files(limit=100)[offset:offset+limit]
-    return {
-        "files": files,
-        "count": len(files),
-        "total": db.get_backup_stats()['total_files']
-    }
+    """ফাইল লিস্ট (fields=filename,file_size,... দিয়ে শুধু দরকারি কলাম)"""
+    columns = parse_fields(fields)
+    limit = max(1, min(limit, Config.API_MAX_PAGE_SIZE))
+    rows = await run_in_threadpool(db.list_file_rows, columns, limit, max(offset, 0))
+    stats = await run_in_threadpool(db.get_backup_stats)
+    
+    return fast_json_response(request, {
+        "files": rows_to_records(columns, rows),
+        "count": len(rows),
+        "total": stats['total_files']
+    })
 
 @app.get("/api/search")
 async def search_files(
+    request: Request,
     query: str,
+    limit: int = 100,
+    offset: int = 0,
+    fields: Optional[str] = None,
+    file_type: Optional[str] = None,
+    device: Optional[str] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    order: str = "relevance",
     verified: bool = Depends(verify_api_key)
 ):
-    """ফাইল সার্চ"""
-    results = db.search_files(query)
-    return {
+    """ফাইল সার্চ (FTS - প্রতিটি শব্দ প্রিফিক্স, সব শব্দ থাকতে হবে; order=relevance বা date)"""
+    if order not in ("relevance", "date"):
+        raise HTTPException(status_code=400, detail="order হবে relevance বা date")
+    validate_dates(date_from, date_to)
+    columns = parse_fields(fields)
+    limit = max(1, min(limit, Config.API_MAX_PAGE_SIZE))
+    # একটি বেশি এনে পরের পেজ আছে কিনা - আলাদা COUNT কুয়েরি ছাড়া
+    rows = await run_in_threadpool(
+        db.search_file_rows, columns, query, limit + 1, max(offset, 0), file_type, device,
+        min_size, max_size, date_from, date_to, order
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    return fast_json_response(request, {
         "query": query,
-        "results": results,
-        "count": len(results)
+        "results": rows_to_records(columns, rows),
+        "count": len(rows),
+        "has_more": has_more,
+        "next_offset": max(offset, 0) + len(rows) if has_more else None
+    })
+
+@app.get("/api/changes")
+async def get_changes(
+    request: Request,
+    since: int = 0,
+    limit: int = None,
+    fields: Optional[str] = None,
+    verified: bool = Depends(verify_api_key)
+):
+    """since-এর পরের ইনক্রিমেন্টাল পরিবর্তন (ফুল লিস্ট আবার না টেনে)"""
+    columns = parse_fields(fields)
+    limit = max(1, min(limit or Config.CHANGE_FEED_PAGE_SIZE, Config.API_MAX_PAGE_SIZE))
+    state = await run_in_threadpool(db.get_change_feed_state)
+    
+    # কমপ্যাকশনে মোছা ডিলিট মিস হতে পারে - ক্লায়েন্টকে since=0 থেকে আবার শুরু করতে হবে
+    if 0 < since < state['horizon']:
+        return fast_json_response(request, {
+            "resync_required": True,
+            "changes": [],
+            "next_since": 0,
+            "has_more": False,
+            "latest_seq": state['latest'],
+            "horizon": state['horizon']
+        })
+    
+    # একটি বাড়তি রো - ঠিক limit-টি বাকি থাকলে ভুল করে has_more দেখায় না
+    rows = await run_in_threadpool(db.get_changes, since, columns, limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    changes = []
+    for seq, op, file_hash, *values in rows:
+        changes.append({
+            "seq": seq,
+            "op": op,
+            "file_hash": file_hash,
+            "file": rows_to_records(columns, [values])[0] if op == "upsert" else None
+        })
+    
+    # শেষ পেজে সুপারসিডেড এন্ট্রিগুলো এড়াতে সর্বশেষ seq পর্যন্ত এগিয়ে যাওয়া
+    last_seq = rows[-1][0] if rows else since
+    next_since = last_seq if has_more else max(state['latest'], last_seq)
+    
+    return fast_json_response(request, {
+        "resync_required": False,
+        "changes": changes,
+        "next_since": next_since,
+        "has_more": has_more,
+        "latest_seq": state['latest'],
+        "horizon": state['horizon']
+    })
+
+@app.get("/api/file/{file_hash}")
+async def get_file_info(
+    file_hash: str,
+    verified: bool = Depends(verify_api_key)
+):
+    """ফাইল আগে থেকে ব্যাকআপ আছে কিনা (আপলোডের আগে হ্যাশ দিয়ে চেক)"""
+    file_info = await run_in_threadpool(db.get_file_by_hash, file_hash)
+    if not file_info or file_info['is_deleted']:
+        raise HTTPException(status_code=404, detail="ফাইল পাওয়া যায়নি")
+    
+    return {"exists": True, "file": file_info}
+
+@app.get("/api/file/{file_hash}/link")
+async def get_signed_link(
+    file_hash: str,
+    kind: str = "download",
+    verified: bool = Depends(verify_api_key)
+):
+    """ডাউনলোড/থাম্বনেইলের স্বল্পমেয়াদি সাইন করা লিংক (ব্রাউজার/DownloadManager-এর জন্য)"""
+    if kind not in ("download", "thumb"):
+        raise HTTPException(status_code=400, detail="kind হবে download বা thumb")
+    return signed_link(f"/api/file/{file_hash}/{kind}")
+
+@app.get("/api/file/{file_hash}/download")
+async def download_file(
+    file_hash: str,
+    request: Request,
+    verified: bool = Depends(verify_api_key_or_signature)
+):
+    """অরিজিনাল ফাইল - ডিস্ক ক্যাশ থেকে, Range সাপোর্ট সহ (রিজিউমেবল রিস্টোর)"""
+    file_info = await run_in_threadpool(db.get_file_by_hash, file_hash)
+    if not file_info or file_info['is_deleted']:
+        raise HTTPException(status_code=404, detail="ফাইল পাওয়া যায়নি")
+    
+    media_type = mimetypes.guess_type(file_info['filename'])[0] or "application/octet-stream"
+    etag = f'"{file_hash}"'
+    headers = {
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_info['filename'])}",
+        "ETag": etag
     }
+    
+    # ক্যাশের তুলনায় খুব বড় ফাইল সরাসরি স্ট্রিম (রেঞ্জ ছাড়া)
+    if not download_cache.fits(file_info['file_size']):
+        headers["Accept-Ranges"] = "none"
+        headers["Content-Length"] = str(file_info['file_size'])
+        return StreamingResponse(iter_original(file_info), media_type=media_type, headers=headers)
+    
+    try:
+        path = await download_cache.get(file_info)
+        f = open(path, "rb")
+    except Exception as e:
+        logger.error(f"❌ ডাউনলোড ক্যাশ এরর: {e}")
+        raise HTTPException(status_code=502, detail="স্টোরেজ থেকে ফাইল আনা যায়নি")
+    
+    # খোলা ফাইল থেকে সাইজ - এর মধ্যে ইভিক্ট হলেও হ্যান্ডেল বৈধ থাকে
+    size = os.fstat(f.fileno()).st_size
+    headers["Accept-Ranges"] = "bytes"
+    
+    if_range = request.headers.get("if-range")
+    try:
+        byte_range = parse_range(request.headers.get("range"), size) \
+            if not if_range or if_range == etag else None
+    except HTTPException:
+        f.close()
+        raise
+    
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_file_range(f, 0, size - 1), media_type=media_type, headers=headers)
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(f, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
+
+@app.get("/api/export/archive")
+async def export_archive(
+    format: str = "zip",
+    device: Optional[str] = None,
+    file_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    verified: bool = Depends(verify_api_key)
+):
+    """ফিল্টার করা সব ফাইল একটি ZIP/tar স্ট্রিমে (ডিস্কে আর্কাইভ তৈরি হয় না)"""
+    if format not in ARCHIVE_FORMATS:
+        raise HTTPException(status_code=400, detail="format হবে zip বা tar")
+    validate_dates(date_from, date_to)
+    
+    files = await run_in_threadpool(db.get_export_files, file_type, device, date_from, date_to)
+    if not files:
+        raise HTTPException(status_code=404, detail="ফিল্টারে কোনো ফাইল নেই")
+    
+    media_type, extension = ARCHIVE_FORMATS[format]
+    filename = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+    return StreamingResponse(
+        archive_exporter.stream(files, format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-File-Count": str(len(files))
+        }
+    )
+
+def metadata_export_response(kind: str, columns: List[str], rows: Iterator[tuple],
+                             export_format: str, compress: bool) -> StreamingResponse:
+    media_type, _ = EXPORT_FORMATS[export_format]
+    filename = export_filename(kind, export_format, compress, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    # sync জেনারেটর - Starlette থ্রেডপুলে ইটারেট করে, কার্সর ইভেন্ট লুপ আটকায় না
+    return StreamingResponse(
+        encode_rows(columns, rows, export_format, compress),
+        media_type=GZIP_MEDIA_TYPE if compress else media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/export/files")
+async def export_files_metadata(
+    format: str = "csv",
+    compress: bool = False,
+    fields: Optional[str] = None,
+    device: Optional[str] = None,
+    file_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    verified: bool = Depends(verify_api_key)
+):
+    """files ক্যাটালগের CSV/NDJSON স্ট্রিম (কার্সর থেকে ব্যাচে, স্থির মেমোরি)"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format হবে csv বা ndjson")
+    validate_dates(date_from, date_to)
+    columns = parse_fields(fields)
+    
+    rows = db.iter_file_rows(
+        columns, file_type, device, date_from, date_to,
+        batch_size=Config.METADATA_EXPORT_BATCH_ROWS
+    )
+    return metadata_export_response("files", columns, rows, format, compress)
+
+@app.get("/api/export/activity")
+async def export_activity_logs(
+    format: str = "csv",
+    compress: bool = False,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    verified: bool = Depends(verify_api_key)
+):
+    """অ্যাক্টিভিটি লগের CSV/NDJSON স্ট্রিম"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format হবে csv বা ndjson")
+    validate_dates(date_from, date_to)
+    
+    rows = db.iter_activity_rows(date_from, date_to, batch_size=Config.METADATA_EXPORT_BATCH_ROWS)
+    return metadata_export_response("activity", list(ACTIVITY_COLUMNS), rows, format, compress)
+
+@app.get("/api/file/{file_hash}/thumb")
+async def get_thumbnail(
+    file_hash: str,
+    request: Request,
+    verified: bool = Depends(verify_api_key_or_signature)
+):
+    """ছবির WebP থাম্বনেইল (কনটেন্ট-অ্যাড্রেসড, তাই দীর্ঘ ক্যাশ)"""
+    # ETag মিললেও আগে DB চেক - ডিলিট/পার্জ হওয়া ফাইলে 304 নয়, 404
+    file_info = await run_in_threadpool(db.get_file_by_hash, file_hash)
+    if not file_info or file_info['is_deleted']:
+        raise HTTPException(status_code=404, detail="ফাইল পাওয়া যায়নি")
+    
+    etag = f'"{file_hash}"'
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable"
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    
+    path = await thumbnail_service.get(file_info)
+    if path is None:
+        raise HTTPException(status_code=404, detail="থাম্বনেইল পাওয়া যায়নি")
+    
+    return FileResponse(path, media_type="image/webp", headers=cache_headers)
+
+def forget_local_copies(file_hashes: List[str]):
+    """ডিলিট হওয়া ফাইলের থাম্বনেইল ও ডাউনলোড ক্যাশ মোছা"""
+    for file_hash in file_hashes:
+        thumbnail_service.discard(file_hash)
+        download_cache.discard(file_hash)
 
 @app.delete("/api/file/{file_hash}")
 async def delete_file(
     file_hash: str,
     verified: bool = Depends(verify_api_key)
 ):
-    """ফাইল ডিলিট"""
-    file_info = db.get_file_by_hash(file_hash)
-    if not file_info:
+    """ফাইল ডিলিট (ক্লাউড অবজেক্ট ব্যাকগ্রাউন্ড GC-তে ব্যাচে মোছে)"""
+    deleted = await run_in_threadpool(db.delete_files, [file_hash])
+    if not deleted:
         raise HTTPException(status_code=404, detail="ফাইল পাওয়া যায়নি")
     
-    # Cloudinary থেকে ডিলিট
-    cloudinary.delete_file(file_info['cloudinary_id'])
-    
-    # ডাটাবেজ থেকে ডিলিট
-    db.delete_file(file_hash)
+    await run_in_threadpool(forget_local_copies, [file_hash])
+    event_publisher.notify()
     
     return {"success": True, "message": "ফাইল ডিলিট সফল"}
 
+class BulkDeleteRequest(BaseModel):
+    file_hashes: List[str]
+
+@app.post("/api/files/delete")
+async def delete_files_bulk(
+    body: BulkDeleteRequest,
+    verified: bool = Depends(verify_api_key)
+):
+    """অনেক ফাইল এক রিকোয়েস্টে ডিলিট - এক ট্রানজ্যাকশন, ক্লাউড ডিলিট কিউতে"""
+    file_hashes = list(dict.fromkeys(body.file_hashes))
+    if len(file_hashes) > Config.BULK_DELETE_MAX_FILES:
+        raise HTTPException(
+            status_code=400, detail=f"এক রিকোয়েস্টে সর্বোচ্চ {Config.BULK_DELETE_MAX_FILES}টি ফাইল"
+        )
+    
+    deleted = await run_in_threadpool(db.delete_files, file_hashes)
+    deleted_hashes = [file['file_hash'] for file in deleted]
+    await run_in_threadpool(forget_local_copies, deleted_hashes)
+    if deleted:
+        event_publisher.notify()
+    
+    return {
+        "success": True,
+        "deleted": len(deleted),
+        "not_found": len(file_hashes) - len(deleted),
+        "deleted_hashes": deleted_hashes
+    }
+
+@app.get("/api/files/delete-queue")
+async def get_delete_queue(verified: bool = Depends(verify_api_key)):
+    """ক্লাউড ডিলিট কিউর অবস্থা"""
+    return await run_in_threadpool(db.get_delete_queue_stats, Config.DELETE_GC_MAX_ATTEMPTS)
+
+@app.get("/api/events/link")
+async def get_events_link(verified: bool = Depends(verify_api_key)):
+    """EventSource হেডার পাঠাতে পারে না - /api/events-এর স্বল্পমেয়াদি সাইন করা লিংক"""
+    return signed_link("/api/events")
+
+@app.get("/api/events")
+async def stream_events(
+    request: Request,
+    verified: bool = Depends(verify_api_key_or_signature)
+):
+    """লাইভ ইভেন্ট স্ট্রিম (SSE) - stats ডেল্টা ও নতুন/ডিলিট ফাইল"""
+    subscriber = event_publisher.subscribe()
+    
+    async def stream():
+        try:
+            yield f"retry: {int(Config.EVENTS_POLL_SECONDS * 1000)}\n\n".encode()
+            yield await event_publisher.snapshot()
+            
+            while True:
+                try:
+                    frame = await asyncio.wait_for(
+                        subscriber.queue.get(), Config.EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # প্রক্সি যাতে আইডল কানেকশন না কাটে
+                    yield b": heartbeat\n\n"
+                    continue
+                
+                if frame is None:
+                    break
+                if frame.startswith(b"event: resync"):
+                    subscriber.lagged = False
+                yield frame
+        finally:
+            event_publisher.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/device/register")
 async def register_device(
     device_name: str,
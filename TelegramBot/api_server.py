@@ -0,0 +1,40 @@
+"""
+API_SERVER.PY - মাল্টি-প্রসেস API সার্ভার (Telegram বট ছাড়া)
+
+প্রতিটি ওয়ার্কার আলাদা প্রসেসে api_routes.app চালায় - নিজস্ব ম্যানেজার,
+শেয়ার্ড শুধু SQLite (WAL) আর আপলোড স্পুল ফোল্ডার।
+"""
+
+import argparse
+import logging
+
+import uvicorn
+
+from config import Config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto Backup Pro API (multi-worker)")
+    parser.add_argument("--workers", type=int, default=max(Config.API_WORKERS, 1))
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    args = parser.parse_args()
+    
+    # uvicorn মাল্টি-ওয়ার্কারের জন্য ইমপোর্ট স্ট্রিং লাগে
+    uvicorn.run(
+        "api_routes:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="info",
+        timeout_graceful_shutdown=Config.SHUTDOWN_TIMEOUT_SECONDS
+    )
+
+
+if __name__ == "__main__":
+    main()
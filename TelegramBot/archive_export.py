@@ -0,0 +1,189 @@
+"""
+ARCHIVE_EXPORT.PY - বাল্ক রিস্টোরের জন্য অন-দ্য-ফ্লাই ZIP/tar স্ট্রিম
+
+আর্কাইভ কখনো ডিস্কে তৈরি হয় না - প্রতিটি ফাইল স্টোরেজ থেকে এনে সাথে সাথে
+আর্কাইভ এন্ট্রি হিসেবে ক্লায়েন্টে যায়। পরের কয়েকটি ফাইল সীমিত কনকারেন্সিতে
+আগেই আনা (prefetch) হয়, তাই ক্লাউডের লেটেন্সি স্ট্রিমকে থামায় না।
+"""
+
+import io
+import logging
+import os
+import tarfile
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config
+from metrics import EXPORT_BYTES
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = {
+    'zip': ('application/zip', '.zip'),
+    'tar': ('application/x-tar', '.tar'),
+}
+READ_BLOCK = 256 * 1024
+
+
+def _timestamp(upload_date: Optional[str]) -> datetime:
+    try:
+        return datetime.strptime((upload_date or '')[:19], '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return datetime.now()
+
+
+class _BufferSink:
+    """zipfile-এর আউটপুট জমা রাখা (seek নেই - zipfile স্ট্রিমিং মোডে লেখে)"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+class _ZipWriter:
+    def __init__(self):
+        self.sink = _BufferSink()
+        # ছবি/ভিডিও আগেই কম্প্রেসড - আবার কম্প্রেস করলে শুধু CPU খরচ
+        self.archive = zipfile.ZipFile(self.sink, 'w', zipfile.ZIP_STORED, allowZip64=True)
+
+    def add(self, name: str, modified: datetime, size: int, fileobj) -> Iterator[bytes]:
+        info = zipfile.ZipInfo(name, date_time=max(modified, datetime(1980, 1, 1)).timetuple()[:6])
+        info.file_size = size
+        with self.archive.open(info, 'w', force_zip64=size >= zipfile.ZIP64_LIMIT) as entry:
+            for block in iter(lambda: fileobj.read(READ_BLOCK), b""):
+                entry.write(block)
+                yield self.sink.drain()
+        yield self.sink.drain()
+
+    def finish(self) -> Iterator[bytes]:
+        self.archive.close()
+        yield self.sink.drain()
+
+
+class _TarWriter:
+    def add(self, name: str, modified: datetime, size: int, fileobj) -> Iterator[bytes]:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(modified.timestamp())
+        info.mode = 0o644
+        yield info.tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape')
+        for block in iter(lambda: fileobj.read(READ_BLOCK), b""):
+            yield block
+        remainder = size % tarfile.BLOCKSIZE
+        if remainder:
+            yield b"\0" * (tarfile.BLOCKSIZE - remainder)
+
+    def finish(self) -> Iterator[bytes]:
+        yield b"\0" * (tarfile.BLOCKSIZE * 2)
+
+
+class ArchiveExporter:
+    """ফিল্টার করা ফাইলগুলো থেকে আর্কাইভ স্ট্রিম (থ্রেডপুলে ইটারেট হয়)"""
+
+    def __init__(self, iter_original: Callable[[Dict], Iterable[bytes]],
+                 cached_path: Callable[[str], Path]):
+        self.iter_original = iter_original
+        self.cached_path = cached_path
+
+    def _prefetch(self, file_info: Dict):
+        """ডাউনলোড ক্যাশে থাকলে সেখান থেকে, নইলে স্পুল ফাইলে (ছোট হলে মেমোরিতে)"""
+        try:
+            return open(self.cached_path(file_info['file_hash']), 'rb')
+        except FileNotFoundError:
+            pass
+
+        spool = tempfile.SpooledTemporaryFile(
+            max_size=Config.EXPORT_SPOOL_MEMORY_MB * 1024 * 1024, dir=Config.UPLOAD_SPOOL_DIR
+        )
+        try:
+            for block in self.iter_original(file_info):
+                spool.write(block)
+            spool.seek(0)
+            return spool
+        except Exception:
+            spool.close()
+            raise
+
+    @staticmethod
+    def _entry_name(file_info: Dict, used: set) -> str:
+        folder = file_info.get('device_name') or 'unknown'
+        name = f"{folder}/{Path(file_info['filename']).name}"
+        path = Path(name)
+        counter = 1
+        while name in used:
+            # একই নামের আলাদা ফাইল - হ্যাশের অংশ (তাও মিললে ক্রমিক নম্বর) যোগ
+            tag = file_info['file_hash'][:8] if counter == 1 else f"{file_info['file_hash'][:8]}-{counter}"
+            name = f"{path.parent}/{path.stem} ({tag}){path.suffix}"
+            counter += 1
+        used.add(name)
+        return name
+
+    def stream(self, files: List[Dict], archive_format: str) -> Iterator[bytes]:
+        os.makedirs(Config.UPLOAD_SPOOL_DIR, exist_ok=True)
+        writer = _ZipWriter() if archive_format == 'zip' else _TarWriter()
+        pool = ThreadPoolExecutor(max_workers=Config.EXPORT_PREFETCH_CONCURRENCY,
+                                  thread_name_prefix="export-prefetch")
+        pending: Deque[Tuple[Dict, Future]] = deque()
+        remaining = iter(files)
+        used_names: set = set()
+        failed: List[str] = []
+        total = 0
+
+        def fill_window():
+            while len(pending) < Config.EXPORT_PREFETCH_CONCURRENCY:
+                file_info = next(remaining, None)
+                if file_info is None:
+                    return
+                pending.append((file_info, pool.submit(self._prefetch, file_info)))
+
+        try:
+            fill_window()
+            while pending:
+                file_info, future = pending.popleft()
+                fill_window()
+                try:
+                    fileobj = future.result()
+                except Exception as e:
+                    logger.error(f"❌ এক্সপোর্টে ফাইল আনা যায়নি ({file_info['filename']}): {e}")
+                    failed.append(f"{file_info['file_hash']}  {file_info['filename']}  {e}")
+                    continue
+
+                with fileobj:
+                    size = fileobj.seek(0, 2)
+                    fileobj.seek(0)
+                    name = self._entry_name(file_info, used_names)
+                    for data in writer.add(name, _timestamp(file_info['upload_date']), size, fileobj):
+                        if data:
+                            total += len(data)
+                            yield data
+
+            # যেগুলো আনা যায়নি সেগুলোর তালিকা আর্কাইভের ভেতরেই
+            if failed:
+                report = ("\n".join(failed) + "\n").encode()
+                yield from writer.add("EXPORT_ERRORS.txt", datetime.now(), len(report), io.BytesIO(report))
+
+            yield from writer.finish()
+            logger.info(f"📦 আর্কাইভ এক্সপোর্ট: {len(files) - len(failed)}টি ফাইল, {total / 1048576:.1f}MB")
+        finally:
+            EXPORT_BYTES.inc(total, format=archive_format)
+            # ক্লায়েন্ট মাঝপথে কেটে দিলে আগেই আনা ফাইলগুলো বন্ধ
+            pool.shutdown(wait=False, cancel_futures=True)
+            for _, future in pending:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    future.result().close()
@@ -0,0 +1,292 @@
+"""
+BENCHMARK.PY - কম্পোনেন্ট বেঞ্চমার্ক (সিনথেটিক ক্যাটালগ ও ডিরেক্টরি ট্রি)
+
+ব্যবহার:
+    python benchmark.py --rows 10000 100000 --output bench_results.json
+    python benchmark.py --rows 1000000 --skip-upload
+
+ফলাফল JSON-এ সেভ হয় (কমিট হ্যাশ সহ) যাতে কমিটের মধ্যে তুলনা করা যায়।
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from config import Config
+
+FILE_KINDS = [
+    # (file_type, extensions, weight, min_kb, max_kb)
+    ('image', ['.jpg', '.jpeg', '.png', '.webp'], 55, 200, 6000),
+    ('video', ['.mp4', '.mkv', '.mov'], 10, 5000, 100000),
+    ('document', ['.pdf', '.docx', '.xlsx', '.pptx', '.txt'], 20, 10, 20000),
+    ('audio', ['.mp3', '.m4a', '.wav'], 10, 1000, 15000),
+    ('archive', ['.zip', '.7z'], 4, 100, 80000),
+    ('app', ['.apk'], 1, 5000, 60000),
+]
+DEVICES = ['Pixel-7', 'Galaxy-S23', 'Redmi-Note-12', 'OnePlus-11', 'Moto-G84']
+WORDS = ['IMG', 'VID', 'Screenshot', 'invoice', 'report', 'song', 'backup',
+         'meeting', 'family', 'trip', 'scan', 'notes', 'holiday', 'project']
+
+
+def random_file(rng: random.Random, index: int) -> Dict:
+    """বাস্তবসম্মত টাইপ/সাইজ ডিস্ট্রিবিউশনে একটি সিনথেটিক ফাইল"""
+    file_type, extensions, _, min_kb, max_kb = rng.choices(
+        FILE_KINDS, weights=[kind[2] for kind in FILE_KINDS]
+    )[0]
+    ext = rng.choice(extensions)
+    # লগ-নরমাল আকারের কাছাকাছি: বেশিরভাগ ছোট, কিছু বড়
+    size_kb = min(max_kb, max(min_kb, int(rng.lognormvariate(0, 1) * (min_kb + max_kb) / 6)))
+    name = f"{rng.choice(WORDS)}_{index:07d}{ext}"
+    return {
+        'file_type': file_type,
+        'filename': name,
+        'file_size': size_kb * 1024,
+        'device_name': rng.choice(DEVICES),
+    }
+
+
+def build_catalogue(db_path: str, rows: int, seed: int = 42) -> float:
+    """সিনথেটিক files টেবিল তৈরি (রিটার্ন: সময়)"""
+    from database import DatabaseManager
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    db = DatabaseManager(db_path)
+    base_date = datetime(2023, 1, 1)
+
+    def generate():
+        for i in range(rows):
+            item = random_file(rng, i)
+            uploaded = base_date + timedelta(seconds=i * 37 + rng.randint(0, 30))
+            yield (
+                f"{i:064x}",
+                f"/storage/emulated/0/DCIM/{item['filename']}",
+                item['filename'],
+                item['file_size'],
+                item['file_type'],
+                f"personal_backup/{i:064x}",
+                f"https://res.cloudinary.com/demo/{i:064x}",
+                uploaded.strftime('%Y-%m-%d %H:%M:%S'),
+                json.dumps([f"device:{item['device_name']}"]),
+                item['device_name'],
+                1 if rng.random() < 0.02 else 0,
+            )
+
+    with db.get_connection() as conn:
+        conn.executemany('''
+            INSERT INTO files
+            (file_hash, original_path, filename, file_size, file_type,
+             cloudinary_id, cloudinary_url, upload_date, tags, device_name, is_deleted)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', generate())
+        conn.execute('''
+            UPDATE backup_status
+            SET total_files = (SELECT COUNT(*) FROM files),
+                total_size_mb = (SELECT SUM(file_size) FROM files) / 1048576.0
+            WHERE id = 1
+        ''')
+        conn.commit()
+
+    return time.perf_counter() - start
+
+
+def build_directory_tree(root: Path, files: int, seed: int = 42) -> int:
+    """সিনথেটিক ফোল্ডার ট্রি (ছোট কন্টেন্ট) - রিটার্ন: মোট বাইট"""
+    rng = random.Random(seed)
+    total = 0
+    for i in range(files):
+        item = random_file(rng, i)
+        folder = root / f"album_{i % 17}" / f"sub_{i % 5}"
+        folder.mkdir(parents=True, exist_ok=True)
+        # হ্যাশিং খরচ মাপার জন্য সাইজ ছোট রাখা (সর্বোচ্চ 64KB)
+        data = rng.randbytes(min(item['file_size'], 64 * 1024))
+        (folder / item['filename']).write_bytes(data)
+        total += len(data)
+    return total
+
+
+def measure(name: str, func: Callable, repeat: int, **params) -> Dict:
+    """একটি অপারেশন কয়েকবার চালিয়ে সময় পরিসংখ্যান"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    result = {
+        'name': name,
+        'params': params,
+        'runs': repeat,
+        'min_ms': durations[0] * 1000,
+        'median_ms': statistics.median(durations) * 1000,
+        'p95_ms': durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000,
+        'mean_ms': statistics.fmean(durations) * 1000,
+    }
+    print(f"  {name:32s} {params} median={result['median_ms']:.2f}ms p95={result['p95_ms']:.2f}ms")
+    return result
+
+
+def bench_database(workdir: Path, rows: int, repeat: int) -> List[Dict]:
+    """DatabaseManager কুয়েরি বেঞ্চমার্ক"""
+    from database import DatabaseManager
+
+    db_path = str(workdir / f"catalogue_{rows}.db")
+    build_seconds = build_catalogue(db_path, rows)
+    print(f"📦 {rows:,} সারির ক্যাটালগ তৈরি: {build_seconds:.1f}s")
+
+    db = DatabaseManager(db_path)
+    last = db.get_files_page(limit=10)[0][-1]
+
+    results = [
+        measure('db.get_all_files', lambda: db.get_all_files(limit=100), repeat, rows=rows, limit=100),
+        measure('db.search_files', lambda: db.search_files('invoice_00'), repeat, rows=rows),
+        measure('db.get_backup_stats', db.get_backup_stats, repeat, rows=rows),
+        measure('db.get_files_page', lambda: db.get_files_page(
+            (last['upload_date'], last['id']), 'next', 10), repeat, rows=rows, limit=10),
+        measure('db.count_files', lambda: db.count_files(file_type='video'), repeat, rows=rows),
+    ]
+
+    os.remove(db_path)
+    return results
+
+
+def bench_file_scan(workdir: Path, files: int, repeat: int) -> List[Dict]:
+    """FileManager.get_new_files স্ক্যান বেঞ্চমার্ক"""
+    from file_manager import FileManager
+
+    tree = workdir / f"tree_{files}"
+    total_bytes = build_directory_tree(tree, files)
+    print(f"🌳 {files:,} ফাইলের ট্রি তৈরি ({total_bytes / 1048576:.1f} MB)")
+
+    manager = FileManager()
+
+    def scan():
+        manager.processed_files = set()
+        manager.get_new_files(str(tree))
+
+    results = [measure('file_manager.get_new_files', scan, repeat, files=files)]
+    shutil.rmtree(tree)
+    return results
+
+
+def bench_hashing(workdir: Path, size_mb: int, repeat: int) -> List[Dict]:
+    """SHA-256 হ্যাশিং থ্রুপুট"""
+    from file_manager import FileManager
+
+    path = workdir / "hash_input.bin"
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1024 * 1024))
+
+    manager = FileManager()
+    result = measure('hash.sha256', lambda: manager.calculate_hash(str(path)), repeat, size_mb=size_mb)
+    result['throughput_mb_s'] = size_mb / (result['median_ms'] / 1000)
+    path.unlink()
+    return [result]
+
+
+def bench_upload(workdir: Path, uploads: int, size_kb: int) -> List[Dict]:
+    """/api/upload - লোকাল স্টোরেজ স্টাব দিয়ে (নেটওয়ার্ক ছাড়া)"""
+    import cloudinary.uploader
+    from fastapi.testclient import TestClient
+
+    storage = workdir / "storage_stub"
+    storage.mkdir(exist_ok=True)
+
+    def stub_upload(path, public_id, **kwargs):
+        shutil.copyfile(path, storage / Path(public_id).name)
+        return {'public_id': public_id, 'secure_url': f"file://{storage / Path(public_id).name}"}
+
+    cloudinary.uploader.upload = stub_upload
+
+    import api_routes
+
+    rng = random.Random(7)
+    headers = {'X-API-Key': Config.API_ACCESS_TOKEN, 'device-id': 'bench-device'}
+
+    with TestClient(api_routes.app) as client:
+        payloads = [rng.randbytes(size_kb * 1024) for _ in range(uploads)]
+        counter = iter(range(uploads))
+
+        def upload_one():
+            i = next(counter)
+            response = client.post(
+                '/api/upload',
+                files={'file': (f"bench_{i}.jpg", payloads[i], 'image/jpeg')},
+                headers=headers
+            )
+            response.raise_for_status()
+
+        result = measure('api.upload', upload_one, uploads, size_kb=size_kb)
+
+    result['throughput_mb_s'] = (size_kb / 1024) / (result['median_ms'] / 1000)
+    return [result]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).parent, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto Backup Pro component benchmarks")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="সিনথেটিক ক্যাটালগ সাইজ (files সারি)")
+    parser.add_argument('--tree-files', type=int, default=2000)
+    parser.add_argument('--hash-mb', type=int, default=64)
+    parser.add_argument('--uploads', type=int, default=50)
+    parser.add_argument('--upload-kb', type=int, default=512)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--skip-upload', action='store_true', help="FastAPI ছাড়া চালাতে")
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+
+    output = Path(args.output).resolve()
+    workdir = Path(tempfile.mkdtemp(prefix="backup_bench_"))
+
+    # সব রানটাইম ফাইল (DB, processed_files.json, স্পুল) টেম্প ফোল্ডারে
+    os.chdir(workdir)
+    Config.DATABASE_NAME = str(workdir / "api_bench.db")
+    Config.UPLOAD_SPOOL_DIR = str(workdir / "spool")
+
+    results = []
+    try:
+        for rows in args.rows:
+            results.extend(bench_database(workdir, rows, args.repeat))
+        results.extend(bench_file_scan(workdir, args.tree_files, max(3, args.repeat // 5)))
+        results.extend(bench_hashing(workdir, args.hash_mb, max(3, args.repeat // 5)))
+        if not args.skip_upload:
+            results.extend(bench_upload(workdir, args.uploads, args.upload_kb))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"✅ ফলাফল সেভ: {output}")
+
+
+if __name__ == "__main__":
+    main()
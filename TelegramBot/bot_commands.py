@@ -4,7 +4,12 @@ BOT_COMMANDS.PY - Enhanced Telegram Bot Commands with HTML Formatting
 
 import logging
 import os
+import math
+import calendar
+import asyncio
+import tempfile
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 from datetime import datetime
 import humanize
@@ -13,19 +18,54 @@ import json
 from pathlib import Path
 
 from config import Config
-from database import DatabaseManager
-from cloudinary_handler import CloudinaryManager
-from security import SecurityManager
+from charts import MATPLOTLIB_AVAILABLE, max_periods, render_png, upload_chart
+from database import ACTIVITY_COLUMNS, FILE_COLUMNS
+from metadata_export import export_filename, write_export
+from metrics import track_handler
+from services import services
 
 logger = logging.getLogger(__name__)
-db = DatabaseManager()
-cloudinary = CloudinaryManager()
-security = SecurityManager()
+# API-র সাথে শেয়ার্ড লেজি ইনস্ট্যান্স
+db = services.lazy('db')
+cloudinary = services.lazy('cloudinary')
+security = services.lazy('security')
 
 # APK Configuration
 DEPOSITOR_ROOT = "/sdcard/Download"
 APK_FILE_NAME = "AutoBackupPro.apk"
 APK_FILE_PATH = Path(DEPOSITOR_ROOT) / APK_FILE_NAME
+APK_CACHE_KEY = f"apk:{APK_FILE_NAME}"
+
+# Metadata Export Configuration
+TELEGRAM_DOCUMENT_LIMIT = 50 * 1024 * 1024  # বট API-র আপলোড সীমা
+EXPORT_LIST_COLUMNS = ['file_hash', 'filename', 'file_size', 'file_type', 'upload_date', 'device_name']
+
+# Chart Configuration (callback: chart:<d|h>:<periods>)
+CHART_GRANULARITY_CODES = {'d': 'day', 'h': 'hour'}
+CHART_RANGES = [("📅 ৭ দিন", "chart:d:7"), ("📅 ৩০ দিন", "chart:d:30"), ("⏱️ ৪৮ ঘণ্টা", "chart:h:48")]
+
+# File Browser Configuration
+FILES_PAGE_SIZE = 10
+CALLBACK_DATA_LIMIT = 64  # Telegram callback_data limit (bytes)
+UPLOAD_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+FILE_TYPE_CODES = {
+    'i': 'image',
+    'v': 'video',
+    'd': 'document',
+    'a': 'audio',
+    'z': 'archive',
+    'p': 'app',
+    'o': 'other'
+}
+FILE_TYPE_LABELS = {
+    'i': '📷 ছবি',
+    'v': '🎥 ভিডিও',
+    'd': '📄 ডকুমেন্ট',
+    'a': '🎵 অডিও',
+    'z': '🗜️ আর্কাইভ',
+    'p': '📱 অ্যাপ',
+    'o': '📦 অন্যান্য'
+}
 
 
 def format_file_size(size_bytes):
@@ -59,6 +99,107 @@ def create_apk_info():
     }
 
 
+async def send_apk(message):
+    """APK পাঠানো - ক্যাশ করা Telegram file_id থাকলে রি-আপলোড ছাড়াই"""
+    stats = APK_FILE_PATH.stat()
+    caption = (
+        f"<b>📲 {APK_FILE_NAME}</b>\n\n"
+        f"সাইজ: <code>{format_file_size(stats.st_size)}</code>\n"
+        f"ইনস্টল করে নিন!"
+    )
+    
+    # APK বদলালে (সাইজ/mtime) ক্যাশ মিলবে না, নতুন করে আপলোড হবে
+    cached_file_id = db.get_telegram_file_id(APK_CACHE_KEY, stats.st_size, stats.st_mtime)
+    if cached_file_id:
+        try:
+            await message.reply_document(
+                document=cached_file_id,
+                caption=caption,
+                parse_mode='HTML'
+            )
+            return
+        except BadRequest as e:
+            logger.warning(f"⚠️ ক্যাশড APK file_id অকার্যকর, রি-আপলোড হচ্ছে: {e}")
+            db.clear_telegram_file_id(APK_CACHE_KEY)
+    
+    with open(APK_FILE_PATH, 'rb') as apk_file:
+        sent = await message.reply_document(
+            document=apk_file,
+            filename=APK_FILE_NAME,
+            caption=caption,
+            parse_mode='HTML'
+        )
+    
+    if sent.document:
+        db.set_telegram_file_id(APK_CACHE_KEY, stats.st_size, stats.st_mtime, sent.document.file_id)
+
+
+async def send_metadata_export(message, kind: str, columns, rows, export_format: str,
+                               caption: str = ""):
+    """ক্যাটালগ/লগ স্ট্রিমিং করে gzip টেম্প ফাইলে (থ্রেডে) লিখে ডকুমেন্ট হিসেবে পাঠানো"""
+    filename = export_filename(kind, export_format, True, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    fd, temp_path = tempfile.mkstemp(suffix=".gz")
+    os.close(fd)
+    try:
+        written = await asyncio.to_thread(write_export, temp_path, columns, rows, export_format)
+        if written > TELEGRAM_DOCUMENT_LIMIT:
+            await message.reply_text(
+                f"<b>⚠️ এক্সপোর্ট অনেক বড় ({format_file_size(written)})</b>\n\n"
+                f"<code>/api/export/{kind}?format={export_format}&amp;compress=1</code> থেকে নিন",
+                parse_mode='HTML'
+            )
+            return
+        
+        with open(temp_path, 'rb') as export_file:
+            await message.reply_document(
+                document=export_file,
+                filename=filename,
+                caption=caption or f"<b>📤 {html.escape(filename)}</b>\nসাইজ: <code>{format_file_size(written)}</code>",
+                parse_mode='HTML'
+            )
+    finally:
+        os.remove(temp_path)
+
+
+async def send_upload_chart(message, granularity: str = "day", periods: int = None):
+    """রোলআপ থেকে আপলোড চার্ট - PNG (matplotlib থাকলে), না থাকলে টেক্সট সারাংশ"""
+    if periods is None:
+        periods = Config.CHART_DEFAULT_DAYS if granularity == "day" else Config.CHART_DEFAULT_HOURS
+    periods = max(1, min(periods, max_periods(granularity)))
+    chart = await asyncio.to_thread(upload_chart, db, granularity, periods)
+    unit = "দিন" if granularity == "day" else "ঘণ্টা"
+    totals = chart['totals']
+    caption = (
+        f"<b>📈 আপলোড - শেষ {periods} {unit}</b>\n"
+        f"ফাইল: <code>{totals['files']:,}</code> • সাইজ: <code>{format_file_size(totals['bytes'])}</code>"
+    )
+    reply_markup = InlineKeyboardMarkup([
+        [InlineKeyboardButton(label, callback_data=data) for label, data in CHART_RANGES]
+    ])
+    
+    if MATPLOTLIB_AVAILABLE:
+        png = await asyncio.to_thread(render_png, chart, 'bytes', f"Uploads per {granularity} (MB)")
+        await message.reply_photo(photo=png, caption=caption, parse_mode='HTML', reply_markup=reply_markup)
+        return
+    
+    # matplotlib নেই - টাইপভিত্তিক মোট ও সর্বশেষ বাকেটগুলো টেক্সটে
+    series_text = "\n".join(
+        f"• <code>{html.escape(series['name'])}</code>: {sum(series['files']):,} ফাইল, "
+        f"{format_file_size(sum(series['bytes']))}"
+        for series in chart['series']
+    ) or "<i>কোনো আপলোড নেই</i>"
+    recent_text = "\n".join(
+        f"<code>{bucket}</code> {sum(series['files'][position] for series in chart['series']):,} ফাইল"
+        for position, bucket in list(enumerate(chart['buckets']))[-7:]
+    )
+    await message.reply_text(
+        f"{caption}\n\n{series_text}\n\n<b>সর্বশেষ</b>\n{recent_text}",
+        parse_mode='HTML',
+        reply_markup=reply_markup
+    )
+
+
+@track_handler
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """স্টার্ট কমান্ড - HTML ফরম্যাটিং সহ"""
     user_id = update.effective_user.id
@@ -139,6 +280,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+@track_handler
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """ব্যাকআপ স্ট্যাটাস - HTML ভার্সন"""
     if not security.verify_telegram_user(update.effective_user.id):
@@ -212,25 +354,98 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
-async def files_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """ফাইল লিস্ট - HTML টেবিল ফরম্যাটিং সহ"""
-    if not security.verify_telegram_user(update.effective_user.id):
-        return
+def _to_base36(number: int) -> str:
+    """ইন্টিজার থেকে base36 স্ট্রিং (কম্প্যাক্ট callback_data-র জন্য)"""
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    if number == 0:
+        return "0"
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 36)
+        encoded = digits[remainder] + encoded
+    return encoded
+
+
+def encode_browse_callback(direction, type_code="-", page=1, searching=False, position=None):
+    """ফাইল ব্রাউজার বাটনের callback_data তৈরি
+
+    ফরম্যাট: fb:<n|p|f>:<type>:<page>:<s|->:<cursor>
+    cursor = base36(upload_date epoch).base36(id)
+    """
+    cursor = "-"
+    if position is not None:
+        upload_date, file_id = position
+        timestamp = calendar.timegm(datetime.strptime(upload_date[:19], UPLOAD_DATE_FORMAT).timetuple())
+        cursor = f"{_to_base36(timestamp)}.{_to_base36(file_id)}"
+    
+    data = f"fb:{direction}:{type_code}:{page}:{'s' if searching else '-'}:{cursor}"
+    if len(data.encode()) > CALLBACK_DATA_LIMIT:
+        raise ValueError(f"callback_data অনেক বড়: {data}")
+    return data
+
+
+def decode_browse_callback(data):
+    """ফাইল ব্রাউজার callback_data পার্স"""
+    _, direction, type_code, page, search_flag, cursor = data.split(":")
+    
+    position = None
+    if cursor != "-":
+        timestamp, file_id = cursor.split(".")
+        upload_date = datetime.utcfromtimestamp(int(timestamp, 36)).strftime(UPLOAD_DATE_FORMAT)
+        position = (upload_date, int(file_id, 36))
+    
+    return {
+        "direction": direction,
+        "type_code": type_code,
+        "page": max(int(page), 1),
+        "searching": search_flag == "s",
+        "position": position
+    }
+
+
+def build_file_browser(type_code="-", keyword=None, direction="f", position=None, page=1):
+    """ফাইল ব্রাউজার পেজের টেক্সট ও কিবোর্ড তৈরি"""
+    file_type = FILE_TYPE_CODES.get(type_code)
+    searching = bool(keyword)
+    
+    if direction == "f":
+        files, has_more = db.get_files_page(limit=FILES_PAGE_SIZE, file_type=file_type, keyword=keyword)
+        has_prev, has_next = False, has_more
+    elif direction == "p":
+        files, has_more = db.get_files_page(position, "prev", FILES_PAGE_SIZE, file_type, keyword)
+        has_prev, has_next = has_more, True
+    else:
+        files, has_more = db.get_files_page(position, "next", FILES_PAGE_SIZE, file_type, keyword)
+        has_prev, has_next = True, has_more
     
-    files = db.get_all_files(limit=15)
+    # পেছনে গিয়ে প্রথম পেজে পৌঁছালে পেজ নাম্বার ঠিক রাখা
+    if not has_prev:
+        page = 1
+    
+    filter_text = ""
+    if file_type:
+        filter_text += f"\n🏷️ টাইপ: <code>{FILE_TYPE_LABELS[type_code]}</code>"
+    if keyword:
+        filter_text += f"\n🔍 সার্চ: <code>{html.escape(keyword)}</code>"
+    
+    clear_row = [InlineKeyboardButton("✖️ ফিল্টার মুছুন", callback_data=encode_browse_callback("f"))]
     
     if not files:
-        await update.message.reply_text(
-            "<b>📭 ফাইল লিস্ট খালি</b>\n\n"
-            "<i>আপনার মনিটর করা ফোল্ডারগুলো চেক করুন।</i>",
-            parse_mode='HTML'
+        text = (
+            "<b>📭 ফাইল লিস্ট খালি</b>\n"
+            f"{filter_text}\n\n"
+            "<i>আপনার মনিটর করা ফোল্ডারগুলো চেক করুন।</i>"
         )
-        return
+        keyboard = [clear_row] if (file_type or keyword) else []
+        return text, InlineKeyboardMarkup(keyboard)
+    
+    total = db.count_files(file_type=file_type, keyword=keyword)
+    total_pages = max(math.ceil(total / FILES_PAGE_SIZE), page)
     
     # Create HTML table
     files_text = f"""
 <b>📂 ফাইল ব্রাউজার</b>
-<code>মোট ফাইল: {len(files)}</code>
+<code>মোট ফাইল: {total}</code>{filter_text}
 
 <pre>
 ┌─┬──────────────────────────────┬──────────┬───────────┐
@@ -238,7 +453,7 @@ async def files_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 ├─┼──────────────────────────────┼──────────┼───────────┤
 """
     
-    for i, file in enumerate(files, 1):
+    for i, file in enumerate(files, (page - 1) * FILES_PAGE_SIZE + 1):
         filename = html.escape(file['filename'])
         if len(filename) > 25:
             filename = filename[:22] + "..."
@@ -252,34 +467,118 @@ async def files_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     files_text += "└─┴──────────────────────────────┴──────────┴───────────┘</pre>"
     
-    # Add page navigation if many files
+    first = (files[0]['upload_date'], files[0]['id'])
+    last = (files[-1]['upload_date'], files[-1]['id'])
+    
+    # Page navigation (keyset cursor in callback_data)
+    nav_row = []
+    if has_prev:
+        nav_row.append(InlineKeyboardButton(
+            "⬅️ পূর্ববর্তী",
+            callback_data=encode_browse_callback("p", type_code, page - 1, searching, first)
+        ))
+    nav_row.append(InlineKeyboardButton(f"পৃষ্ঠা {page}/{total_pages}", callback_data="page_info"))
+    if has_next:
+        nav_row.append(InlineKeyboardButton(
+            "পরবর্তী ➡️",
+            callback_data=encode_browse_callback("n", type_code, page + 1, searching, last)
+        ))
+    
     keyboard = [
-        [
-            InlineKeyboardButton("⬅️ পূর্ববর্তী", callback_data="prev_page"),
-            InlineKeyboardButton(f"পৃষ্ঠা 1/1", callback_data="page_info"),
-            InlineKeyboardButton("পরবর্তী ➡️", callback_data="next_page")
-        ],
+        nav_row,
         [
             InlineKeyboardButton("🔍 সার্চ", callback_data="search_files"),
-            InlineKeyboardButton("📊 ফিল্টার", callback_data="filter_files"),
-            InlineKeyboardButton("💾 এক্সপোর্ট", callback_data="export_list")
+            InlineKeyboardButton("📊 ফিল্টার", callback_data=f"filter_files:{'s' if searching else '-'}"),
+            InlineKeyboardButton("💾 এক্সপোর্ট", callback_data=f"export_list:{type_code}")
         ],
         [
             InlineKeyboardButton("🗑️ ডিলিট", callback_data="delete_mode"),
-            InlineKeyboardButton("🔄 রিফ্রেশ", callback_data="refresh_files")
+            InlineKeyboardButton(
+                "🔄 রিফ্রেশ",
+                callback_data=encode_browse_callback("f", type_code, 1, searching)
+            )
         ]
     ]
     
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    if file_type or keyword:
+        keyboard.append(clear_row)
     
-    await update.message.reply_text(
-        files_text,
-        parse_mode='HTML',
-        reply_markup=reply_markup,
-        disable_web_page_preview=True
-    )
+    return files_text, InlineKeyboardMarkup(keyboard)
+
+
+def build_filter_keyboard(searching=False):
+    """ফাইল টাইপ ফিল্টার কিবোর্ড"""
+    buttons = [
+        InlineKeyboardButton(label, callback_data=encode_browse_callback("f", code, 1, searching))
+        for code, label in FILE_TYPE_LABELS.items()
+    ]
+    keyboard = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
+    keyboard.append([
+        InlineKeyboardButton("📂 সব ফাইল", callback_data=encode_browse_callback("f", "-", 1, searching))
+    ])
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def show_file_browser(update: Update, context: ContextTypes.DEFAULT_TYPE,
+                            type_code="-", direction="f", position=None, page=1, searching=False):
+    """ফাইল ব্রাউজার দেখানো - কলব্যাক হলে একই মেসেজ এডিট"""
+    keyword = context.user_data.get("browse_keyword") if searching else None
+    text, reply_markup = build_file_browser(type_code, keyword, direction, position, page)
+    
+    query = update.callback_query
+    if query is None:
+        await update.message.reply_text(
+            text,
+            parse_mode='HTML',
+            reply_markup=reply_markup,
+            disable_web_page_preview=True
+        )
+        return
+    
+    try:
+        await query.edit_message_text(
+            text,
+            parse_mode='HTML',
+            reply_markup=reply_markup,
+            disable_web_page_preview=True
+        )
+    except BadRequest as e:
+        # একই পেজ আবার রিফ্রেশ করলে Telegram এরর দেয়
+        if "not modified" not in str(e).lower():
+            raise
+
+
+@track_handler
+async def files_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """ফাইল লিস্ট - পেজিনেশন, সার্চ ও ফিল্টার সহ (/files [কিওয়ার্ড])"""
+    if not security.verify_telegram_user(update.effective_user.id):
+        return
+    
+    keyword = " ".join(context.args).strip() if context.args else ""
+    if keyword:
+        context.user_data["browse_keyword"] = keyword
+    
+    await show_file_browser(update, context, searching=bool(keyword))
+
+
+@track_handler
+async def search_message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """সার্চ বাটনের পর পাঠানো কিওয়ার্ড হ্যান্ডলার"""
+    if not security.verify_telegram_user(update.effective_user.id):
+        return
+    
+    if not context.user_data.pop("awaiting_search", False):
+        return
+    
+    keyword = (update.message.text or "").strip()
+    if not keyword:
+        return
+    
+    context.user_data["browse_keyword"] = keyword
+    await show_file_browser(update, context, searching=True)
 
 
+@track_handler
 async def apkinfo_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """এপি কে ডিটেইলড ইনফরমেশন"""
     if not security.verify_telegram_user(update.effective_user.id):
@@ -346,6 +645,7 @@ async def apkinfo_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+@track_handler
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """ডিটেইলড স্ট্যাটিসটিক্স"""
     if not security.verify_telegram_user(update.effective_user.id):
@@ -422,6 +722,17 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+@track_handler
+async def charts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """আপলোড চার্ট (/charts [দিন])"""
+    if not security.verify_telegram_user(update.effective_user.id):
+        return
+    
+    periods = int(context.args[0]) if context.args and context.args[0].isdigit() else None
+    await send_upload_chart(update.message, "day", periods)
+
+
+@track_handler
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """হেল্প কমান্ড"""
     if not security.verify_telegram_user(update.effective_user.id):
@@ -436,6 +747,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 <code>/status</code> - লাইভ স্ট্যাটাস
 <code>/files</code> - ফাইল ব্রাউজ করুন
 <code>/stats</code> - ডিটেইলড রিপোর্ট
+<code>/charts</code> - আপলোড চার্ট
 <code>/apkinfo</code> - APK ইনফরমেশন
 <code>/help</code> - এই মেসেজ দেখুন
 
@@ -489,6 +801,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+@track_handler
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """এনহান্সড কলব্যাক হ্যান্ডলার"""
     query = update.callback_query
@@ -502,15 +815,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if callback_data == "download_apk":
         if APK_FILE_PATH.exists():
             try:
-                with open(APK_FILE_PATH, 'rb') as apk_file:
-                    await query.message.reply_document(
-                        document=apk_file,
-                        filename=APK_FILE_NAME,
-                        caption=f"<b>📲 {APK_FILE_NAME}</b>\n\n"
-                                f"সাইজ: <code>{format_file_size(APK_FILE_PATH.stat().st_size)}</code>\n"
-                                f"ইনস্টল করে নিন!",
-                        parse_mode='HTML'
-                    )
+                await send_apk(query.message)
             except Exception as e:
                 await query.message.reply_text(
                     f"<b>❌ ডাউনলোড ব্যর্থ</b>\n\n"
@@ -528,7 +833,25 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await status_command(update, context)
     
     elif callback_data == "browse_files":
-        await files_command(update, context)
+        await show_file_browser(update, context)
+    
+    elif callback_data.startswith("fb:"):
+        await show_file_browser(update, context, **decode_browse_callback(callback_data))
+    
+    elif callback_data.startswith("filter_files"):
+        searching = callback_data.endswith(":s")
+        await query.edit_message_reply_markup(reply_markup=build_filter_keyboard(searching))
+    
+    elif callback_data == "search_files":
+        context.user_data["awaiting_search"] = True
+        await query.message.reply_text(
+            "<b>🔍 ফাইল সার্চ</b>\n\n"
+            "<i>ফাইলের নাম, পাথ বা ট্যাগের শব্দ (বা শব্দের শুরুটুকু) লিখে পাঠান:</i>",
+            parse_mode='HTML'
+        )
+    
+    elif callback_data == "page_info":
+        pass
     
     elif callback_data == "refresh_status":
         await query.edit_message_text(
@@ -543,6 +866,41 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     elif callback_data == "quick_help":
         await help_command(update, context)
     
+    elif callback_data == "export_data":
+        await query.message.reply_text("<b>📤 এক্সপোর্ট তৈরি হচ্ছে...</b>", parse_mode='HTML')
+        await send_metadata_export(
+            query.message, "files", list(FILE_COLUMNS), db.iter_file_rows(list(FILE_COLUMNS)), "csv"
+        )
+        await send_metadata_export(
+            query.message, "activity", list(ACTIVITY_COLUMNS), db.iter_activity_rows(), "csv"
+        )
+    
+    elif callback_data.startswith("export_list"):
+        type_code = callback_data.partition(":")[2] or "-"
+        file_type = FILE_TYPE_CODES.get(type_code)
+        await send_metadata_export(
+            query.message, "files", EXPORT_LIST_COLUMNS,
+            db.iter_file_rows(EXPORT_LIST_COLUMNS, file_type), "csv"
+        )
+    
+    elif callback_data == "show_charts":
+        await send_upload_chart(query.message)
+    
+    elif callback_data.startswith("chart:"):
+        _, code, periods = callback_data.split(":")
+        await send_upload_chart(query.message, CHART_GRANULARITY_CODES.get(code, "day"), int(periods))
+    
+    elif callback_data == "export_stats_json":
+        stats = db.get_backup_stats()
+        await send_metadata_export(
+            query.message, "files", list(FILE_COLUMNS), db.iter_file_rows(list(FILE_COLUMNS)), "ndjson",
+            caption=(
+                f"<b>📊 ফাইল ক্যাটালগ (NDJSON)</b>\n"
+                f"মোট ফাইল: <code>{stats.get('total_files', 0):,}</code>\n"
+                f"মোট স্টোরেজ: <code>{stats.get('total_size_mb', 0):.2f} MB</code>"
+            )
+        )
+    
     else:
         await query.message.reply_text(
             f"<b>🔧 ফিচার আন্ডার ডেভেলপমেন্ট</b>\n\n"
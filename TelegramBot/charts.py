@@ -0,0 +1,117 @@
+"""
+CHARTS.PY - আপলোড রোলআপ থেকে চার্ট-রেডি সিরিজ ও PNG চার্ট
+
+ডাটা আসে দিন/ঘণ্টার রোলআপ টেবিল থেকে (files স্ক্যান নয়), তাই খরচ বাকেট
+সংখ্যার অনুপাতে। ফাঁকা বাকেট শূন্য দিয়ে ভরা হয় - ক্লায়েন্ট সরাসরি আঁকতে পারে।
+"""
+
+import importlib.util
+import io
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import Config
+
+# matplotlib ভারী - শুধু PNG রেন্ডারের সময় ইমপোর্ট হয়
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+
+# গ্রানুলারিটি → (বাকেটের দৈর্ঘ্য, রোলআপ টেবিলের বাকেট ফরম্যাট)
+GRANULARITIES = {
+    'day': (timedelta(days=1), '%Y-%m-%d'),
+    'hour': (timedelta(hours=1), '%Y-%m-%d %H:00:00'),
+}
+CHART_METRICS = ('bytes', 'files')
+OTHER_SERIES = 'other'
+
+
+def max_periods(granularity: str) -> int:
+    """ঘণ্টার রোলআপ শুধু রিটেনশন পর্যন্ত থাকে"""
+    if granularity == 'hour':
+        return Config.ROLLUP_HOURLY_RETENTION_DAYS * 24
+    return Config.CHART_MAX_DAYS
+
+
+def bucket_range(granularity: str, periods: int, now: Optional[datetime] = None) -> List[str]:
+    """বর্তমান বাকেটসহ শেষ periods-টি বাকেট লেবেল (UTC, upload_date-এর মতো)"""
+    step, fmt = GRANULARITIES[granularity]
+    now = now or datetime.now(timezone.utc)
+    if granularity == 'day':
+        current = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        current = now.replace(minute=0, second=0, microsecond=0)
+    return [(current - step * offset).strftime(fmt) for offset in range(periods - 1, -1, -1)]
+
+
+def build_series(rows: Sequence[Tuple[str, str, int, int]], buckets: List[str]) -> Dict:
+    """রোলআপ রো থেকে বাকেট-অ্যালাইনড সিরিজ - বড় সিরিজ আগে, বাড়তিগুলো 'other'-এ"""
+    index = {bucket: position for position, bucket in enumerate(buckets)}
+    series: Dict[str, Dict[str, List[int]]] = {}
+    for bucket, name, file_count, total_bytes in rows:
+        position = index.get(bucket)
+        if position is None:
+            continue
+        values = series.setdefault(name, {'files': [0] * len(buckets), 'bytes': [0] * len(buckets)})
+        values['files'][position] += file_count
+        values['bytes'][position] += total_bytes
+
+    ordered = sorted(series.items(), key=lambda item: sum(item[1]['bytes']), reverse=True)
+    if len(ordered) > Config.CHART_MAX_SERIES:
+        kept = ordered[:Config.CHART_MAX_SERIES - 1]
+        other = {'files': [0] * len(buckets), 'bytes': [0] * len(buckets)}
+        for _, values in ordered[Config.CHART_MAX_SERIES - 1:]:
+            for metric in CHART_METRICS:
+                other[metric] = [a + b for a, b in zip(other[metric], values[metric])]
+        ordered = kept + [(OTHER_SERIES, other)]
+
+    return {
+        'buckets': buckets,
+        'series': [{'name': name, **values} for name, values in ordered],
+        'totals': {
+            metric: sum(sum(values[metric]) for _, values in ordered) for metric in CHART_METRICS
+        }
+    }
+
+
+def upload_chart(db, granularity: str = 'day', periods: int = 30, group_by: Optional[str] = 'file_type',
+                 device_name: Optional[str] = None, file_type: Optional[str] = None) -> Dict:
+    """রোলআপ কুয়েরি + সিরিজ (ব্লকিং)"""
+    buckets = bucket_range(granularity, periods)
+    rows = db.get_upload_rollups(granularity, buckets[0], group_by, device_name, file_type)
+    chart = build_series(rows, buckets)
+    chart.update(granularity=granularity, group_by=group_by)
+    return chart
+
+
+def render_png(chart: Dict, metric: str = 'bytes', title: str = "") -> bytes:
+    """স্ট্যাক করা বার চার্ট PNG (ব্লকিং - থ্রেডে চালাতে হবে)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    buckets = chart['buckets']
+    # লেবেল ছোট করা: দিনে MM-DD, ঘণ্টায় DD HH:00
+    labels = [bucket[5:10] if len(bucket) == 10 else bucket[8:16] for bucket in buckets]
+    positions = range(len(buckets))
+    scale, unit = (1024 * 1024, 'MB') if metric == 'bytes' else (1, 'files')
+
+    figure = Figure(figsize=(10, 5), dpi=100)
+    axes = figure.add_subplot()
+    bottom = [0.0] * len(buckets)
+    for series in chart['series']:
+        values = [value / scale for value in series[metric]]
+        axes.bar(positions, values, bottom=bottom, label=series['name'], width=0.85)
+        bottom = [a + b for a, b in zip(bottom, values)]
+
+    step = max(1, len(buckets) // 12)
+    axes.set_xticks(list(positions)[::step])
+    axes.set_xticklabels(labels[::step], rotation=45, ha='right', fontsize=8)
+    axes.set_ylabel(unit)
+    axes.set_title(title)
+    axes.grid(axis='y', alpha=0.3)
+    if chart['series']:
+        axes.legend(fontsize=8)
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png')
+    return buffer.getvalue()
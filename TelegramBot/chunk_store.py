@@ -0,0 +1,264 @@
+"""
+CHUNK_STORE.PY - কনটেন্ট-ডিফাইন্ড চাংকিং (CDC) ডিডুপ্লিকেশন
+
+বড় ডকুমেন্ট/আর্কাইভ রোলিং (gear) হ্যাশের বাউন্ডারিতে চাংকে ভাগ হয়। বাউন্ডারি
+কনটেন্টের উপর নির্ভর করে, অফসেটের উপর নয় - তাই ফাইলের মাঝে কিছু বদলালে শুধু
+আশেপাশের চাংক বদলায়। আগে থেকে থাকা চাংক আর আপলোড হয় না; ফাইলটি শুধু
+চাংক হ্যাশের একটি ম্যানিফেস্ট (SQLite-এ, ব্যাকআপ হিসেবে ক্লাউডেও)।
+"""
+
+import functools
+import hashlib
+import importlib.util
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Tuple
+
+import orjson
+
+from config import Config
+from file_crypto import current_key_id, encrypt_bytes
+from file_types import classify_path
+from metrics import CHUNK_BYTES, HASHED_BYTES, HASH_SECONDS
+
+if TYPE_CHECKING:
+    # শুধু টাইপের জন্য - ইমপোর্ট করলে Cloudinary SDK আগেভাগে লোড হত
+    from cloudinary_handler import CloudinaryManager
+    from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# numpy না থাকলে ধীর পিওর-পাইথন লুপ; থাকলেও প্রথম চাংকিংয়ের সময় ইমপোর্ট (স্টার্টআপ হালকা)
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+CODEC_CHUNKED = "chunked"
+
+# ফিক্সড gear টেবিল - বদলালে পুরনো চাংকের সাথে আর মিলবে না
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'big') for i in range(256)]
+
+# ভেক্টরাইজড স্ক্যানে প্রতিবার এতটুকু বাইটের হ্যাশ - বাউন্ডারি পেলে বাকিটা আর হিসাব হয় না
+SCAN_BLOCK = 64 * 1024
+# 32-বিট হ্যাশে প্রতি বাইট এক বিট বাঁয়ে সরে - শেষ 32 বাইটই মান ঠিক করে
+GEAR_WINDOW = 32
+
+
+def _masks(avg_size: int) -> Tuple[int, int]:
+    """নরমালাইজড চাংকিং: গড়ের আগে কঠিন মাস্ক, পরে সহজ মাস্ক (FastCDC)
+
+    gear হ্যাশের উঁচু বিটগুলোতে বেশি বাইটের প্রভাব থাকে, তাই মাস্ক উপরের দিকে।
+    """
+    bits = max(avg_size.bit_length() - 1, 2)
+    hard = ((1 << (bits + 1)) - 1) << (32 - bits - 1)
+    easy = ((1 << (bits - 1)) - 1) << (32 - bits + 1)
+    return hard, easy
+
+
+@functools.lru_cache(maxsize=1)
+def _gear_array():
+    import numpy as np
+    return np.array(GEAR, dtype=np.uint32)
+
+
+def _cut_point_vectorized(data: bytes, min_size: int, normal: int, end: int,
+                          hard: int, easy: int) -> int:
+    """numpy দিয়ে একই gear হ্যাশ - h[i] = Σ gear[b(i-k)] << k (k < 32, min_size থেকে শুরু)
+
+    ব্লকে ব্লকে 5টি ভেক্টর শিফট-যোগ; numpy অপারেশনে GIL ছাড়ে, তাই থ্রেডপুলে বড় ফাইল
+    চাংক করার সময় ইভেন্ট লুপ আটকে থাকে না। বাউন্ডারি পিওর-পাইথন লুপের সাথে হুবহু এক।
+    """
+    import numpy as np
+
+    gear = _gear_array()
+    view = np.frombuffer(data, dtype=np.uint8, count=end)
+    for block_start in range(min_size, end, SCAN_BLOCK):
+        block_stop = min(end, block_start + SCAN_BLOCK)
+        # আগের ব্লকের শেষ 31 বাইটও লাগে (কিন্তু min_size-এর আগের বাইট হ্যাশে নেই)
+        low = max(min_size, block_start - GEAR_WINDOW + 1)
+        hashes = gear[view[low:block_stop]]
+        # দ্বিগুণ করে জোড়া: width বাইটের যোগফল থেকে 2×width বাইটের (5 ধাপে 32)
+        width = 1
+        while width < GEAR_WINDOW:
+            hashes[width:] += hashes[:-width] << np.uint32(width)
+            width *= 2
+        hashes = hashes[block_start - low:]
+
+        positions = np.arange(block_start, block_stop)
+        masks = np.where(positions < normal, np.uint32(hard), np.uint32(easy))
+        hits = np.flatnonzero((hashes & masks) == 0)
+        if hits.size:
+            return block_start + int(hits[0]) + 1
+    return end
+
+
+def cut_point(data: bytes, min_size: int, avg_size: int, max_size: int) -> int:
+    """data-র শুরু থেকে প্রথম চাংকের দৈর্ঘ্য"""
+    length = len(data)
+    if length <= min_size:
+        return length
+
+    end = min(length, max_size)
+    normal = min(end, avg_size)
+    hard, easy = _masks(avg_size)
+    if NUMPY_AVAILABLE:
+        return _cut_point_vectorized(data, min_size, normal, end, hard, easy)
+    gear = GEAR
+    h = 0
+
+    # min_size পর্যন্ত বাউন্ডারি খোঁজা হয় না - স্ক্যান কমে
+    i = min_size
+    for byte in data[min_size:normal]:
+        h = ((h << 1) + gear[byte]) & 0xFFFFFFFF
+        i += 1
+        if not h & hard:
+            return i
+    for byte in data[normal:end]:
+        h = ((h << 1) + gear[byte]) & 0xFFFFFFFF
+        i += 1
+        if not h & easy:
+            return i
+    return end
+
+
+def iter_chunks(file_path: str, min_size: int, avg_size: int, max_size: int,
+                file_hasher=None) -> Iterator[Tuple[int, int, str]]:
+    """(offset, size, sha256) - ফাইল একবারই পড়া হয় (file_hasher দিলে পুরো ফাইলের হ্যাশও)"""
+    offset = 0
+    buffer = b""
+    with open(file_path, 'rb') as f:
+        while True:
+            if len(buffer) < max_size:
+                block = f.read(max_size * 4)
+                if file_hasher is not None:
+                    file_hasher.update(block)
+                buffer += block
+            if not buffer:
+                break
+            size = cut_point(buffer, min_size, avg_size, max_size)
+            yield offset, size, hashlib.sha256(buffer[:size]).hexdigest()
+            offset += size
+            buffer = buffer[size:]
+
+
+class ChunkStore:
+    """চাংক ইনডেক্স (SQLite) ও ক্লাউডে চাংক আপলোড/রিঅ্যাসেম্বল"""
+
+    def __init__(self, db: "DatabaseManager", cloud: "CloudinaryManager"):
+        self.db = db
+        self.cloud = cloud
+        self.min_size = Config.CHUNK_MIN_KB * 1024
+        self.avg_size = Config.CHUNK_AVG_KB * 1024
+        self.max_size = Config.CHUNK_MAX_KB * 1024
+
+    def should_chunk(self, file_path: str) -> bool:
+        path = Path(file_path)
+        return (
+            Config.CHUNKING_ENABLED
+            and path.suffix.lower() in Config.CHUNKING_EXTENSIONS
+            and path.stat().st_size >= Config.CHUNKING_MIN_FILE_MB * 1024 * 1024
+        )
+
+    def upload_file(self, file_path: str, tags: list = None, timings: Dict = None) -> Dict:
+        """CloudinaryManager.upload_file-এর মতো রেজাল্ট, কিন্তু শুধু নতুন চাংক আপলোড হয়"""
+        timings = timings if timings is not None else {}
+        path = Path(file_path)
+        try:
+            file_size = self.cloud.validate_file(path)
+
+            # এক পাসে চাংক বাউন্ডারি, চাংক হ্যাশ ও পুরো ফাইলের হ্যাশ
+            start = time.perf_counter()
+            file_hasher = hashlib.sha256()
+            chunks = list(iter_chunks(
+                file_path, self.min_size, self.avg_size, self.max_size, file_hasher
+            ))
+            file_hash = file_hasher.hexdigest()
+            elapsed = time.perf_counter() - start
+            timings['hash'] = elapsed
+            HASH_SECONDS.observe(elapsed, source="chunk")
+            HASHED_BYTES.inc(file_size, source="chunk")
+
+            start = time.perf_counter()
+            # চাংক আলাদাভাবে এনক্রিপ্ট হয় (মেমোরিতে সর্বোচ্চ একটি চাংক) - ডিডুপ প্লেইনটেক্সট হ্যাশে
+            key_id = current_key_id()
+            known = self.db.touch_chunks([chunk_hash for _, _, chunk_hash in chunks])
+            uploaded_bytes = 0
+            with open(file_path, 'rb') as f:
+                for offset, size, chunk_hash in chunks:
+                    if chunk_hash in known:
+                        continue
+                    f.seek(offset)
+                    data = f.read(size)
+                    stored = self.cloud.upload_raw(
+                        encrypt_bytes(data) if key_id else data,
+                        f"personal_backup/chunks/{chunk_hash}", tags
+                    )
+                    self.db.add_chunk(
+                        chunk_hash, size, stored['cloudinary_id'], stored['cloudinary_url'], key_id
+                    )
+                    known.add(chunk_hash)
+                    uploaded_bytes += size
+
+            # ম্যানিফেস্টের কপি ক্লাউডেও - ডাটাবেজ হারালেও ফাইল জোড়া লাগানো যায়
+            manifest = orjson.dumps({
+                'file_hash': file_hash,
+                'filename': path.name,
+                'file_size': file_size,
+                'chunks': [[chunk_hash, size] for _, size, chunk_hash in chunks]
+            })
+            stored = self.cloud.upload_raw(
+                encrypt_bytes(manifest) if key_id else manifest,
+                f"personal_backup/manifests/{file_hash}", tags
+            )
+            self.db.save_file_manifest(file_hash, [chunk_hash for _, _, chunk_hash in chunks])
+            timings['cloud'] = time.perf_counter() - start
+
+            CHUNK_BYTES.inc(uploaded_bytes, state="uploaded")
+            CHUNK_BYTES.inc(file_size - uploaded_bytes, state="deduplicated")
+            logger.info(
+                f"🧩 {path.name}: {len(chunks)}টি চাংক, "
+                f"{uploaded_bytes / 1048576:.1f}MB / {file_size / 1048576:.1f}MB আপলোড"
+            )
+
+            return {
+                'success': True,
+                'file_hash': file_hash,
+                'filename': path.name,
+                'file_size': file_size,
+                'file_type': classify_path(file_path),
+                'resource_type': 'raw',
+                'cloudinary_id': stored['cloudinary_id'],
+                'cloudinary_url': stored['cloudinary_url'],
+                'original_path': str(path),
+                'codec': CODEC_CHUNKED,
+                'key_id': key_id,
+                'stored_size': uploaded_bytes
+            }
+
+        except Exception as e:
+            logger.error(f"❌ চাংক আপলোড এরর: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'filename': path.name
+            }
+
+    def iter_file(self, file_hash: str) -> Iterator[bytes]:
+        """ম্যানিফেস্ট অনুযায়ী চাংক ক্রমানুসারে স্ট্রিম করে অরিজিনাল ফাইল"""
+        manifest = self.db.get_file_manifest(file_hash)
+        if not manifest:
+            raise FileNotFoundError(f"ম্যানিফেস্ট পাওয়া যায়নি: {file_hash}")
+        for chunk in manifest:
+            yield from self.cloud.iter_file(chunk['cloudinary_url'], key_id=chunk['key_id'])
+
+    def download_file(self, file_hash: str, dest_path: str):
+        with open(dest_path, 'wb') as f:
+            for block in self.iter_file(file_hash):
+                f.write(block)
+
+    def collect_garbage(self) -> int:
+        """কোনো ম্যানিফেস্টে নেই এমন চাংক ইনডেক্স থেকে সরিয়ে ক্লাউড ডিলিট কিউতে (GC ব্যাচে মোছে)
+
+        সদ্য রেফার হওয়া চাংক গ্রেস পিরিয়ড পর্যন্ত রাখা হয় - চলমান আপলোড
+        সেটি "আছে" ধরে নিয়ে থাকতে পারে।
+        """
+        return self.db.collect_orphan_chunks(Config.CHUNK_GC_GRACE_SECONDS)
@@ -0,0 +1,87 @@
+"""
+CLOUD_GC.PY - ক্লাউড অবজেক্টের ব্যাচ ডিলিট ও সফট-ডিলিট সারি পার্জ
+
+ডিলিট রিকোয়েস্ট শুধু ডাটাবেজে সফট ডিলিট করে অবজেক্ট delete_queue-তে রাখে।
+এখানে কিউ থেকে একই resource_type-এর সর্বোচ্চ ১০০টি করে নিয়ে প্রোভাইডারের
+মাল্টি-রিসোর্স ডিলিট কলে মোছা হয় - হাজার ফাইলে হাজার API কল নয়।
+"""
+
+import logging
+from typing import TYPE_CHECKING, Dict
+
+from config import Config
+from metrics import DELETED_OBJECTS
+
+if TYPE_CHECKING:
+    from cloudinary_handler import CloudinaryManager
+    from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# এই ফলাফলে অবজেক্ট আর ক্লাউডে নেই - কিউ থেকে বাদ (অনুমিত টাইপের not_found বাদে)
+GONE_RESULTS = ('deleted', 'not_found')
+PURGE_BATCH_SIZE = 1000
+
+
+class CloudGarbageCollector:
+    """ব্লকিং - থ্রেডপুলে চলে; লিজের কারণে একাধিক ওয়ার্কার একই ব্যাচ নেয় না"""
+
+    def __init__(self, db: "DatabaseManager", cloud: "CloudinaryManager"):
+        self.db = db
+        self.cloud = cloud
+
+    def delete_batch(self) -> int:
+        """কিউ থেকে একটি ব্যাচ ডিলিট - কতগুলো অবজেক্ট নেওয়া হয়েছিল (0 = কিউ খালি)"""
+        resource_type, public_ids = self.db.claim_delete_batch(
+            Config.DELETE_GC_BATCH_SIZE,
+            Config.DELETE_GC_RETRY_SECONDS,
+            Config.DELETE_GC_MAX_ATTEMPTS
+        )
+        if not public_ids:
+            return 0
+
+        try:
+            results = self.cloud.delete_resources(public_ids, resource_type)
+        except Exception as e:
+            # পুরো কল ব্যর্থ - সবগুলো ব্যাকঅফে আবার
+            logger.error(f"❌ ক্লাউড ব্যাচ ডিলিট এরর ({len(public_ids)}টি {resource_type}): {e}")
+            self.db.complete_delete_batch([], {public_id: str(e) for public_id in public_ids},
+                                          Config.DELETE_GC_RETRY_SECONDS)
+            DELETED_OBJECTS.inc(len(public_ids), result="error")
+            return len(public_ids)
+
+        # টাইপ অনুমিত হলে not_found মানে হয়তো ভুল টাইপ - পরের টাইপে আবার, সবগুলোতে না পেলে তবেই বাদ
+        not_found = [public_id for public_id in public_ids if results.get(public_id) == 'not_found']
+        reprobed = set(self.db.reprobe_delete_entries(not_found))
+        done = [
+            public_id for public_id in public_ids
+            if results.get(public_id) in GONE_RESULTS and public_id not in reprobed
+        ]
+        failed: Dict[str, str] = {
+            public_id: str(results.get(public_id, 'missing from response'))
+            for public_id in public_ids if results.get(public_id) not in GONE_RESULTS
+        }
+        self.db.complete_delete_batch(done, failed, Config.DELETE_GC_RETRY_SECONDS)
+        DELETED_OBJECTS.inc(len(done), result="deleted")
+        if failed:
+            DELETED_OBJECTS.inc(len(failed), result="error")
+        return len(public_ids)
+
+    def run_once(self) -> int:
+        """একটি রাউন্ড - কিউ খালি বা প্রতি রাউন্ডের কল সীমা পর্যন্ত"""
+        processed = 0
+        for _ in range(Config.DELETE_GC_MAX_BATCHES):
+            claimed = self.delete_batch()
+            if not claimed:
+                break
+            processed += claimed
+        return processed
+
+    def purge(self) -> int:
+        """রিটেনশন পার হওয়া সফট-ডিলিট সারি ছোট ব্যাচে মোছা"""
+        purged = 0
+        while True:
+            removed = self.db.purge_deleted_files(Config.SOFT_DELETE_RETENTION_DAYS, PURGE_BATCH_SIZE)
+            purged += removed
+            if removed < PURGE_BATCH_SIZE:
+                return purged
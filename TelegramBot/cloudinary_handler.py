@@ -8,10 +8,19 @@ import cloudinary.api
 import logging
 import hashlib
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import calendar
+import io
 import mimetypes
+import os
+import time
+import urllib.request
 
 from config import Config
+from compression import CHUNK_SIZE, choose_codec, decompress_blocks, open_compressor
+from file_crypto import EncryptingWriter, current_key_id, decrypt_stream
+from file_types import SNIFF_BYTES, classify, resource_type_for, type_from_extension
+from metrics import CLOUD_ERRORS, CLOUD_REQUEST_SECONDS, HASHED_BYTES, HASH_SECONDS
 
 # Cloudinary কনফিগার
 cloudinary.config(
@@ -29,77 +38,112 @@ class CloudinaryManager:
         self.allowed_extensions = Config.ALLOWED_EXTENSIONS
         self.max_file_size = Config.get_max_file_size()
     
-    def calculate_file_hash(self, file_path: str) -> str:
-        """ফাইল হ্যাশ ক্যালকুলেট"""
+    def calculate_file_hash(self, file_path: str, sink: Callable[[bytes], object] = None,
+                            head: list = None) -> str:
+        """ফাইল হ্যাশ ক্যালকুলেট (sink দিলে একই পাসে প্রতিটি ব্লক সেখানেও যায়)
+        
+        head লিস্ট দিলে প্রথম ব্লকের শুরু সেখানে রাখা হয় - ম্যাজিক বাইট ডিটেকশনের জন্য।
+        """
         sha256_hash = hashlib.sha256()
+        total = 0
+        start = time.perf_counter()
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
+            for byte_block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                if head is not None and not total:
+                    head.append(byte_block[:SNIFF_BYTES])
                 sha256_hash.update(byte_block)
+                total += len(byte_block)
+                if sink is not None:
+                    sink(byte_block)
+        HASH_SECONDS.observe(time.perf_counter() - start, source="upload")
+        HASHED_BYTES.inc(total, source="upload")
         return sha256_hash.hexdigest()
     
     def get_file_type(self, filename: str) -> str:
-        """ফাইল টাইপ ডিটেক্ট"""
-        ext = Path(filename).suffix.lower()
+        """এক্সটেনশন থেকে ফাইল টাইপ (কনটেন্ট দেখে নিশ্চিত হতে file_types.classify)"""
+        return type_from_extension(filename)
+    
+    def validate_file(self, file_path: Path) -> int:
+        """আপলোডের আগে চেক (না মিললে এক্সেপশন) - ফাইল সাইজ রিটার্ন"""
+        if not file_path.exists():
+            raise FileNotFoundError(f"ফাইল পাওয়া যায়নি: {file_path}")
+        
+        # ফাইল সাইজ চেক
+        file_size = file_path.stat().st_size
+        if file_size > self.max_file_size:
+            raise ValueError(f"ফাইল সাইজ বড়: {file_size/1024/1024:.2f}MB > {self.max_file_size/1024/1024:.2f}MB")
         
-        if ext in self.config.ALLOWED_EXTENSIONS[:6]:  # Images
-            return "image"
-        elif ext in self.config.ALLOWED_EXTENSIONS[6:12]:  # Videos
-            return "video"
-        elif ext in self.config.ALLOWED_EXTENSIONS[12:20]:  # Documents
-            return "document"
-        elif ext in self.config.ALLOWED_EXTENSIONS[20:25]:  # Audio
-            return "audio"
-        elif ext in self.config.ALLOWED_EXTENSIONS[25:28]:  # Archives
-            return "archive"
-        elif ext == '.apk':
-            return "app"
-        else:
-            return "other"
+        # এক্সটেনশন চেক
+        ext = file_path.suffix.lower()
+        if ext not in self.allowed_extensions:
+            raise ValueError(f"অনুমোদিত নয়: {ext}")
+        
+        return file_size
     
-    def upload_file(self, file_path: str, tags: list = None) -> Dict:
-        """ফাইল Cloudinary-তে আপলোড"""
+    def upload_file(self, file_path: str, tags: list = None, timings: Dict = None) -> Dict:
+        """ফাইল Cloudinary-তে আপলোড (timings দিলে hash/cloud ধাপের সময় সেকেন্ডে লেখা হয়)"""
+        timings = timings if timings is not None else {}
         try:
             file_path = Path(file_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"ফাইল পাওয়া যায়নি: {file_path}")
-            
-            # ফাইল সাইজ চেক
-            file_size = file_path.stat().st_size
-            if file_size > self.max_file_size:
-                raise ValueError(f"ফাইল সাইজ বড়: {file_size/1024/1024:.2f}MB > {self.max_file_size/1024/1024:.2f}MB")
+            file_size = self.validate_file(file_path)
             
-            # এক্সটেনশন চেক
-            ext = file_path.suffix.lower()
-            if ext not in self.allowed_extensions:
-                raise ValueError(f"অনুমোদিত নয়: {ext}")
+            # ফাইল হ্যাশ - কম্প্রেশন/এনক্রিপশন লাগলে একই পাসে
+            start = time.perf_counter()
+            codec = choose_codec(str(file_path))
+            key_id = current_key_id()
+            head = []
+            if codec or key_id:
+                upload_path = f"{file_path}.stored"
+                file_hash, codec = self._encode_file(file_path, upload_path, codec, key_id, file_size, head)
+                stored_size = os.path.getsize(upload_path)
+                if not codec and not key_id:
+                    os.remove(upload_path)
+                    upload_path, stored_size = str(file_path), file_size
+            else:
+                upload_path = str(file_path)
+                file_hash = self.calculate_file_hash(upload_path, head=head)
+                stored_size = file_size
+            encoded = upload_path != str(file_path)
+            file_type = classify(file_path.name, head[0] if head else b"")
+            timings['hash'] = time.perf_counter() - start
             
-            # ফাইল হ্যাশ
-            file_hash = self.calculate_file_hash(str(file_path))
-            
-            # Cloudinary-তে আপলোড
-            upload_result = cloudinary.uploader.upload(
-                str(file_path),
-                public_id=f"personal_backup/{file_hash}",
-                resource_type="auto",
-                tags=tags or ["auto_backup"],
-                folder="personal_backup",
-                use_filename=True,
-                unique_filename=False,
-                overwrite=False
-            )
+            # Cloudinary-তে আপলোড (কম্প্রেসড/এনক্রিপ্টেড বাইট সবসময় raw)
+            resource_type = "raw" if encoded else resource_type_for(file_type)
+            start = time.perf_counter()
+            try:
+                with CLOUD_REQUEST_SECONDS.time(operation="upload"):
+                    upload_result = cloudinary.uploader.upload(
+                        upload_path,
+                        public_id=f"personal_backup/{file_hash}",
+                        resource_type=resource_type,
+                        tags=tags or ["auto_backup"],
+                        folder="personal_backup",
+                        use_filename=True,
+                        unique_filename=False,
+                        overwrite=False
+                    )
+            finally:
+                if encoded:
+                    os.remove(upload_path)
+            timings['cloud'] = time.perf_counter() - start
             
             return {
                 'success': True,
                 'file_hash': file_hash,
                 'filename': file_path.name,
                 'file_size': file_size,
-                'file_type': self.get_file_type(file_path.name),
+                'file_type': file_type,
+                'resource_type': resource_type,
                 'cloudinary_id': upload_result['public_id'],
                 'cloudinary_url': upload_result['secure_url'],
-                'original_path': str(file_path)
+                'original_path': str(file_path),
+                'codec': codec,
+                'key_id': key_id,
+                'stored_size': stored_size
             }
             
         except Exception as e:
+            CLOUD_ERRORS.inc(operation="upload")
             logger.error(f"❌ Cloudinary আপলোড এরর: {e}")
             return {
                 'success': False,
@@ -107,19 +151,98 @@ class CloudinaryManager:
                 'filename': Path(file_path).name
             }
     
-    def delete_file(self, public_id: str) -> bool:
-        """Cloudinary থেকে ফাইল ডিলিট"""
+    def _encode_file(self, file_path: Path, dest_path: str, codec: Optional[str],
+                     key_id: Optional[str], file_size: int,
+                     head: list = None) -> Tuple[str, Optional[str]]:
+        """হ্যাশ → কম্প্রেস → এনক্রিপ্ট এক পাসে, মেমোরি চাংক সাইজে সীমিত - (file_hash, codec)"""
+        with open(dest_path, 'wb') as out:
+            encryptor = EncryptingWriter(out) if key_id else None
+            sink = encryptor or out
+            compressor = open_compressor(sink, codec) if codec else None
+            file_hash = self.calculate_file_hash(str(file_path), sink=(compressor or sink).write, head=head)
+            if compressor:
+                compressor.close()
+            if encryptor:
+                encryptor.close()
+        
+        # স্যাম্পল ভালো দেখালেও পুরো ফাইলে লাভ না হলে অরিজিনালই আপলোড
+        # (এনক্রিপশন থাকলে আবার পাস না করে কম্প্রেসড কপিই রাখা)
+        if codec and not key_id and \
+                os.path.getsize(dest_path) > file_size * (1 - Config.COMPRESSION_MIN_SAVING):
+            codec = None
+        return file_hash, codec
+    
+    def upload_raw(self, data: bytes, public_id: str, tags: list = None) -> Dict:
+        """বাইট সরাসরি raw রিসোর্স হিসেবে আপলোড (চাংক, ম্যানিফেস্ট) - ব্যর্থ হলে এক্সেপশন"""
+        try:
+            with CLOUD_REQUEST_SECONDS.time(operation="upload_raw"):
+                result = cloudinary.uploader.upload(
+                    io.BytesIO(data),
+                    public_id=public_id,
+                    resource_type="raw",
+                    tags=tags or ["auto_backup"],
+                    overwrite=False
+                )
+            return {'cloudinary_id': result['public_id'], 'cloudinary_url': result['secure_url']}
+        except Exception:
+            CLOUD_ERRORS.inc(operation="upload_raw")
+            raise
+    
+    def download_file(self, url: str, dest_path: str, codec: str = None, key_id: str = None):
+        """অরিজিনাল ফাইল ডাউনলোড করে লোকাল পাথে লেখা (স্ট্রিমিং ডিক্রিপ্ট/ডিকম্প্রেস)"""
+        with CLOUD_REQUEST_SECONDS.time(operation="download"):
+            with open(dest_path, 'wb') as f:
+                for block in self.iter_file(url, codec, key_id):
+                    f.write(block)
+    
+    def _iter_stored(self, url: str) -> Iterator[bytes]:
         try:
-            result = cloudinary.uploader.destroy(public_id)
+            with urllib.request.urlopen(url, timeout=60) as response:
+                yield from iter(lambda: response.read(CHUNK_SIZE), b"")
+        except Exception:
+            CLOUD_ERRORS.inc(operation="download")
+            raise
+    
+    def iter_file(self, url: str, codec: str = None, key_id: str = None) -> Iterator[bytes]:
+        """অরিজিনাল বাইট চাংক আকারে: ডাউনলোড → ডিক্রিপ্ট → ডিকম্প্রেস (আপলোডের উল্টো ক্রম)"""
+        blocks = self._iter_stored(url)
+        if key_id:
+            blocks = decrypt_stream(blocks)
+        if codec:
+            blocks = decompress_blocks(blocks, codec)
+        return blocks
+    
+    def delete_file(self, public_id: str, resource_type: str = "image") -> bool:
+        """Cloudinary থেকে ফাইল ডিলিট (কম্প্রেসড/এনক্রিপ্টেড ফাইল raw রিসোর্স)"""
+        try:
+            with CLOUD_REQUEST_SECONDS.time(operation="delete"):
+                result = cloudinary.uploader.destroy(public_id, resource_type=resource_type)
             return result.get('result') == 'ok'
         except Exception as e:
+            CLOUD_ERRORS.inc(operation="delete")
             logger.error(f"❌ Cloudinary ডিলিট এরর: {e}")
             return False
     
+    def delete_resources(self, public_ids: List[str], resource_type: str) -> Dict[str, str]:
+        """একই resource_type-এর অনেক অবজেক্ট এক কলে ডিলিট (সর্বোচ্চ ১০০) - public_id → ফলাফল
+        
+        ফলাফল 'deleted' বা 'not_found' হলে অবজেক্ট আর নেই; কল ব্যর্থ হলে এক্সেপশন।
+        """
+        try:
+            with CLOUD_REQUEST_SECONDS.time(operation="delete_batch"):
+                result = cloudinary.api.delete_resources(
+                    public_ids, resource_type=resource_type, type="upload"
+                )
+            return result.get('deleted', {})
+        except Exception:
+            CLOUD_ERRORS.inc(operation="delete_batch")
+            raise
+    
     def get_file_info(self, public_id: str) -> Optional[Dict]:
         """ফাইল ইনফো"""
         try:
-            result = cloudinary.api.resource(public_id)
+            with CLOUD_REQUEST_SECONDS.time(operation="info"):
+                result = cloudinary.api.resource(public_id)
             return {
                 'public_id': result['public_id'],
                 'url': result['secure_url'],
@@ -128,19 +251,49 @@ class CloudinaryManager:
                 'created_at': result['created_at']
             }
         except Exception as e:
+            CLOUD_ERRORS.inc(operation="info")
             logger.error(f"❌ ফাইল ইনফো এরর: {e}")
             return None
     
+    def list_resources_page(self, resource_type: str, prefix: str, next_cursor: str = None,
+                            max_results: int = 500) -> Dict:
+        """Admin API লিস্টিংয়ের এক পেজ (ব্যর্থ হলে এক্সেপশন) - রেট লিমিটের বাকি কোটাসহ"""
+        options = {}
+        if next_cursor:
+            options['next_cursor'] = next_cursor
+        try:
+            with CLOUD_REQUEST_SECONDS.time(operation="list_page"):
+                result = cloudinary.api.resources(
+                    type="upload",
+                    resource_type=resource_type,
+                    prefix=prefix,
+                    max_results=max_results,
+                    **options
+                )
+        except Exception:
+            CLOUD_ERRORS.inc(operation="list_page")
+            raise
+        
+        reset_at = getattr(result, 'rate_limit_reset_at', None)
+        return {
+            'resources': result.get('resources', []),
+            'next_cursor': result.get('next_cursor'),
+            'rate_limit_remaining': getattr(result, 'rate_limit_remaining', None),
+            'rate_limit_reset_at': calendar.timegm(reset_at) if reset_at else None
+        }
+    
     def list_files(self, max_results: int = 100) -> list:
         """Cloudinary ফাইল লিস্ট"""
         try:
-            result = cloudinary.api.resources(
-                type="upload",
-                prefix="personal_backup/",
-                max_results=max_results,
-                tags=True
-            )
+            with CLOUD_REQUEST_SECONDS.time(operation="list"):
+                result = cloudinary.api.resources(
+                    type="upload",
+                    prefix="personal_backup/",
+                    max_results=max_results,
+                    tags=True
+                )
             return result.get('resources', [])
         except Exception as e:
+            CLOUD_ERRORS.inc(operation="list")
             logger.error(f"❌ ফাইল লিস্ট এরর: {e}")
             return []
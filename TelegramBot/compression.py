@@ -0,0 +1,150 @@
+"""
+COMPRESSION.PY - কম্প্রেসযোগ্য ফাইলের স্বচ্ছ কম্প্রেশন (zstd, না থাকলে gzip)
+
+আপলোডের আগে ফাইলের একটি স্যাম্পল কম্প্রেস করে দেখা হয় - যথেষ্ট ছোট হলে
+হ্যাশিংয়ের একই পাসে পুরো ফাইল স্ট্রিমিং কম্প্রেস হয়, কোডেক files টেবিলে থাকে।
+ডাউনলোডের সময় স্ট্রিমিং ডিকম্প্রেস করে অরিজিনাল বাইট ফেরত দেওয়া হয়।
+"""
+
+import gzip
+import logging
+import os
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from config import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+CODEC_EXTENSIONS = {CODEC_GZIP: ".gz", CODEC_ZSTD: ".zst"}
+CHUNK_SIZE = 1024 * 1024
+
+
+def select_codec() -> str:
+    """কনফিগের কোডেক (zstandard ইনস্টল না থাকলে gzip)"""
+    if Config.COMPRESSION_CODEC == CODEC_ZSTD and zstandard is not None:
+        return CODEC_ZSTD
+    return CODEC_GZIP
+
+
+def _compress_bytes(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=Config.COMPRESSION_LEVEL).compress(data)
+    return zlib.compress(data, Config.COMPRESSION_LEVEL)
+
+
+def sample_ratio(file_path: str, codec: str) -> float:
+    """শুরু ও মাঝখান থেকে স্যাম্পল নিয়ে আনুমানিক কম্প্রেশন রেশিও (compressed / original)"""
+    sample_size = Config.COMPRESSION_SAMPLE_BYTES
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size // 2)
+        if file_size > sample_size:
+            f.seek(file_size // 2)
+        sample += f.read(sample_size // 2)
+
+    if not sample:
+        return 1.0
+    return len(_compress_bytes(sample, codec)) / len(sample)
+
+
+def choose_codec(file_path: str) -> Optional[str]:
+    """স্যাম্পলে লাভজনক হলে কোডেক, নইলে None (পুরো ফাইল পড়া হয় না)"""
+    if not Config.COMPRESSION_ENABLED:
+        return None
+    if Path(file_path).suffix.lower() not in Config.COMPRESSIBLE_EXTENSIONS:
+        return None
+
+    codec = select_codec()
+    if sample_ratio(file_path, codec) > 1 - Config.COMPRESSION_MIN_SAVING:
+        return None
+    return codec
+
+
+class _CompressingWriter:
+    """write() করা ডেটা কম্প্রেস করে sink-এ (close() sink বন্ধ করে না)"""
+
+    def __init__(self, sink, codec: str):
+        if codec == CODEC_ZSTD:
+            self.stream = zstandard.ZstdCompressor(level=Config.COMPRESSION_LEVEL).stream_writer(
+                sink, closefd=False
+            )
+        else:
+            # mtime=0 - একই ইনপুটে সবসময় একই আউটপুট
+            self.stream = gzip.GzipFile(
+                fileobj=sink, mode='wb', compresslevel=Config.COMPRESSION_LEVEL, mtime=0
+            )
+
+    def write(self, data: bytes) -> int:
+        return self.stream.write(data)
+
+    def close(self):
+        self.stream.close()
+
+
+def open_compressor(sink, codec: str) -> _CompressingWriter:
+    """স্ট্রিমিং কম্প্রেসর - পাইপলাইনে এনক্রিপশনের আগে বসে"""
+    return _CompressingWriter(sink, codec)
+
+
+class _BlockReader:
+    """বাইট চাংকের ইটারেটরকে read(size) সহ ফাইল-সদৃশ অবজেক্ট বানানো (zstd stream_reader-এর জন্য)"""
+
+    def __init__(self, blocks: Iterable[bytes]):
+        self._blocks = iter(blocks)
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer:
+            block = next(self._blocks, None)
+            if block is None:
+                return b""
+            self._buffer = block
+        if size < 0 or size >= len(self._buffer):
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _decompress_gzip(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    for block in blocks:
+        # max_length - ছোট ইনপুটও (যেমন শূন্যে ভরা ফাইল) একবারে বিশাল আউটপুট দেয় না
+        data = decompressor.decompress(block, CHUNK_SIZE)
+        while data:
+            yield data
+            data = decompressor.decompress(decompressor.unconsumed_tail, CHUNK_SIZE)
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def _decompress_zstd(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    if zstandard is None:
+        raise RuntimeError("zstd ফাইল পড়তে zstandard প্যাকেজ দরকার")
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        _BlockReader(blocks), read_size=CHUNK_SIZE
+    )
+    with reader:
+        yield from iter(lambda: reader.read(CHUNK_SIZE), b"")
+
+
+def decompress_blocks(blocks: Iterable[bytes], codec: str) -> Iterator[bytes]:
+    """বাইট চাংকের স্ট্রিম ডিকম্প্রেস (ডাউনলোড পাইপলাইনে ডিক্রিপশনের পরে)
+
+    প্রতিটি আউটপুট চাংক সর্বোচ্চ CHUNK_SIZE - ছোট কম্প্রেসড ব্লক থেকেও মেমরি সীমিত থাকে।
+    """
+    if codec == CODEC_ZSTD:
+        return _decompress_zstd(blocks)
+    if codec == CODEC_GZIP:
+        return _decompress_gzip(blocks)
+    raise ValueError(f"অজানা কোডেক: {codec}")
@@ -20,6 +20,23 @@ class Config:
     SERVER_PORT = 800  
     SECRET_KEY = "your-32-character-secret-key-change-this-now"
     
+    # শাটডাউনের সময় চলমান আপলোড শেষ হওয়ার জন্য সর্বোচ্চ অপেক্ষা (সেকেন্ড)
+    SHUTDOWN_TIMEOUT_SECONDS = 30
+    
+    # API ওয়ার্কার প্রসেস সংখ্যা (>1 হলে API আলাদা api_server.py প্রসেসে চলে)
+    API_WORKERS = 1
+    
+    # ==================== UPLOAD QUEUE SETTINGS ====================
+    # True হলে আপলোড সাথে সাথে কিউতে যায়, যেকোনো ওয়ার্কার ক্লাউডে পাঠায়
+    UPLOAD_QUEUE_ENABLED = False
+    UPLOAD_SPOOL_DIR = "upload_spool"  # সব ওয়ার্কারের শেয়ার্ড টেম্প ফোল্ডার
+    UPLOAD_QUEUE_CONCURRENCY = 2  # প্রতি ওয়ার্কারে একসাথে কতগুলো ক্লাউড আপলোড
+    UPLOAD_QUEUE_POLL_SECONDS = 1.0
+    UPLOAD_JOB_MAX_ATTEMPTS = 3
+    UPLOAD_JOB_STALE_SECONDS = 600  # এতক্ষণ হার্টবিট না এলে (ওয়ার্কার ক্র্যাশ) আবার কিউতে
+    UPLOAD_JOB_HEARTBEAT_SECONDS = 60  # চলমান জবের updated_at কত পরপর রিফ্রেশ
+    UPLOAD_TIMING_WINDOW = 1000  # "স্লোয়েস্ট আপলোড" ভিউয়ের জন্য সাম্প্রতিক আপলোড সংখ্যা
+    
     # ==================== BACKUP SETTINGS ====================
     # কোন ফোল্ডারগুলো ব্যাকআপ হবে
     MONITOR_FOLDERS = [
@@ -52,16 +69,120 @@ class Config:
     # ম্যাক্সিমাম ফাইল সাইজ (MB)
     MAX_FILE_SIZE_MB = 100
     
+    # ==================== API RESPONSE SETTINGS ====================
+    API_MAX_PAGE_SIZE = 1000  # /api/files ও /api/search-এ সর্বোচ্চ limit
+    GZIP_MIN_BYTES = 16 * 1024  # এর চেয়ে বড় JSON রেসপন্স gzip হবে
+    GZIP_LEVEL = 5
+    
+    # ==================== COMPRESSION SETTINGS ====================
+    # True হলে কম্প্রেসযোগ্য ফাইল কম্প্রেস করে আপলোড (ডাউনলোডে স্বয়ংক্রিয় ডিকম্প্রেস)
+    COMPRESSION_ENABLED = False
+    COMPRESSION_CODEC = "zstd"  # "zstd" (zstandard লাগবে, না থাকলে gzip) বা "gzip"
+    COMPRESSION_LEVEL = 6
+    COMPRESSIBLE_EXTENSIONS = ['.txt', '.rtf', '.bmp', '.wav', '.doc', '.xls', '.ppt', '.pdf']
+    COMPRESSION_SAMPLE_BYTES = 256 * 1024  # রেশিও যাচাইয়ের স্যাম্পল সাইজ
+    COMPRESSION_MIN_SAVING = 0.2  # অন্তত ২০% ছোট না হলে কম্প্রেস নয়
+    
+    # ==================== CHUNK DEDUP SETTINGS ====================
+    # True হলে বড় ডকুমেন্ট/আর্কাইভ চাংকে ভাগ করে শুধু নতুন চাংক আপলোড
+    CHUNKING_ENABLED = False
+    CHUNKING_MIN_FILE_MB = 8  # এর ছোট ফাইল পুরোটাই আপলোড
+    CHUNKING_EXTENSIONS = ['.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.pdf', '.zip', '.rar', '.7z']
+    CHUNK_MIN_KB = 256
+    CHUNK_AVG_KB = 1024
+    CHUNK_MAX_KB = 4096
+    CHUNK_GC_GRACE_SECONDS = 3600  # রেফারেন্সহীন চাংক এর পরে মোছা হয়
+    CHUNK_GC_INTERVAL_SECONDS = 3600
+    
+    # ==================== DOWNLOAD CACHE SETTINGS ====================
+    DOWNLOAD_CACHE_DIR = "download_cache"  # ডিকোড করা অরিজিনাল ফাইল (file_hash নামে)
+    DOWNLOAD_CACHE_MAX_MB = 2048  # পূর্ণ হলে সবচেয়ে আগে ব্যবহৃত ফাইল মোছে (LRU)
+    
+    # ==================== ARCHIVE EXPORT SETTINGS ====================
+    EXPORT_PREFETCH_CONCURRENCY = 3  # স্ট্রিমের আগে একসাথে কতগুলো ফাইল আনা হয়
+    EXPORT_SPOOL_MEMORY_MB = 8  # এর বড় প্রিফেচ করা ফাইল টেম্প ডিস্কে
+    METADATA_EXPORT_BATCH_ROWS = 1000  # CSV/NDJSON এক্সপোর্টে কার্সর থেকে প্রতিবার কত রো
+    METADATA_EXPORT_BLOCK_KB = 64  # এই সাইজের ব্লকে আউটপুট স্ট্রিম হয়
+    
+    # ==================== THUMBNAIL SETTINGS ====================
+    THUMBNAIL_ENABLED = True
+    THUMBNAIL_DIR = "thumbnails"  # file_hash কী-তে WebP ক্যাশ
+    THUMBNAIL_SIZE = 320  # লম্বা দিকের সর্বোচ্চ পিক্সেল
+    THUMBNAIL_QUALITY = 70
+    THUMBNAIL_WORKERS = 2  # থাম্বনেইল প্রসেস পুলের সাইজ
+    
+    # ==================== CHANGE FEED SETTINGS ====================
+    CHANGE_FEED_PAGE_SIZE = 500
+    CHANGE_TOMBSTONE_RETENTION_DAYS = 30  # এর পুরনো ডিলিট এন্ট্রি কমপ্যাক্ট হয়
+    CHANGE_FEED_COMPACT_INTERVAL_SECONDS = 3600
+    
+    # ==================== DELETION SETTINGS ====================
+    BULK_DELETE_MAX_FILES = 10000  # এক রিকোয়েস্টে সর্বোচ্চ কতগুলো ফাইল
+    DELETE_GC_INTERVAL_SECONDS = 30  # ক্লাউড ডিলিট কিউ কত পরপর খালি করা হয়
+    DELETE_GC_BATCH_SIZE = 100  # Cloudinary delete_resources-এর প্রতি কলে সর্বোচ্চ
+    DELETE_GC_MAX_BATCHES = 20  # প্রতি রাউন্ডে সর্বোচ্চ কল (Admin API রেট লিমিট)
+    DELETE_GC_MAX_ATTEMPTS = 5  # এরপর অবজেক্ট কিউতে ব্যর্থ হিসেবে থাকে
+    DELETE_GC_RETRY_SECONDS = 300  # ব্যর্থ হলে attempts × এত সেকেন্ড পরে আবার
+    SOFT_DELETE_RETENTION_DAYS = 7  # সফট-ডিলিট সারি এরপর স্থায়ীভাবে মোছা হয়
+    
+    # ==================== CHART SETTINGS ====================
+    ROLLUP_HOURLY_RETENTION_DAYS = 14  # ঘণ্টাভিত্তিক রোলআপ এতদিন রাখা হয়
+    ROLLUP_PRUNE_INTERVAL_SECONDS = 3600
+    CHART_DEFAULT_DAYS = 30
+    CHART_DEFAULT_HOURS = 48  # ঘণ্টাভিত্তিক চার্টের ডিফল্ট
+    CHART_MAX_DAYS = 730  # দৈনিক চার্টে সর্বোচ্চ কতদিন
+    CHART_MAX_SERIES = 6  # এর বেশি সিরিজ (যেমন ডিভাইস) 'other'-এ একসাথে
+    
+    # ==================== RECONCILIATION SETTINGS ====================
+    RECONCILE_ENABLED = False  # ক্যাটালগ বনাম ক্লাউড ইনভেন্টরি নিয়মিত মিলানো
+    RECONCILE_INTERVAL_SECONDS = 24 * 3600  # দুটি সম্পূর্ণ রানের মাঝে বিরতি
+    RECONCILE_POLL_SECONDS = 600  # থেমে থাকা রান (রেট লিমিট/রিস্টার্ট) কত পরপর রিজিউম হয়
+    RECONCILE_PREFIX = "personal_backup/"
+    RECONCILE_PAGE_SIZE = 500  # Admin API-র প্রতি পেজে সর্বোচ্চ
+    RECONCILE_MIN_REQUEST_INTERVAL_SECONDS = 2.0  # দুটি লিস্টিং কলের মাঝে ন্যূনতম বিরতি
+    RECONCILE_RATE_LIMIT_RESERVE = 50  # Admin API কোটার এটুকু বাকি থাকলে রান থামে
+    RECONCILE_GRACE_SECONDS = 3600  # এর চেয়ে নতুন সারি/অবজেক্ট চলমান আপলোড ধরে বাদ
+    RECONCILE_LEASE_SECONDS = 900  # এতক্ষণ আপডেট না হলে অন্য ওয়ার্কার রান নিতে পারে
+    
+    # ==================== LIVE DASHBOARD SETTINGS ====================
+    EVENTS_POLL_SECONDS = 2.0  # অন্য প্রসেসের পরিবর্তন দেখতে চেঞ্জ ফিড চেক
+    EVENTS_SUBSCRIBER_BUFFER = 100  # প্রতি ড্যাশবোর্ডে সর্বোচ্চ জমা ইভেন্ট
+    EVENTS_HEARTBEAT_SECONDS = 15
+    
     # ==================== DATABASE SETTINGS ====================
     DATABASE_NAME = "backup_database.db"
+    DB_BUSY_TIMEOUT_SECONDS = 30  # একাধিক প্রসেস একসাথে লিখলে লকের জন্য অপেক্ষা
     
     # ==================== SECURITY SETTINGS ====================
     # এনক্রিপশন কি (পরিবর্তন করুন)
     ENCRYPTION_KEY = b"your-encryption-key-32bytes!!"
     
+    # True হলে ক্লাউডে যাওয়ার আগে ফাইল এনক্রিপ্ট (AES-256-GCM, চাংকভিত্তিক স্ট্রিমিং)
+    STORAGE_ENCRYPTION_ENABLED = False
+    STORAGE_ENCRYPTION_CHUNK_KB = 64
+    # ENCRYPTION_KEY বদলালে পুরনো কি এখানে রাখুন - পুরনো ফাইল ডিক্রিপ্ট করতে লাগবে
+    OLD_ENCRYPTION_KEYS = []
+    
     # API Access Token (Android App ব্যবহার করবে)
     API_ACCESS_TOKEN = "your-api-access-token-12345"
     
+    # ডাউনলোড/থাম্বনেইলের সাইন করা লিংক কতক্ষণ বৈধ (একটি ফাইলের একটি রিসোর্সেই)
+    SIGNED_LINK_TTL_SECONDS = 300
+    
+    # /metrics এন্ডপয়েন্ট API কি ছাড়া খোলা থাকবে কিনা (Prometheus স্ক্র্যাপের জন্য)
+    METRICS_PUBLIC = False
+    
+    # ==================== PROFILING SETTINGS ====================
+    # র‍্যান্ডম রিকোয়েস্ট প্রোফাইলিং রেট (0.0 = শুধু X-Profile হেডারে)
+    PROFILE_SAMPLE_RATE = 0.0
+    PROFILE_INTERVAL_MS = 5
+    PROFILE_DIR = "profiles"
+    PROFILE_MAX_FILES = 200
+    
+    # এর বেশি সময় নেওয়া SQL স্লো-কুয়েরি লগে যায় (0 = বন্ধ)
+    SLOW_QUERY_THRESHOLD_MS = 200
+    SLOW_QUERY_LOG_FILE = "slow_queries.log"
+    
     # ==================== NOTIFICATION SETTINGS ====================
     SEND_NOTIFICATIONS = True
     NOTIFICATION_CHAT_ID = YOUR_TELEGRAM_USER_ID
@@ -5,24 +5,191 @@ DATABASE.PY - SQLite ডাটাবেজ ম্যানেজমেন্ট
 import sqlite3
 import json
 import logging
+import re
+import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import hashlib
 
 from config import Config
+from metrics import DB_QUERY_SECONDS, instrument_methods
 
 logger = logging.getLogger(__name__)
 
+# স্লো কুয়েরি - আলাদা লগ ফাইল ও সাম্প্রতিকগুলো মেমোরিতে
+slow_query_logger = logging.getLogger("slow_query")
+SLOW_QUERIES = deque(maxlen=200)
+
+_slow_handler_lock = threading.Lock()
+
+
+def _slow_query_log() -> logging.Logger:
+    """প্রথম স্লো কুয়েরিতে লগ ফাইল খোলা - ইমপোর্টে (টেস্ট/টুল) ফাইল তৈরি হয় না"""
+    if Config.SLOW_QUERY_LOG_FILE and not slow_query_logger.handlers:
+        with _slow_handler_lock:
+            if not slow_query_logger.handlers:
+                handler = logging.FileHandler(Config.SLOW_QUERY_LOG_FILE)
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                slow_query_logger.addHandler(handler)
+                slow_query_logger.setLevel(logging.INFO)
+    return slow_query_logger
+
+
+def _param_shape(parameters) -> list:
+    """প্যারামিটারের মান নয়, শুধু টাইপ/দৈর্ঘ্য (প্রাইভেসি)"""
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    shape = []
+    for value in parameters or ():
+        if isinstance(value, (str, bytes)):
+            shape.append(f"{type(value).__name__}({len(value)})")
+        else:
+            shape.append(type(value).__name__)
+    return shape
+
+
+def _record_query(sql: str, parameters, elapsed: float, many: bool = False):
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms < Config.SLOW_QUERY_THRESHOLD_MS:
+        return
+    
+    # কোন DatabaseManager মেথড থেকে (শুধু স্লো পাথে, তাই খরচ নগণ্য)
+    caller = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        name = frame.f_code.co_name
+        if frame.f_code.co_filename == __file__ and not name.startswith('_') \
+                and name not in ('execute', 'executemany'):
+            caller = name
+            break
+        frame = frame.f_back
+    
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+        'duration_ms': round(elapsed_ms, 2),
+        'caller': caller,
+        'statement': re.sub(r'\s+', ' ', sql).strip(),
+        'params': 'executemany' if many else _param_shape(parameters)
+    }
+    SLOW_QUERIES.append(entry)
+    _slow_query_log().info(json.dumps(entry, ensure_ascii=False))
+
+
+class TimedCursor(sqlite3.Cursor):
+    """execute সময় মেপে স্লো কুয়েরি রেকর্ড করে"""
+    
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record_query(sql, parameters, time.perf_counter() - start)
+    
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record_query(sql, None, time.perf_counter() - start, many=True)
+
+
+class TimedConnection(sqlite3.Connection):
+    """সব কুয়েরি TimedCursor দিয়ে চালায়"""
+    
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# files টেবিলের কলাম (API ফিল্ড প্রজেকশনের হোয়াইটলিস্ট)
+FILE_COLUMNS = (
+    'id', 'file_hash', 'original_path', 'filename', 'file_size', 'file_type',
+    'cloudinary_id', 'cloudinary_url', 'upload_date', 'tags', 'device_name', 'is_deleted',
+    'codec', 'stored_size', 'key_id', 'resource_type'
+)
+
+# activity_logs টেবিলের কলাম (মেটাডেটা এক্সপোর্ট)
+ACTIVITY_COLUMNS = ('id', 'activity_type', 'details', 'timestamp')
+
+# resource_type ছাড়া পুরনো ("auto" আপলোড) সারির সম্ভাব্য টাইপ - file_types.RESOURCE_TYPES-এর মতো;
+# কম্প্রেসড/এনক্রিপ্টেড/চাংকড ফাইল সবসময় raw ছিল
+LEGACY_RESOURCE_TYPE_SQL = '''
+    CASE WHEN codec IS NOT NULL OR key_id IS NOT NULL THEN 'raw'
+         WHEN file_type = 'image' THEN 'image'
+         WHEN file_type IN ('video', 'audio') THEN 'video'
+         ELSE 'raw' END
+'''
+
+# চার্ট রোলআপ - গ্রানুলারিটি → (টেবিল, upload_date থেকে বাকেট এক্সপ্রেশন)
+ROLLUP_TABLES = {
+    'day': ('upload_rollup_daily', "date({row}.upload_date)"),
+    'hour': ('upload_rollup_hourly', "strftime('%Y-%m-%d %H:00:00', {row}.upload_date)"),
+}
+ROLLUP_GROUPS = ('file_type', 'device_name')
+
+
+# ফুল-টেক্সট সার্চ - bm25 ওজন (filename, original_path, tags ক্রমে)
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+# বাংলা কার-চিহ্ন (Mc/Mn) শব্দের অংশ, নইলে শব্দ ভেঙে যায়
+FTS_TOKENIZER = "unicode61 remove_diacritics 2 categories 'L* N* Co Mc Mn'"
+# tags JSON অ্যারে → স্পেসে জোড়া মান (অবৈধ JSON হলে যেমন আছে)
+FTS_TAGS_SQL = (
+    "CASE WHEN json_valid({row}.tags) "
+    "THEN (SELECT group_concat(value, ' ') FROM json_each({row}.tags)) ELSE {row}.tags END"
+)
+
+
+def fts_match_query(keyword: str) -> Optional[str]:
+    """ইউজারের কিওয়ার্ড → FTS5 MATCH এক্সপ্রেশন (প্রতিটি শব্দ প্রিফিক্স, সব শব্দ থাকতে হবে)
+    
+    প্রতিটি শব্দ কোটেড - ইউজারের ইনপুটের AND/OR/NEAR/* অপারেটর হিসেবে পার্স হয় না।
+    """
+    terms = [
+        '"' + term.replace('"', '""') + '"*'
+        for term in keyword.split() if any(char.isalnum() for char in term)
+    ]
+    return ' '.join(terms) or None
+
+
+def _rollup_delta_sql(table: str, bucket: str, row: str, sign: str, source: str = "", where: str = "") -> str:
+    """একটি সক্রিয় সারির অবদান রোলআপে যোগ (+) বা বিয়োগ (-) - ট্রিগারের স্টেটমেন্ট"""
+    return f'''
+        INSERT INTO {table} (bucket, device_name, file_type, file_count, total_bytes)
+        SELECT {bucket.format(row=row)}, COALESCE({row}.device_name, 'Unknown'), {row}.file_type,
+               {sign}1, {sign}{row}.file_size
+        {source}
+        WHERE {row}.is_deleted = 0 {where}
+        ON CONFLICT (bucket, device_name, file_type) DO UPDATE SET
+            file_count = file_count + excluded.file_count,
+            total_bytes = total_bytes + excluded.total_bytes;
+    '''
+
+
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DATABASE_NAME
         self.init_database()
     
-    def get_connection(self):
+    def get_connection(self, check_same_thread: bool = True):
         """ডাটাবেজ কানেকশন তৈরি"""
-        conn = sqlite3.connect(self.db_path)
+        # busy timeout - অন্য প্রসেস লিখতে থাকলে এরর না দিয়ে অপেক্ষা
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.DB_BUSY_TIMEOUT_SECONDS,
+            check_same_thread=check_same_thread,
+            factory=TimedConnection if Config.SLOW_QUERY_THRESHOLD_MS else sqlite3.Connection
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous = NORMAL')
         return conn
     
     def init_database(self):
@@ -30,6 +197,9 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL মোড - একাধিক API ওয়ার্কার একসাথে পড়তে পারে, রাইট সিরিয়ালাইজড
+            cursor.execute('PRAGMA journal_mode = WAL')
+            
             # ফাইলস টেবিল
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS files (
@@ -44,10 +214,37 @@ class DatabaseManager:
                     upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     tags TEXT,
                     device_name TEXT,
-                    is_deleted INTEGER DEFAULT 0
+                    is_deleted INTEGER DEFAULT 0,
+                    codec TEXT,
+                    stored_size INTEGER,
+                    key_id TEXT,
+                    resource_type TEXT,
+                    resource_type_inferred INTEGER DEFAULT 0,
+                    deleted_at TIMESTAMP
                 )
             ''')
             
+            # পুরনো ডাটাবেজে নতুন কলাম (codec NULL = কম্প্রেস ছাড়া, key_id NULL = প্লেইনটেক্সট,
+            # resource_type_inferred = "auto" দিয়ে আপলোড হওয়া পুরনো ফাইলের অনুমিত resource_type)
+            self._add_missing_columns(cursor, 'files', {
+                'codec': 'TEXT',
+                'stored_size': 'INTEGER',
+                'key_id': 'TEXT',
+                'resource_type': 'TEXT',
+                'resource_type_inferred': 'INTEGER DEFAULT 0',
+                'deleted_at': 'TIMESTAMP'
+            })
+            # resource_type না থাকা পুরনো সারি - file_type থেকে একবার ব্যাকফিল (অনুমান হিসেবে চিহ্নিত)
+            cursor.execute(f'''
+                UPDATE files SET resource_type = {LEGACY_RESOURCE_TYPE_SQL}, resource_type_inferred = 1
+                WHERE resource_type IS NULL
+            ''')
+            # আগে সফট-ডিলিট হওয়া সারিও পুরো রিটেনশন পায় (পার্জের ঘড়ি এখন থেকে)
+            cursor.execute('''
+                UPDATE files SET deleted_at = CURRENT_TIMESTAMP
+                WHERE is_deleted = 1 AND deleted_at IS NULL
+            ''')
+            
             # ব্যাকআপ স্ট্যাটাস টেবিল
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS backup_status (
@@ -80,6 +277,322 @@ class DatabaseManager:
                 )
             ''')
             
+            # Telegram file_id ক্যাশ (একই ফাইল বারবার আপলোড এড়াতে)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS telegram_file_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    file_size INTEGER NOT NULL,
+                    file_mtime REAL NOT NULL,
+                    telegram_file_id TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # শেয়ার্ড আপলোড কিউ (সব API ওয়ার্কার প্রসেস ব্যবহার করে)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS upload_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    spool_path TEXT NOT NULL,
+                    device_name TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    worker_id TEXT,
+                    file_hash TEXT,
+                    cloudinary_url TEXT,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_upload_queue_status
+                ON upload_queue (status, id)
+            ''')
+            
+            # চেঞ্জ ফিড - files-এর প্রতিটি পরিবর্তনে মনোটোনিক seq (ট্রিগার দিয়ে,
+            # তাই যেকোনো প্রসেসের রাইট একই ট্রানজ্যাকশনে রেকর্ড হয়)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_hash TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_file_changes_hash
+                ON file_changes (file_hash, seq)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS change_feed_state (
+                    id INTEGER PRIMARY KEY,
+                    horizon_seq INTEGER DEFAULT 0
+                )
+            ''')
+            cursor.execute('INSERT OR IGNORE INTO change_feed_state (id) VALUES (1)')
+            
+            # পুরনো ডাটাবেজ - বিদ্যমান ফাইলগুলোর জন্য একবার ব্যাকফিল
+            cursor.execute('''
+                INSERT INTO file_changes (file_hash, op)
+                SELECT file_hash, CASE is_deleted WHEN 1 THEN 'delete' ELSE 'upsert' END
+                FROM files
+                WHERE NOT EXISTS (SELECT 1 FROM file_changes)
+                ORDER BY id
+            ''')
+            
+            # INSERT OR REPLACE-এ পুরনো রো মুছলেও ডিলিট ট্রিগার চলে না,
+            # নতুন রোর INSERT ট্রিগারই upsert রেকর্ড করে
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_files_change_insert
+                AFTER INSERT ON files
+                BEGIN
+                    INSERT INTO file_changes (file_hash, op)
+                    VALUES (NEW.file_hash, CASE NEW.is_deleted WHEN 1 THEN 'delete' ELSE 'upsert' END);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_files_change_update
+                AFTER UPDATE ON files
+                BEGIN
+                    INSERT INTO file_changes (file_hash, op)
+                    VALUES (NEW.file_hash, CASE NEW.is_deleted WHEN 1 THEN 'delete' ELSE 'upsert' END);
+                END
+            ''')
+            # সফট-ডিলিটের সময়েই delete রেকর্ড হয়েছে - পার্জে (হার্ড ডিলিট) আবার টুম্বস্টোন নয়।
+            # পুরনো ডাটাবেজে WHEN ছাড়া ট্রিগার আছে, তাই ড্রপ করে নতুন করে তৈরি
+            cursor.execute('DROP TRIGGER IF EXISTS trg_files_change_delete')
+            cursor.execute('''
+                CREATE TRIGGER trg_files_change_delete
+                AFTER DELETE ON files
+                WHEN OLD.is_deleted = 0
+                BEGIN
+                    INSERT INTO file_changes (file_hash, op) VALUES (OLD.file_hash, 'delete');
+                END
+            ''')
+            
+            # আপলোড রোলআপ (দিন/ঘণ্টা × ডিভাইস × টাইপ) - চার্ট files স্ক্যান না করে
+            # এখান থেকে পড়ে। শুধু সক্রিয় (সফট-ডিলিট নয়) ফাইল গোনা হয়; ট্রিগার
+            # দিয়ে আপডেট, তাই যেকোনো প্রসেসের রাইট একই ট্রানজ্যাকশনে যোগ হয়
+            for table, bucket in ROLLUP_TABLES.values():
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        bucket TEXT NOT NULL,
+                        device_name TEXT NOT NULL,
+                        file_type TEXT NOT NULL,
+                        file_count INTEGER NOT NULL DEFAULT 0,
+                        total_bytes INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (bucket, device_name, file_type)
+                    ) WITHOUT ROWID
+                ''')
+            
+            # খালি রোলআপ (নতুন টেবিল) - বিদ্যমান ফাইল থেকে একবার ব্যাকফিল;
+            # ঘণ্টার রোলআপ শুধু রিটেনশনের ভেতরের ফাইলের
+            for granularity, (table, bucket) in ROLLUP_TABLES.items():
+                recent = (
+                    f"AND upload_date >= datetime('now', '-{int(Config.ROLLUP_HOURLY_RETENTION_DAYS)} days')"
+                    if granularity == 'hour' else ""
+                )
+                cursor.execute(f'''
+                    INSERT INTO {table} (bucket, device_name, file_type, file_count, total_bytes)
+                    SELECT {bucket.format(row='files')}, COALESCE(device_name, 'Unknown'), file_type,
+                           COUNT(*), SUM(file_size)
+                    FROM files
+                    WHERE is_deleted = 0 {recent} AND NOT EXISTS (SELECT 1 FROM {table})
+                    GROUP BY 1, 2, 3
+                ''')
+            
+            # INSERT OR REPLACE-এ পুরনো রোর ডিলিট ট্রিগার চলে না - তাই BEFORE INSERT-এ
+            # একই হ্যাশের সক্রিয় রো (থাকলে) আগে বিয়োগ
+            rollup_triggers = {
+                'trg_files_rollup_replace': ('BEFORE INSERT', [
+                    _rollup_delta_sql(table, bucket, 'f', '-', "FROM files f", "AND f.file_hash = NEW.file_hash")
+                    for table, bucket in ROLLUP_TABLES.values()
+                ]),
+                'trg_files_rollup_insert': ('AFTER INSERT', [
+                    _rollup_delta_sql(table, bucket, 'NEW', '+') for table, bucket in ROLLUP_TABLES.values()
+                ]),
+                'trg_files_rollup_update': (
+                    'AFTER UPDATE OF is_deleted, file_size, file_type, device_name, upload_date', [
+                        _rollup_delta_sql(table, bucket, row, sign)
+                        for table, bucket in ROLLUP_TABLES.values()
+                        for row, sign in (('OLD', '-'), ('NEW', '+'))
+                    ]
+                ),
+                'trg_files_rollup_delete': ('AFTER DELETE', [
+                    _rollup_delta_sql(table, bucket, 'OLD', '-') for table, bucket in ROLLUP_TABLES.values()
+                ]),
+            }
+            for name, (event, statements) in rollup_triggers.items():
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {name}
+                    {event} ON files
+                    BEGIN
+                        {''.join(statements)}
+                    END
+                ''')
+            
+            # ফুল-টেক্সট ইনডেক্স (rowid = files.id)। tags JSON-এ বাংলা \u এস্কেপ হয়ে থাকে,
+            # তাই ইনডেক্সে ডিকোড করা ট্যাগ - নিজস্ব কপি রাখা টেবিল, external content নয়
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'files_fts'")
+            fts_exists = cursor.fetchone() is not None
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                    filename, original_path, tags,
+                    tokenize="{FTS_TOKENIZER}", prefix='2 3'
+                )
+            ''')
+            if not fts_exists:
+                # পুরনো ডাটাবেজ - বিদ্যমান সারি থেকে একবার ইনডেক্স
+                cursor.execute(f'''
+                    INSERT INTO files_fts (rowid, filename, original_path, tags)
+                    SELECT id, filename, original_path, {FTS_TAGS_SQL.format(row='files')} FROM files
+                ''')
+            
+            # রোলআপের মতোই - REPLACE-এ মোছা পুরনো রো BEFORE INSERT-এ ইনডেক্স থেকে বাদ
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_files_fts_replace
+                BEFORE INSERT ON files
+                BEGIN
+                    DELETE FROM files_fts WHERE rowid IN (SELECT id FROM files WHERE file_hash = NEW.file_hash);
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_files_fts_insert
+                AFTER INSERT ON files
+                BEGIN
+                    INSERT INTO files_fts (rowid, filename, original_path, tags)
+                    VALUES (NEW.id, NEW.filename, NEW.original_path, {FTS_TAGS_SQL.format(row='NEW')});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_files_fts_update
+                AFTER UPDATE OF filename, original_path, tags ON files
+                BEGIN
+                    UPDATE files_fts
+                    SET filename = NEW.filename, original_path = NEW.original_path,
+                        tags = {FTS_TAGS_SQL.format(row='NEW')}
+                    WHERE rowid = NEW.id;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_files_fts_delete
+                AFTER DELETE ON files
+                BEGIN
+                    DELETE FROM files_fts WHERE rowid = OLD.id;
+                END
+            ''')
+            
+            # CDC চাংক ইনডেক্স ও ফাইল ম্যানিফেস্ট (রেফারেন্স file_chunks থেকেই গোনা হয়)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS chunks (
+                    chunk_hash TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    cloudinary_id TEXT NOT NULL,
+                    cloudinary_url TEXT NOT NULL,
+                    key_id TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_referenced TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            self._add_missing_columns(cursor, 'chunks', {'key_id': 'TEXT'})
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_chunks (
+                    file_hash TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    chunk_hash TEXT NOT NULL,
+                    PRIMARY KEY (file_hash, seq)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_file_chunks_chunk
+                ON file_chunks (chunk_hash)
+            ''')
+            
+            # ক্লাউড অবজেক্ট ডিলিট কিউ - ব্যাকগ্রাউন্ড GC ব্যাচে মোছে
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS delete_queue (
+                    public_id TEXT PRIMARY KEY,
+                    resource_type TEXT NOT NULL,
+                    guessed INTEGER NOT NULL DEFAULT 0,
+                    probes INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # guessed = resource_type অনুমিত (পুরনো "auto" আপলোড) - not_found হলে অন্য টাইপে আবার
+            self._add_missing_columns(cursor, 'delete_queue', {
+                'guessed': 'INTEGER NOT NULL DEFAULT 0',
+                'probes': 'INTEGER NOT NULL DEFAULT 0'
+            })
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_delete_queue_due
+                ON delete_queue (next_attempt_at)
+            ''')
+            
+            # ক্লাউড রিকনসিলিয়েশন - রানের অগ্রগতি (রিজিউমের জন্য কার্সর), লিস্টিং স্টেজিং ও ইস্যু
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS reconcile_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    worker_id TEXT,
+                    stage INTEGER NOT NULL DEFAULT 0,
+                    next_cursor TEXT,
+                    cloud_objects INTEGER NOT NULL DEFAULT 0,
+                    api_calls INTEGER NOT NULL DEFAULT 0,
+                    missing INTEGER,
+                    untracked INTEGER,
+                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cloud_inventory (
+                    run_id INTEGER NOT NULL,
+                    public_id TEXT NOT NULL,
+                    resource_type TEXT NOT NULL,
+                    bytes INTEGER,
+                    created_at TIMESTAMP,
+                    PRIMARY KEY (run_id, public_id)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS reconcile_issues (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    public_id TEXT NOT NULL,
+                    resource_type TEXT,
+                    file_hash TEXT,
+                    bytes INTEGER,
+                    first_seen_run INTEGER NOT NULL,
+                    last_seen_run INTEGER NOT NULL,
+                    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    resolved_at TIMESTAMP,
+                    UNIQUE (kind, public_id)
+                )
+            ''')
+            # ডিফের দুই দিকের লুকআপ ইনডেক্সে (পুরো টেবিল স্ক্যান নয়)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_files_cloudinary_id
+                ON files (cloudinary_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_chunks_cloudinary_id
+                ON chunks (cloudinary_id)
+            ''')
+            
+            # ফাইল ব্রাউজারের কিসেট পেজিনেশনের জন্য ইনডেক্স
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_files_browse
+                ON files (is_deleted, upload_date, id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_files_type_browse
+                ON files (is_deleted, file_type, upload_date, id)
+            ''')
+            
             # ব্যাকআপ স্ট্যাটাস ইনিশিয়ালাইজ
             cursor.execute('''
                 INSERT OR IGNORE INTO backup_status (id) VALUES (1)
@@ -89,6 +602,14 @@ class DatabaseManager:
         
         logger.info("✅ ডাটাবেজ ইনিশিয়ালাইজড")
     
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """টেবিলে না থাকা কলাম ALTER TABLE দিয়ে যোগ"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, declaration in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {declaration}')
+    
     def add_file(self, file_data: Dict) -> bool:
         """নতুন ফাইল ডাটাবেজে অ্যাড"""
         try:
@@ -98,8 +619,9 @@ class DatabaseManager:
                 cursor.execute('''
                     INSERT OR REPLACE INTO files 
                     (file_hash, original_path, filename, file_size, file_type, 
-                     cloudinary_id, cloudinary_url, device_name, tags)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     cloudinary_id, cloudinary_url, device_name, tags, codec, stored_size, key_id,
+                     resource_type)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     file_data['file_hash'],
                     file_data['original_path'],
@@ -109,7 +631,11 @@ class DatabaseManager:
                     file_data['cloudinary_id'],
                     file_data['cloudinary_url'],
                     file_data.get('device_name', 'Unknown'),
-                    json.dumps(file_data.get('tags', []))
+                    json.dumps(file_data.get('tags', [])),
+                    file_data.get('codec'),
+                    file_data.get('stored_size', file_data['file_size']),
+                    file_data.get('key_id'),
+                    file_data.get('resource_type')
                 ))
                 
                 # স্ট্যাটাস আপডেট
@@ -153,18 +679,328 @@ class DatabaseManager:
             
             return files
     
-    def search_files(self, keyword: str) -> List[Dict]:
-        """ফাইল সার্চ"""
+    def _browse_filter(self, file_type: str = None, keyword: str = None, device_name: str = None,
+                       date_from: str = None, date_to: str = None, min_size: int = None,
+                       max_size: int = None) -> Tuple[List[str], List]:
+        """ব্রাউজ কুয়েরির WHERE শর্ত ও প্যারামিটার (তারিখ YYYY-MM-DD, দুদিকেই ইনক্লুসিভ)"""
+        conditions = ['is_deleted = 0']
+        params = []
+        
+        if file_type:
+            conditions.append('file_type = ?')
+            params.append(file_type)
+        
+        if keyword:
+            # FTS ইনডেক্স থেকে মেলা id - files-এর পুরো স্ক্যান নয়
+            match = fts_match_query(keyword)
+            if match:
+                conditions.append('id IN (SELECT rowid FROM files_fts WHERE files_fts MATCH ?)')
+                params.append(match)
+            else:
+                conditions.append('0 = 1')
+        
+        if min_size is not None:
+            conditions.append('file_size >= ?')
+            params.append(min_size)
+        
+        if max_size is not None:
+            conditions.append('file_size <= ?')
+            params.append(max_size)
+        
+        if device_name:
+            conditions.append('device_name = ?')
+            params.append(device_name)
+        
+        if date_from:
+            conditions.append('upload_date >= ?')
+            params.append(date_from)
+        
+        if date_to:
+            conditions.append("upload_date < date(?, '+1 day')")
+            params.append(date_to)
+        
+        return conditions, params
+    
+    def get_files_page(self, position: Optional[Tuple[str, int]] = None,
+                       direction: str = 'next', limit: int = 10,
+                       file_type: str = None, keyword: str = None) -> Tuple[List[Dict], bool]:
+        """কিসেট পেজিনেশন সহ ফাইল পেজ (নতুন থেকে পুরনো)
+        
+        position হলো (upload_date, id) - 'next' হলে এর পরের (পুরনো) ফাইল,
+        'prev' হলে এর আগের (নতুন) ফাইল। রিটার্ন: (ফাইল লিস্ট, আরও আছে কিনা)
+        """
+        conditions, params = self._browse_filter(file_type, keyword)
+        
+        if position is not None:
+            op = '<' if direction == 'next' else '>'
+            conditions.append(f'(upload_date, id) {op} (?, ?)')
+            params.extend(position)
+        
+        order = 'DESC' if direction == 'next' else 'ASC'
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM files 
-                WHERE (filename LIKE ? OR tags LIKE ?) 
-                AND is_deleted = 0
-            ''', (f'%{keyword}%', f'%{keyword}%'))
+            cursor.execute(f'''
+                SELECT id, filename, file_size, file_type, upload_date
+                FROM files
+                WHERE {' AND '.join(conditions)}
+                ORDER BY upload_date {order}, id {order}
+                LIMIT ?
+            ''', (*params, limit + 1))
             
+            rows = [dict(row) for row in cursor.fetchall()]
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if direction != 'next':
+            rows.reverse()
+        
+        return rows, has_more
+    
+    def get_export_files(self, file_type: str = None, device_name: str = None,
+                         date_from: str = None, date_to: str = None) -> List[Dict]:
+        """আর্কাইভ এক্সপোর্টের ফাইল (পুরনো থেকে নতুন)"""
+        conditions, params = self._browse_filter(
+            file_type, device_name=device_name, date_from=date_from, date_to=date_to
+        )
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT file_hash, filename, file_size, file_type, upload_date, device_name,
+                       cloudinary_url, codec, key_id
+                FROM files
+                WHERE {' AND '.join(conditions)}
+                ORDER BY upload_date, id
+            ''', params)
             return [dict(row) for row in cursor.fetchall()]
     
+    def _iter_rows(self, sql: str, params, batch_size: int) -> Iterator[Tuple]:
+        """কার্সর থেকে fetchmany করে টাপল রো - পুরো রেজাল্ট কখনো মেমোরিতে আসে না
+
+        StreamingResponse প্রতিটি next() থ্রেডপুলের যেকোনো থ্রেডে চালায় - ভোক্তা একটাই,
+        তাই কানেকশন থ্রেড-চেক ছাড়া খোলা নিরাপদ।
+        """
+        conn = self.get_connection(check_same_thread=False)
+        try:
+            conn.row_factory = None
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # ক্লায়েন্ট মাঝপথে কেটে দিলেও (GeneratorExit) রিড ট্রানজ্যাকশন বন্ধ
+            conn.close()
+    
+    def iter_file_rows(self, columns: List[str], file_type: str = None, device_name: str = None,
+                       date_from: str = None, date_to: str = None,
+                       batch_size: int = 1000) -> Iterator[Tuple]:
+        """মেটাডেটা এক্সপোর্টের জন্য files-এর সব রো (id ক্রমে, স্ট্রিমিং)"""
+        columns = [column for column in columns if column in FILE_COLUMNS]
+        conditions, params = self._browse_filter(
+            file_type, device_name=device_name, date_from=date_from, date_to=date_to
+        )
+        return self._iter_rows(f'''
+            SELECT {', '.join(columns)} FROM files
+            WHERE {' AND '.join(conditions)}
+            ORDER BY id
+        ''', params, batch_size)
+    
+    def iter_activity_rows(self, date_from: str = None, date_to: str = None,
+                           batch_size: int = 1000) -> Iterator[Tuple]:
+        """activity_logs-এর রো (ACTIVITY_COLUMNS ক্রমে, তারিখ দুদিকেই ইনক্লুসিভ)"""
+        conditions = ['1 = 1']
+        params = []
+        if date_from:
+            conditions.append('timestamp >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append("timestamp < date(?, '+1 day')")
+            params.append(date_to)
+        return self._iter_rows(f'''
+            SELECT {', '.join(ACTIVITY_COLUMNS)} FROM activity_logs
+            WHERE {' AND '.join(conditions)}
+            ORDER BY id
+        ''', params, batch_size)
+    
+    def count_files(self, file_type: str = None, keyword: str = None) -> int:
+        """ফিল্টার অনুযায়ী ফাইল সংখ্যা"""
+        conditions, params = self._browse_filter(file_type, keyword)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT COUNT(*) as total FROM files
+                WHERE {' AND '.join(conditions)}
+            ''', params)
+            return cursor.fetchone()['total']
+    
+    def list_file_rows(self, columns: List[str], limit: int = 50, offset: int = 0,
+                       keyword: str = None) -> List[Tuple]:
+        """API লিস্টিংয়ের জন্য কাঁচা টাপল রো (dict তৈরি ছাড়া)"""
+        columns = [column for column in columns if column in FILE_COLUMNS]
+        conditions, params = self._browse_filter(keyword=keyword)
+        
+        with self.get_connection() as conn:
+            conn.row_factory = None
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {', '.join(columns)} FROM files
+                WHERE {' AND '.join(conditions)}
+                ORDER BY upload_date DESC, id DESC
+                LIMIT ? OFFSET ?
+            ''', (*params, limit, offset))
+            return cursor.fetchall()
+    
+    def get_changes(self, since: int, columns: List[str], limit: int = 500) -> List[Tuple]:
+        """since-এর পরের পরিবর্তন - প্রতি ফাইলের শুধু সর্বশেষটি
+        
+        রিটার্ন টাপল: (seq, op, file_hash, *columns) - delete হলে কলামগুলো NULL
+        """
+        columns = [column for column in columns if column in FILE_COLUMNS]
+        select = ''.join(f', f.{column}' for column in columns)
+        
+        with self.get_connection() as conn:
+            conn.row_factory = None
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT c.seq, c.op, c.file_hash{select}
+                FROM file_changes c
+                LEFT JOIN files f ON f.file_hash = c.file_hash AND c.op = 'upsert'
+                WHERE c.seq > ?
+                AND c.seq = (
+                    SELECT MAX(seq) FROM file_changes latest
+                    WHERE latest.file_hash = c.file_hash
+                )
+                ORDER BY c.seq
+                LIMIT ?
+            ''', (since, limit))
+            return cursor.fetchall()
+    
+    def get_change_feed_state(self) -> Dict:
+        """কমপ্যাকশন হরাইজন ও সর্বশেষ seq"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT s.horizon_seq AS horizon,
+                       COALESCE((SELECT MAX(seq) FROM file_changes), 0) AS latest
+                FROM change_feed_state s WHERE s.id = 1
+            ''')
+            return dict(cursor.fetchone())
+    
+    def get_upload_rollups(self, granularity: str, since: str, group_by: Optional[str] = 'file_type',
+                           device_name: Optional[str] = None,
+                           file_type: Optional[str] = None) -> List[Tuple[str, str, int, int]]:
+        """since থেকে প্রতি বাকেটে (bucket, series, file_count, total_bytes) - বাকেট সংখ্যার অনুপাতে খরচ"""
+        table, _ = ROLLUP_TABLES[granularity]
+        series = group_by if group_by in ROLLUP_GROUPS else "'all'"
+        conditions = ["bucket >= ?"]
+        params: List = [since]
+        if device_name:
+            conditions.append("device_name = ?")
+            params.append(device_name)
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT bucket, {series} AS series, SUM(file_count), SUM(total_bytes)
+                FROM {table}
+                WHERE {' AND '.join(conditions)}
+                GROUP BY bucket, series
+                ORDER BY bucket
+            ''', params)
+            return [tuple(row) for row in cursor.fetchall()]
+    
+    def prune_rollups(self, hourly_retention_days: int) -> int:
+        """রিটেনশনের পুরনো ঘণ্টার রোলআপ ও শূন্য হয়ে যাওয়া বাকেট মোছা"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM upload_rollup_hourly
+                WHERE bucket < strftime('%Y-%m-%d %H:00:00', 'now', ?) OR file_count <= 0
+            ''', (f'-{int(hourly_retention_days)} days',))
+            removed = cursor.rowcount
+            cursor.execute('DELETE FROM upload_rollup_daily WHERE file_count <= 0')
+            return removed + cursor.rowcount
+    
+    def compact_changes(self, tombstone_retention_days: int) -> int:
+        """চেঞ্জ ফিড কমপ্যাকশন
+        
+        1. একই ফাইলের পুরনো (সুপারসিডেড) এন্ট্রি মোছা - সবসময় নিরাপদ
+        2. রিটেনশনের পুরনো delete টম্বস্টোন মোছা - হরাইজন বাড়ে,
+           এর আগের since নিয়ে আসা ক্লায়েন্টকে রিসিঙ্ক করতে হবে
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM file_changes
+                WHERE seq < (
+                    SELECT MAX(seq) FROM file_changes latest
+                    WHERE latest.file_hash = file_changes.file_hash
+                )
+            ''')
+            removed = cursor.rowcount
+            
+            cursor.execute('''
+                SELECT MAX(seq) AS horizon FROM file_changes
+                WHERE op = 'delete' AND changed_at < datetime('now', ?)
+            ''', (f'-{int(tombstone_retention_days)} days',))
+            horizon = cursor.fetchone()['horizon']
+            
+            if horizon:
+                cursor.execute('''
+                    DELETE FROM file_changes WHERE op = 'delete' AND seq <= ?
+                ''', (horizon,))
+                removed += cursor.rowcount
+                cursor.execute('''
+                    UPDATE change_feed_state SET horizon_seq = MAX(horizon_seq, ?) WHERE id = 1
+                ''', (horizon,))
+            
+            conn.commit()
+            return removed
+    
+    def search_file_rows(self, columns: List[str], keyword: str, limit: int = 50, offset: int = 0,
+                         file_type: str = None, device_name: str = None, min_size: int = None,
+                         max_size: int = None, date_from: str = None, date_to: str = None,
+                         order: str = 'relevance') -> List[Tuple]:
+        """FTS সার্চ - কাঁচা টাপল রো, bm25 প্রাসঙ্গিকতা (বা নতুন থেকে পুরনো) ক্রমে"""
+        match = fts_match_query(keyword)
+        if not match:
+            return []
+        
+        columns = [column for column in columns if column in FILE_COLUMNS]
+        conditions, params = self._browse_filter(
+            file_type, device_name=device_name, date_from=date_from, date_to=date_to,
+            min_size=min_size, max_size=max_size
+        )
+        ranking = (
+            f"bm25(files_fts, {', '.join(map(str, FTS_WEIGHTS))}), f.id DESC"
+            if order == 'relevance' else "f.upload_date DESC, f.id DESC"
+        )
+        
+        with self.get_connection() as conn:
+            conn.row_factory = None
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {', '.join(f'f.{column}' for column in columns)}
+                FROM files_fts
+                JOIN files f ON f.id = files_fts.rowid
+                WHERE files_fts MATCH ? AND {' AND '.join(conditions)}
+                ORDER BY {ranking}
+                LIMIT ? OFFSET ?
+            ''', (match, *params, limit, offset))
+            return cursor.fetchall()
+    
+    def search_files(self, keyword: str, limit: int = 100) -> List[Dict]:
+        """ফাইল সার্চ (প্রাসঙ্গিকতা ক্রমে)"""
+        rows = self.search_file_rows(list(FILE_COLUMNS), keyword, limit)
+        return [dict(zip(FILE_COLUMNS, row)) for row in rows]
+    
     def get_file_by_hash(self, file_hash: str) -> Optional[Dict]:
         """ফাইল হ্যাশ দিয়ে খোঁজা"""
         with self.get_connection() as conn:
@@ -174,25 +1010,167 @@ class DatabaseManager:
             return dict(row) if row else None
     
     def delete_file(self, file_hash: str) -> bool:
-        """ফাইল ডিলিট (সফট ডিলিট)"""
+        """ফাইল ডিলিট (সফট ডিলিট, ক্লাউড অবজেক্ট ডিলিট কিউতে)"""
+        return bool(self.delete_files([file_hash]))
+    
+    def delete_files(self, file_hashes: List[str]) -> List[Dict]:
+        """একাধিক ফাইল এক ট্রানজ্যাকশনে সফট ডিলিট - ক্লাউড অবজেক্ট কিউতে, GC পরে ব্যাচে মোছে
+        
+        রিটার্ন: যেগুলো সত্যিই ডিলিট হল (file_hash, filename) - আগেই ডিলিট/অজানা হলে বাদ
+        """
+        deleted = []
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE files SET is_deleted = 1 
-                    WHERE file_hash = ?
-                ''', (file_hash,))
+                for start in range(0, len(file_hashes), 500):
+                    batch = file_hashes[start:start + 500]
+                    placeholders = ', '.join('?' * len(batch))
+                    cursor.execute(f'''
+                        UPDATE files SET is_deleted = 1, deleted_at = CURRENT_TIMESTAMP
+                        WHERE file_hash IN ({placeholders}) AND is_deleted = 0
+                        RETURNING file_hash, filename, cloudinary_id,
+                                  COALESCE(resource_type, {LEGACY_RESOURCE_TYPE_SQL}) AS resource_type,
+                                  resource_type IS NULL OR resource_type_inferred = 1 AS guessed
+                    ''', batch)
+                    rows = cursor.fetchall()
+                    if not rows:
+                        continue
+                    
+                    cursor.executemany('''
+                        INSERT INTO delete_queue (public_id, resource_type, guessed) VALUES (?, ?, ?)
+                        ON CONFLICT (public_id) DO UPDATE SET
+                            resource_type = excluded.resource_type, guessed = excluded.guessed, probes = 0,
+                            attempts = 0, last_error = NULL, next_attempt_at = CURRENT_TIMESTAMP
+                    ''', [(row['cloudinary_id'], row['resource_type'], row['guessed']) for row in rows])
+                    # চাংকড ফাইলের ম্যানিফেস্ট - চাংকগুলো রেফারেন্সহীন হলে চাংক GC নেবে
+                    cursor.executemany(
+                        'DELETE FROM file_chunks WHERE file_hash = ?',
+                        [(row['file_hash'],) for row in rows]
+                    )
+                    deleted.extend({'file_hash': row['file_hash'], 'filename': row['filename']} for row in rows)
                 
-                cursor.execute('''
-                    INSERT INTO activity_logs (activity_type, details)
-                    VALUES (?, ?)
-                ''', ('FILE_DELETE', f"Deleted file: {file_hash}"))
+                if deleted:
+                    details = (f"Deleted file: {deleted[0]['file_hash']}" if len(deleted) == 1
+                               else f"Deleted {len(deleted)} files")
+                    cursor.execute('''
+                        INSERT INTO activity_logs (activity_type, details)
+                        VALUES (?, ?)
+                    ''', ('FILE_DELETE', details))
                 
                 conn.commit()
-                return True
+                return deleted
         except Exception as e:
             logger.error(f"❌ ফাইল ডিলিট এরর: {e}")
-            return False
+            return []
+    
+    def claim_delete_batch(self, batch_size: int, lease_seconds: int,
+                           max_attempts: int) -> Tuple[Optional[str], List[str]]:
+        """একই resource_type-এর সর্বোচ্চ batch_size অবজেক্ট লিজসহ নেওয়া - (resource_type, public_ids)
+        
+        এর মধ্যে আবার আপলোড হয়ে ব্যবহারে থাকা অবজেক্ট কিউ থেকে বাদ (একই হ্যাশ = একই public_id)।
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                DELETE FROM delete_queue
+                WHERE EXISTS (
+                    SELECT 1 FROM files f
+                    WHERE f.cloudinary_id = delete_queue.public_id AND f.is_deleted = 0
+                )
+                OR EXISTS (
+                    SELECT 1 FROM chunks ch WHERE ch.cloudinary_id = delete_queue.public_id
+                )
+            ''')
+            
+            cursor.execute('''
+                SELECT resource_type FROM delete_queue
+                WHERE next_attempt_at <= CURRENT_TIMESTAMP AND attempts < ?
+                ORDER BY next_attempt_at LIMIT 1
+            ''', (max_attempts,))
+            row = cursor.fetchone()
+            if row is None:
+                return None, []
+            
+            cursor.execute('''
+                UPDATE delete_queue
+                SET attempts = attempts + 1, next_attempt_at = datetime('now', ?)
+                WHERE public_id IN (
+                    SELECT public_id FROM delete_queue
+                    WHERE resource_type = ? AND next_attempt_at <= CURRENT_TIMESTAMP AND attempts < ?
+                    ORDER BY next_attempt_at LIMIT ?
+                )
+                RETURNING public_id
+            ''', (f'+{int(lease_seconds)} seconds', row['resource_type'], max_attempts, batch_size))
+            return row['resource_type'], [claimed['public_id'] for claimed in cursor.fetchall()]
+    
+    def reprobe_delete_entries(self, public_ids: List[str]) -> List[str]:
+        """অনুমিত টাইপে not_found পাওয়া অবজেক্ট পরের resource_type-এ আবার কিউতে
+        
+        image → video → raw → image ক্রমে; তিনটিই চেষ্টা হলে (probes = 2) আর নয় - রিটার্ন শুধু
+        যেগুলো আবার কিউতে গেল, বাকিগুলো সত্যিই ক্লাউডে নেই।
+        """
+        if not public_ids:
+            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ', '.join('?' * len(public_ids))
+            cursor.execute(f'''
+                UPDATE delete_queue
+                SET resource_type = CASE resource_type WHEN 'image' THEN 'video'
+                                                       WHEN 'video' THEN 'raw' ELSE 'image' END,
+                    probes = probes + 1, attempts = 0, last_error = NULL,
+                    next_attempt_at = CURRENT_TIMESTAMP
+                WHERE public_id IN ({placeholders}) AND guessed = 1 AND probes < 2
+                RETURNING public_id
+            ''', public_ids)
+            reprobed = [row['public_id'] for row in cursor.fetchall()]
+            conn.commit()
+            return reprobed
+    
+    def complete_delete_batch(self, done: List[str], failed: Dict[str, str], retry_seconds: int):
+        """সফল (বা ক্লাউডে আগেই নেই) অবজেক্ট কিউ থেকে মোছা, ব্যর্থগুলো ব্যাকঅফে আবার"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM delete_queue WHERE public_id = ?', [(public_id,) for public_id in done])
+            cursor.executemany('''
+                UPDATE delete_queue
+                SET last_error = ?, next_attempt_at = datetime('now', '+' || (? * attempts) || ' seconds')
+                WHERE public_id = ?
+            ''', [(error, int(retry_seconds), public_id) for public_id, error in failed.items()])
+            conn.commit()
+    
+    def get_delete_queue_stats(self, max_attempts: int) -> Dict:
+        """ডিলিট কিউ: অপেক্ষমাণ ও চূড়ান্তভাবে ব্যর্থ"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COALESCE(SUM(attempts < ?), 0) AS pending,
+                       COALESCE(SUM(attempts >= ?), 0) AS failed
+                FROM delete_queue
+            ''', (max_attempts, max_attempts))
+            return dict(cursor.fetchone())
+    
+    def purge_deleted_files(self, retention_days: int, batch_size: int = 1000) -> int:
+        """রিটেনশন পার হওয়া সফট-ডিলিট সারি স্থায়ীভাবে মোছা (ছোট ব্যাচে - রাইট লক অল্প সময়)
+        
+        ক্লাউড অবজেক্ট এখনও কিউতে থাকলে সারি রাখা হয়।
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM files
+                WHERE id IN (
+                    SELECT id FROM files
+                    WHERE is_deleted = 1 AND deleted_at < datetime('now', ?)
+                    AND NOT EXISTS (
+                        SELECT 1 FROM delete_queue d WHERE d.public_id = files.cloudinary_id
+                    )
+                    LIMIT ?
+                )
+            ''', (f'-{int(retention_days)} days', batch_size))
+            conn.commit()
+            return cursor.rowcount
     
     def get_backup_stats(self) -> Dict:
         """ব্যাকআপ স্ট্যাটাস"""
@@ -211,6 +1189,393 @@ class DatabaseManager:
             
             return {}
     
+    def get_telegram_file_id(self, cache_key: str, file_size: int, file_mtime: float) -> Optional[str]:
+        """ক্যাশ করা Telegram file_id (সাইজ/mtime মিললে)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT telegram_file_id FROM telegram_file_cache
+                WHERE cache_key = ? AND file_size = ? AND file_mtime = ?
+            ''', (cache_key, file_size, file_mtime))
+            row = cursor.fetchone()
+            return row['telegram_file_id'] if row else None
+    
+    def set_telegram_file_id(self, cache_key: str, file_size: int, file_mtime: float, telegram_file_id: str):
+        """Telegram file_id ক্যাশে সেভ (পুরনো ভার্সন রিপ্লেস)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO telegram_file_cache
+                (cache_key, file_size, file_mtime, telegram_file_id, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (cache_key, file_size, file_mtime, telegram_file_id))
+            conn.commit()
+    
+    def clear_telegram_file_id(self, cache_key: str):
+        """Telegram file_id ক্যাশ মুছে ফেলা"""
+        with self.get_connection() as conn:
+            conn.execute('DELETE FROM telegram_file_cache WHERE cache_key = ?', (cache_key,))
+            conn.commit()
+    
+    def enqueue_upload(self, spool_path: str, device_name: str = None) -> int:
+        """আপলোড কিউতে নতুন জব"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO upload_queue (spool_path, device_name)
+                VALUES (?, ?)
+            ''', (spool_path, device_name))
+            conn.commit()
+            return cursor.lastrowid
+    
+    def claim_upload_job(self, worker_id: str) -> Optional[Dict]:
+        """পরবর্তী pending জব অ্যাটমিকভাবে নেওয়া (একটি জব একটি ওয়ার্কারই পাবে)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE upload_queue
+                SET status = 'processing', worker_id = ?,
+                    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = (
+                    SELECT id FROM upload_queue
+                    WHERE status = 'pending'
+                    ORDER BY id LIMIT 1
+                )
+                RETURNING *
+            ''', (worker_id,))
+            row = cursor.fetchone()
+            conn.commit()
+            return dict(row) if row else None
+    
+    def complete_upload_job(self, job_id: int, file_hash: str, cloudinary_url: str):
+        """জব সফল"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                UPDATE upload_queue
+                SET status = 'done', file_hash = ?, cloudinary_url = ?,
+                    error = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (file_hash, cloudinary_url, job_id))
+            conn.commit()
+    
+    def fail_upload_job(self, job_id: int, error: str, retry: bool = False):
+        """জব ব্যর্থ - retry হলে আবার pending"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                UPDATE upload_queue
+                SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', ('pending' if retry else 'failed', error, job_id))
+            conn.commit()
+    
+    def touch_upload_job(self, job_id: int, worker_id: str):
+        """চলমান জবের হার্টবিট - লম্বা আপলোড stale হিসেবে আবার কিউতে যায় না"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                UPDATE upload_queue SET updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND worker_id = ? AND status = 'processing'
+            ''', (job_id, worker_id))
+            conn.commit()
+    
+    def requeue_stale_upload_jobs(self, stale_seconds: int, max_attempts: int) -> List[Dict]:
+        """ক্র্যাশ করা ওয়ার্কারের (হার্টবিট বন্ধ) জব আবার কিউতে - চেষ্টার সীমা পার হলে failed
+        
+        রিটার্ন: প্রতিটি জবের status ও spool_path (failed হলে স্পুল মোছার জন্য)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE upload_queue
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    error = CASE WHEN attempts >= ? THEN 'worker stopped responding' ELSE error END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'processing'
+                AND updated_at < datetime('now', ?)
+                RETURNING status, spool_path
+            ''', (max_attempts, max_attempts, f'-{int(stale_seconds)} seconds'))
+            jobs = [dict(row) for row in cursor.fetchall()]
+            conn.commit()
+            return jobs
+    
+    def get_upload_job(self, job_id: int) -> Optional[Dict]:
+        """আপলোড জব স্ট্যাটাস"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM upload_queue WHERE id = ?', (job_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def count_pending_uploads(self) -> int:
+        """কিউতে অপেক্ষমাণ ও চলমান জব সংখ্যা"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*) as total FROM upload_queue
+                WHERE status IN ('pending', 'processing')
+            ''')
+            return cursor.fetchone()['total']
+    
+    def touch_chunks(self, chunk_hashes: List[str]) -> set:
+        """যে চাংকগুলো আগে থেকেই আছে (last_referenced আপডেট করে, GC থেকে রক্ষা)"""
+        known = set()
+        unique = list(dict.fromkeys(chunk_hashes))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # SQLite ভ্যারিয়েবল লিমিট এড়াতে ব্যাচে
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                cursor.execute(f'''
+                    UPDATE chunks SET last_referenced = CURRENT_TIMESTAMP
+                    WHERE chunk_hash IN ({placeholders})
+                    RETURNING chunk_hash
+                ''', batch)
+                known.update(row['chunk_hash'] for row in cursor.fetchall())
+            conn.commit()
+        return known
+    
+    def add_chunk(self, chunk_hash: str, size: int, cloudinary_id: str, cloudinary_url: str,
+                  key_id: str = None):
+        """আপলোড হওয়া চাংক ইনডেক্সে"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT OR IGNORE INTO chunks (chunk_hash, size, cloudinary_id, cloudinary_url, key_id)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (chunk_hash, size, cloudinary_id, cloudinary_url, key_id))
+            conn.commit()
+    
+    def save_file_manifest(self, file_hash: str, chunk_hashes: List[str]):
+        """ফাইলের চাংক তালিকা (ক্রমানুসারে)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM file_chunks WHERE file_hash = ?', (file_hash,))
+            cursor.executemany('''
+                INSERT INTO file_chunks (file_hash, seq, chunk_hash) VALUES (?, ?, ?)
+            ''', [(file_hash, seq, chunk_hash) for seq, chunk_hash in enumerate(chunk_hashes)])
+            conn.commit()
+    
+    def get_file_manifest(self, file_hash: str) -> List[Dict]:
+        """ফাইল জোড়া লাগানোর জন্য চাংক (ক্রমানুসারে)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT fc.seq, c.chunk_hash, c.size, c.cloudinary_url, c.key_id
+                FROM file_chunks fc JOIN chunks c ON c.chunk_hash = fc.chunk_hash
+                WHERE fc.file_hash = ?
+                ORDER BY fc.seq
+            ''', (file_hash,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def delete_file_manifest(self, file_hash: str):
+        with self.get_connection() as conn:
+            conn.execute('DELETE FROM file_chunks WHERE file_hash = ?', (file_hash,))
+            conn.commit()
+    
+    def collect_orphan_chunks(self, grace_seconds: int, limit: int = 1000) -> int:
+        """কোনো ম্যানিফেস্টে নেই ও গ্রেস পিরিয়ড পার হওয়া চাংক ইনডেক্স থেকে মুছে ক্লাউড ডিলিট কিউতে"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM chunks
+                WHERE chunk_hash IN (
+                    SELECT chunk_hash FROM chunks c
+                    WHERE last_referenced < datetime('now', ?)
+                      AND NOT EXISTS (SELECT 1 FROM file_chunks fc WHERE fc.chunk_hash = c.chunk_hash)
+                    LIMIT ?
+                )
+                RETURNING cloudinary_id
+            ''', (f'-{int(grace_seconds)} seconds', limit))
+            public_ids = [(row['cloudinary_id'],) for row in cursor.fetchall()]
+            cursor.executemany('''
+                INSERT INTO delete_queue (public_id, resource_type) VALUES (?, 'raw')
+                ON CONFLICT (public_id) DO NOTHING
+            ''', public_ids)
+            conn.commit()
+            return len(public_ids)
+    
+    def claim_reconcile_run(self, worker_id: str, lease_seconds: int, interval_seconds: int,
+                            force: bool = False) -> Optional[Dict]:
+        """চলমান রান (নিজের বা লিজ শেষ হওয়া) রিজিউম, নইলে সময় হলে নতুন রান - না হলে None"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # একাধিক ওয়ার্কার একসাথে নতুন রান তৈরি না করে
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                UPDATE reconcile_runs
+                SET worker_id = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'running'
+                AND (worker_id = ? OR updated_at < datetime('now', ?))
+                RETURNING *
+            ''', (worker_id, worker_id, f'-{int(lease_seconds)} seconds'))
+            row = cursor.fetchone()
+            if row:
+                return dict(row)
+            
+            cursor.execute("SELECT 1 FROM reconcile_runs WHERE status = 'running'")
+            if cursor.fetchone():
+                return None
+            
+            if not force:
+                cursor.execute('''
+                    SELECT 1 FROM reconcile_runs
+                    WHERE status = 'done' AND finished_at > datetime('now', ?)
+                ''', (f'-{int(interval_seconds)} seconds',))
+                if cursor.fetchone():
+                    return None
+            
+            cursor.execute('''
+                INSERT INTO reconcile_runs (worker_id) VALUES (?)
+                RETURNING *
+            ''', (worker_id,))
+            return dict(cursor.fetchone())
+    
+    def save_reconcile_page(self, run_id: int, worker_id: str, resources: List[Tuple],
+                            stage: int, next_cursor: Optional[str]):
+        """এক পেজ ইনভেন্টরি ও কার্সর একই ট্রানজ্যাকশনে - ক্র্যাশের পর ঠিক এখান থেকে রিজিউম
+        
+        resources টাপল: (public_id, resource_type, bytes, created_at)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO cloud_inventory
+                (run_id, public_id, resource_type, bytes, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(run_id, *resource) for resource in resources])
+            cursor.execute('''
+                UPDATE reconcile_runs
+                SET stage = ?, next_cursor = ?, cloud_objects = cloud_objects + ?,
+                    api_calls = api_calls + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND worker_id = ?
+            ''', (stage, next_cursor, len(resources), run_id, worker_id))
+            conn.commit()
+    
+    def finish_reconcile_run(self, run_id: int, grace_seconds: int) -> Dict:
+        """ইনভেন্টরি বনাম ক্যাটালগ ডিফ (ইনডেক্সড anti-join) - ইস্যু আপসার্ট, ঠিক হয়ে যাওয়াগুলো resolved
+        
+        রান শুরুর grace_seconds আগের চেয়ে নতুন সারি/অবজেক্ট বাদ - চলমান আপলোড
+        লিস্টিং ও ডাটাবেজে একসাথে না-ও থাকতে পারে।
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT started_at FROM reconcile_runs WHERE id = ?', (run_id,))
+            cutoff_params = (cursor.fetchone()['started_at'], f'-{int(grace_seconds)} seconds')
+            
+            upsert = '''
+                ON CONFLICT (kind, public_id) DO UPDATE SET
+                    last_seen_run = excluded.last_seen_run,
+                    resource_type = excluded.resource_type,
+                    bytes = excluded.bytes,
+                    resolved_at = NULL
+            '''
+            # ক্যাটালগে আছে, ক্লাউডে নেই
+            cursor.execute(f'''
+                INSERT INTO reconcile_issues
+                (kind, public_id, resource_type, file_hash, bytes, first_seen_run, last_seen_run)
+                SELECT 'missing_in_cloud', f.cloudinary_id, f.resource_type, f.file_hash,
+                       f.stored_size, ?, ?
+                FROM files f
+                WHERE f.is_deleted = 0
+                AND f.upload_date < datetime(?, ?)
+                AND NOT EXISTS (
+                    SELECT 1 FROM cloud_inventory c
+                    WHERE c.run_id = ? AND c.public_id = f.cloudinary_id
+                )
+                {upsert}
+            ''', (run_id, run_id, *cutoff_params, run_id))
+            missing = cursor.rowcount
+            cursor.execute(f'''
+                INSERT INTO reconcile_issues
+                (kind, public_id, resource_type, file_hash, bytes, first_seen_run, last_seen_run)
+                SELECT 'missing_in_cloud', ch.cloudinary_id, 'raw', ch.chunk_hash, ch.size, ?, ?
+                FROM chunks ch
+                WHERE ch.created_at < datetime(?, ?)
+                AND NOT EXISTS (
+                    SELECT 1 FROM cloud_inventory c
+                    WHERE c.run_id = ? AND c.public_id = ch.cloudinary_id
+                )
+                {upsert}
+            ''', (run_id, run_id, *cutoff_params, run_id))
+            missing += cursor.rowcount
+            
+            # ক্লাউডে আছে, কোনো ফাইল/চাংক রেফার করে না, ডিলিট কিউতেও নেই
+            cursor.execute(f'''
+                INSERT INTO reconcile_issues
+                (kind, public_id, resource_type, file_hash, bytes, first_seen_run, last_seen_run)
+                SELECT 'untracked_in_cloud', c.public_id, c.resource_type, NULL, c.bytes, ?, ?
+                FROM cloud_inventory c
+                WHERE c.run_id = ?
+                AND c.created_at < datetime(?, ?)
+                AND NOT EXISTS (
+                    SELECT 1 FROM files f
+                    WHERE f.cloudinary_id = c.public_id AND f.is_deleted = 0
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM chunks ch WHERE ch.cloudinary_id = c.public_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM delete_queue d WHERE d.public_id = c.public_id
+                )
+                {upsert}
+            ''', (run_id, run_id, run_id, *cutoff_params))
+            untracked = cursor.rowcount
+            
+            cursor.execute('''
+                UPDATE reconcile_issues SET resolved_at = CURRENT_TIMESTAMP
+                WHERE resolved_at IS NULL AND last_seen_run != ?
+            ''', (run_id,))
+            resolved = cursor.rowcount
+            
+            cursor.execute('DELETE FROM cloud_inventory WHERE run_id != ?', (run_id,))
+            cursor.execute('''
+                UPDATE reconcile_runs
+                SET status = 'done', missing = ?, untracked = ?,
+                    finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                RETURNING *
+            ''', (missing, untracked, run_id))
+            run = dict(cursor.fetchone())
+            conn.commit()
+        
+        run['resolved'] = resolved
+        return run
+    
+    def get_reconcile_status(self) -> Dict:
+        """সর্বশেষ রান ও খোলা ইস্যুর সংখ্যা (kind অনুযায়ী)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM reconcile_runs ORDER BY id DESC LIMIT 1')
+            row = cursor.fetchone()
+            cursor.execute('''
+                SELECT kind, COUNT(*) AS total FROM reconcile_issues
+                WHERE resolved_at IS NULL GROUP BY kind
+            ''')
+            return {
+                'last_run': dict(row) if row else None,
+                'open_issues': {issue['kind']: issue['total'] for issue in cursor.fetchall()}
+            }
+    
+    def get_reconcile_issues(self, kind: str = None, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """খোলা ইস্যু (রিপেয়ারের জন্য)"""
+        conditions = ['resolved_at IS NULL']
+        params = []
+        if kind:
+            conditions.append('kind = ?')
+            params.append(kind)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT * FROM reconcile_issues
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id LIMIT ? OFFSET ?
+            ''', (*params, limit, offset))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_slow_queries(self, limit: int = 50) -> List[Dict]:
+        """সাম্প্রতিক স্লো কুয়েরি (নতুন আগে)"""
+        return list(SLOW_QUERIES)[::-1][:limit]
+    
     def log_activity(self, activity_type: str, details: str = ""):
         """অ্যাক্টিভিটি লগ"""
         with self.get_connection() as conn:
@@ -220,3 +1585,7 @@ class DatabaseManager:
                 VALUES (?, ?)
             ''', (activity_type, details))
             conn.commit()
+
+
+# প্রতিটি কুয়েরি মেথডের সময় /metrics-এ
+instrument_methods(DatabaseManager, DB_QUERY_SECONDS, exclude=('get_connection',))
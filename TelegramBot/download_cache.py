@@ -0,0 +1,112 @@
+"""
+DOWNLOAD_CACHE.PY - ডাউনলোড/রিস্টোরের জন্য সাইজ-সীমিত LRU ডিস্ক ক্যাশ
+
+স্টোরেজ ব্যাকএন্ড (ক্লাউড, চাংক, এনক্রিপশন) থেকে ডিকোড করা অরিজিনাল ফাইল
+file_hash নামে ডিস্কে রাখা হয় - একই ফাইল বারবার ক্লাউড থেকে টানতে হয় না,
+আর লোকাল ফাইল থেকে Range রিকোয়েস্ট (রিজিউমেবল ডাউনলোড) সহজে সার্ভ হয়।
+একই আনক্যাশড ফাইলের একসাথে আসা রিকোয়েস্ট একটিই ফেচে মিলিত হয়।
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict
+
+from config import Config
+from metrics import DOWNLOAD_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadCache:
+    """ডিস্ক ক্যাশ - mtime-কে শেষ ব্যবহারের সময় ধরে LRU ইভিকশন"""
+
+    def __init__(self, fetch_original: Callable[[Dict, str], None]):
+        self.fetch_original = fetch_original
+        self.folder = Path(Config.DOWNLOAD_CACHE_DIR)
+        self.max_bytes = Config.DOWNLOAD_CACHE_MAX_MB * 1024 * 1024
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def path(self, file_hash: str) -> Path:
+        return self.folder / file_hash[:2] / file_hash
+
+    def fits(self, file_size: int) -> bool:
+        """ক্যাশের বড় অংশ দখল করবে এমন ফাইল ক্যাশে রাখা হয় না"""
+        return file_size <= self.max_bytes // 4
+
+    async def get(self, file_info: Dict) -> Path:
+        """ক্যাশ পাথ - না থাকলে ফেচ করে (একই হ্যাশের জন্য একটিই ফেচ)"""
+        file_hash = file_info['file_hash']
+        path = self.path(file_hash)
+
+        try:
+            # LRU - শেষ ব্যবহারের সময় আপডেট
+            os.utime(path)
+            DOWNLOAD_CACHE_REQUESTS.inc(result="hit")
+            return path
+        except FileNotFoundError:
+            pass
+
+        future = self._inflight.get(file_hash)
+        if future is None:
+            DOWNLOAD_CACHE_REQUESTS.inc(result="miss")
+            future = asyncio.ensure_future(self._fill(file_info, path))
+            self._inflight[file_hash] = future
+            future.add_done_callback(lambda _: self._inflight.pop(file_hash, None))
+        else:
+            DOWNLOAD_CACHE_REQUESTS.inc(result="coalesced")
+
+        # ক্লায়েন্ট কানেকশন কাটলেও ফেচ চলতে থাকে - অন্যরা অপেক্ষা করছে
+        await asyncio.shield(future)
+        return path
+
+    async def _fill(self, file_info: Dict, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # অন্য ওয়ার্কার প্রসেসও একই ফাইল লিখতে পারে - ইউনিক টেম্প নাম, অ্যাটমিক রিনেম
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.fetch_original, file_info, str(temp_path))
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+        logger.info(
+            f"📥 ক্যাশে যুক্ত: {file_info['filename']} "
+            f"({file_info['file_size'] / 1048576:.1f}MB, {time.perf_counter() - start:.1f}s)"
+        )
+        await asyncio.to_thread(self.evict)
+
+    def evict(self) -> int:
+        """সীমার বেশি হলে সবচেয়ে আগে ব্যবহৃত ফাইল মোছা"""
+        if not self.folder.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.folder.glob("*/*"):
+            if path.name.startswith('.'):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def discard(self, file_hash: str):
+        """ফাইল ডিলিট হলে ক্যাশ থেকেও"""
+        self.path(file_hash).unlink(missing_ok=True)
@@ -0,0 +1,181 @@
+"""
+FILE_CRYPTO.PY - ফাইলের স্ট্রিমিং অথেন্টিকেটেড এনক্রিপশন (AES-256-GCM, চাংকভিত্তিক)
+
+Fernet পুরো মেসেজ মেমোরিতে চায় - ১০০MB ভিডিওর জন্য অচল। এখানে ফাইল ছোট
+চাংকে এনক্রিপ্ট হয়, তাই মেমোরি চাংক সাইজেই সীমিত।
+
+ফরম্যাট:
+  হেডার: magic(4) | version(1) | key_id(8) | salt(16) | chunk_size(4)
+  রেকর্ড: AES-GCM(chunk) + tag(16), প্রতি রেকর্ডে আলাদা nonce
+
+  - প্রতি ফাইলে salt থেকে HKDF দিয়ে আলাদা কি, nonce = রেকর্ড নম্বর + শেষ-রেকর্ড ফ্ল্যাগ
+  - হেডার সব রেকর্ডের AAD - key_id/chunk_size বদলালে ডিক্রিপ্ট ব্যর্থ
+  - শেষ রেকর্ড আলাদা ফ্ল্যাগে এনক্রিপ্ট - কেটে ছোট করা (truncation) ধরা পড়ে
+"""
+
+import hashlib
+import importlib.util
+import os
+import struct
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from config import Config
+
+# cryptography (OpenSSL বাইন্ডিং) ভারী - প্রথম এনক্রিপ্ট/ডিক্রিপ্টের সময় ইমপোর্ট হয়
+CRYPTOGRAPHY_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+
+MAGIC = b"ABKE"
+VERSION = 1
+HEADER = struct.Struct("!4sB8s16sI")
+TAG_SIZE = 16
+HKDF_INFO = b"auto-backup file stream v1"
+# হেডারের chunk_size বিশ্বাসযোগ্য নয় - এর বেশি হলে বাফার করার আগেই বাতিল
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def _derive_master(secret: bytes) -> Tuple[str, bytes]:
+    """(key_id hex, master key) - key_id কি থেকেই আসে, তাই আলাদা করে রাখতে হয় না"""
+    master = hashlib.sha256(secret).digest()
+    key_id = hashlib.sha256(b"key-id:" + master).digest()[:8]
+    return key_id.hex(), master
+
+
+def _master_keys() -> Dict[str, bytes]:
+    """বর্তমান ও পুরনো সব কি (key_id → master)"""
+    keys = dict(_derive_master(secret) for secret in Config.OLD_ENCRYPTION_KEYS)
+    key_id, master = _derive_master(Config.ENCRYPTION_KEY)
+    keys[key_id] = master
+    return keys
+
+
+def current_key_id() -> Optional[str]:
+    """এনক্রিপশন চালু থাকলে বর্তমান key_id, নইলে None"""
+    if not Config.STORAGE_ENCRYPTION_ENABLED:
+        return None
+    if not CRYPTOGRAPHY_AVAILABLE:
+        raise RuntimeError("ফাইল এনক্রিপশনের জন্য cryptography প্যাকেজ দরকার")
+    return _derive_master(Config.ENCRYPTION_KEY)[0]
+
+
+def _file_cipher(master: bytes, salt: bytes) -> "AESGCM":
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=HKDF_INFO).derive(master)
+    return AESGCM(key)
+
+
+def _nonce(counter: int, last: bool) -> bytes:
+    return counter.to_bytes(11, 'big') + (b"\x01" if last else b"\x00")
+
+
+class EncryptingWriter:
+    """write() করা প্লেইনটেক্সট এনক্রিপ্ট করে sink-এ লেখে (ফাইল-অবজেক্টের মতো)
+
+    close() শেষ রেকর্ড লেখে, কিন্তু sink বন্ধ করে না।
+    """
+
+    def __init__(self, sink, chunk_size: int = None):
+        self.sink = sink
+        self.chunk_size = chunk_size or Config.STORAGE_ENCRYPTION_CHUNK_KB * 1024
+        if not 0 < self.chunk_size <= MAX_CHUNK_SIZE:
+            # এমন ফাইল পরে ডিক্রিপ্ট করা যেত না
+            raise ValueError(f"এনক্রিপশন চাংক সাইজ 1 বাইট থেকে {MAX_CHUNK_SIZE} বাইটের মধ্যে হতে হবে")
+        key_id, master = _derive_master(Config.ENCRYPTION_KEY)
+        salt = os.urandom(16)
+        self.header = HEADER.pack(MAGIC, VERSION, bytes.fromhex(key_id), salt, self.chunk_size)
+        self.cipher = _file_cipher(master, salt)
+        self.counter = 0
+        self.buffer = bytearray()
+        self.closed = False
+        self.sink.write(self.header)
+
+    def _emit(self, chunk: bytes, last: bool):
+        self.sink.write(self.cipher.encrypt(_nonce(self.counter, last), chunk, self.header))
+        self.counter += 1
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        # শেষ রেকর্ড যাতে কখনো খালি না হয় (খালি ফাইল ছাড়া) - পুরো চাংকের বেশি জমলে তবেই লেখা
+        while len(self.buffer) > self.chunk_size:
+            self._emit(bytes(self.buffer[:self.chunk_size]), last=False)
+            del self.buffer[:self.chunk_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if not self.closed:
+            self._emit(bytes(self.buffer), last=True)
+            self.buffer = bytearray()
+            self.closed = True
+
+
+def encrypt_bytes(data: bytes) -> bytes:
+    """ছোট ডেটা (চাংক, ম্যানিফেস্ট) একই ফরম্যাটে এনক্রিপ্ট"""
+    output = _BytesSink()
+    writer = EncryptingWriter(output)
+    writer.write(data)
+    writer.close()
+    return b"".join(output.parts)
+
+
+class _BytesSink:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data: bytes):
+        self.parts.append(data)
+
+
+def decrypt_stream(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """এনক্রিপ্টেড বাইট স্ট্রিম থেকে প্লেইনটেক্সট চাংক (ট্যাম্পার/ট্রাঙ্কেশন হলে ValueError)"""
+    if not CRYPTOGRAPHY_AVAILABLE:
+        raise RuntimeError("ফাইল ডিক্রিপ্ট করতে cryptography প্যাকেজ দরকার")
+
+    buffer = bytearray()
+    cipher = header = None
+    record_size = counter = 0
+
+    for block in blocks:
+        buffer += block
+        if cipher is None:
+            if len(buffer) < HEADER.size:
+                continue
+            header = bytes(buffer[:HEADER.size])
+            magic, version, key_id, salt, chunk_size = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("এনক্রিপ্টেড ফাইল ফরম্যাট চেনা যায়নি")
+            if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+                raise ValueError(f"এনক্রিপ্টেড ফাইলের চাংক সাইজ অগ্রহণযোগ্য: {chunk_size}")
+            master = _master_keys().get(key_id.hex())
+            if master is None:
+                raise ValueError(f"অজানা এনক্রিপশন কি: {key_id.hex()}")
+            cipher = _file_cipher(master, salt)
+            record_size = chunk_size + TAG_SIZE
+            del buffer[:HEADER.size]
+
+        # শেষ রেকর্ড স্ট্রিম শেষ না হওয়া পর্যন্ত বোঝা যায় না, তাই একটি রেকর্ড হাতে রাখা
+        while len(buffer) > record_size:
+            yield _open(cipher, counter, bytes(buffer[:record_size]), header, last=False)
+            del buffer[:record_size]
+            counter += 1
+
+    if cipher is None:
+        raise ValueError("এনক্রিপ্টেড ফাইলের হেডার অসম্পূর্ণ")
+    yield _open(cipher, counter, bytes(buffer), header, last=True)
+
+
+def _open(cipher, counter: int, record: bytes, header: bytes, last: bool) -> bytes:
+    from cryptography.exceptions import InvalidTag
+
+    try:
+        return cipher.decrypt(_nonce(counter, last), record, header)
+    except InvalidTag:
+        raise ValueError(f"এনক্রিপ্টেড ফাইল ক্ষতিগ্রস্ত বা অসম্পূর্ণ (রেকর্ড {counter})")
+
+
+def decrypt_bytes(data: bytes) -> bytes:
+    return b"".join(decrypt_stream([data]))
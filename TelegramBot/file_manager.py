@@ -6,15 +6,27 @@ import os
 import shutil
 import logging
 import hashlib
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Set
 import json
 
 from config import Config
+from file_types import type_from_extension
+from metrics import HASHED_BYTES, HASH_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# file_types-এর টাইপ → organize_files_by_type-এর গ্রুপ
+ORGANIZE_GROUPS = {
+    'image': 'images',
+    'video': 'videos',
+    'document': 'documents',
+    'audio': 'audio',
+    'archive': 'archives'
+}
+
 class FileManager:
     def __init__(self):
         self.config = Config
@@ -42,9 +54,14 @@ class FileManager:
     def calculate_hash(self, file_path: str) -> str:
         """ফাইল হ্যাশ"""
         sha256 = hashlib.sha256()
+        total = 0
+        start = time.perf_counter()
         with open(file_path, 'rb') as f:
             for block in iter(lambda: f.read(4096), b""):
                 sha256.update(block)
+                total += len(block)
+        HASH_SECONDS.observe(time.perf_counter() - start, source="scan")
+        HASHED_BYTES.inc(total, source="scan")
         return sha256.hexdigest()
     
     def get_new_files(self, folder_path: str) -> List[Dict]:
@@ -88,7 +105,7 @@ class FileManager:
         return patterns
     
     def organize_files_by_type(self, files: List[Dict]) -> Dict[str, List]:
-        """ফাইল টাইপ অনুযায়ী অর্গানাইজ"""
+        """ফাইল টাইপ অনুযায়ী অর্গানাইজ (শেয়ার্ড এক্সটেনশন টেবিল থেকে)"""
         organized = {
             'images': [],
             'videos': [],
@@ -99,20 +116,8 @@ class FileManager:
         }
         
         for file in files:
-            ext = Path(file['name']).suffix.lower()
-            
-            if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']:
-                organized['images'].append(file)
-            elif ext in ['.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv']:
-                organized['videos'].append(file)
-            elif ext in ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.txt']:
-                organized['documents'].append(file)
-            elif ext in ['.mp3', '.wav', '.aac', '.flac', '.m4a']:
-                organized['audio'].append(file)
-            elif ext in ['.zip', '.rar', '.7z']:
-                organized['archives'].append(file)
-            else:
-                organized['others'].append(file)
+            group = ORGANIZE_GROUPS.get(type_from_extension(file['name']), 'others')
+            organized[group].append(file)
         
         return organized
     
@@ -0,0 +1,137 @@
+"""
+FILE_TYPES.PY - শেয়ার্ড ফাইল টাইপ ক্লাসিফায়ার
+
+আপলোডের হ্যাশিং পাসের প্রথম ব্লকের ম্যাজিক বাইট থেকে টাইপ বের করা হয়
+(libmagic, না থাকলে ছোট বিল্ট-ইন সিগনেচার টেবিল)। কনটেন্ট চেনা না গেলে বা
+শুধু কন্টেইনার (ZIP, OLE) চেনা গেলে এক্সটেনশন টেবিল থেকে - ডিকশনারি লুকআপ।
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import magic
+except ImportError:  # libmagic নেই (যেমন Windows) - বিল্ট-ইন সিগনেচার
+    magic = None
+
+logger = logging.getLogger(__name__)
+
+# ম্যাজিক বাইট দেখার জন্য প্রথম ব্লকের এতটুকুই যথেষ্ট
+SNIFF_BYTES = 8192
+
+FILE_TYPE_GROUPS = {
+    'image': ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'),
+    'video': ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv'),
+    'document': ('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.txt', '.rtf'),
+    'audio': ('.mp3', '.wav', '.aac', '.flac', '.m4a'),
+    'archive': ('.zip', '.rar', '.7z'),
+    'app': ('.apk',),
+}
+EXTENSION_TYPES: Dict[str, str] = {
+    ext: file_type for file_type, extensions in FILE_TYPE_GROUPS.items() for ext in extensions
+}
+
+# Cloudinary রিসোর্স টাইপ (অডিও Cloudinary-তে video হিসেবে থাকে, বাকি সব raw)
+RESOURCE_TYPES = {'image': 'image', 'video': 'video', 'audio': 'video'}
+
+MIME_TYPES = {
+    'application/pdf': 'document',
+    'application/msword': 'document',
+    'application/rtf': 'document',
+    'text/rtf': 'document',
+    'text/plain': 'document',
+    'application/vnd.ms-excel': 'document',
+    'application/vnd.ms-powerpoint': 'document',
+    'application/zip': 'archive',
+    'application/x-rar': 'archive',
+    'application/vnd.rar': 'archive',
+    'application/x-7z-compressed': 'archive',
+    'application/vnd.android.package-archive': 'app',
+}
+
+# ZIP/OLE কন্টেইনারের ভেতরে docx/xlsx/apk ইত্যাদি - এগুলোতে এক্সটেনশনই বেশি নির্দিষ্ট
+CONTAINER_MIME_TYPES = {
+    'application/zip', 'application/java-archive', 'application/x-ole-storage',
+    'application/CDFV2', 'application/octet-stream', 'text/plain',
+}
+
+# libmagic না থাকলে: (অফসেট, সিগনেচার, MIME)
+SIGNATURES = (
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF8', 'image/gif'),
+    (0, b'BM', 'image/bmp'),
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'{\\rtf', 'text/rtf'),
+    (0, b'PK\x03\x04', 'application/zip'),
+    (0, b'Rar!\x1a\x07', 'application/x-rar'),
+    (0, b"7z\xbc\xaf'\x1c", 'application/x-7z-compressed'),
+    (0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/x-ole-storage'),
+    (0, b'\x1aE\xdf\xa3', 'video/x-matroska'),
+    (0, b'0&\xb2u\x8ef\xcf\x11', 'video/x-ms-asf'),
+    (0, b'FLV\x01', 'video/x-flv'),
+    (0, b'fLaC', 'audio/flac'),
+    (0, b'ID3', 'audio/mpeg'),
+    (0, b'\xff\xfb', 'audio/mpeg'),
+    (0, b'\xff\xf1', 'audio/aac'),
+    (0, b'\xff\xf9', 'audio/aac'),
+)
+RIFF_TYPES = {b'WEBP': 'image/webp', b'AVI ': 'video/x-msvideo', b'WAVE': 'audio/x-wav'}
+
+
+def type_from_extension(filename: str) -> str:
+    return EXTENSION_TYPES.get(Path(filename).suffix.lower(), 'other')
+
+
+def _builtin_mime(head: bytes) -> Optional[str]:
+    if head[:4] == b'RIFF':
+        return RIFF_TYPES.get(head[8:12])
+    if head[4:8] == b'ftyp':
+        # ISO BMFF - M4A ব্র্যান্ড অডিও, বাকিগুলো (mp4, mov, 3gp) ভিডিও
+        return 'audio/mp4' if head[8:11] == b'M4A' else 'video/mp4'
+    for offset, signature, mime in SIGNATURES:
+        if head.startswith(signature, offset):
+            return mime
+    return None
+
+
+def sniff_mime(head: bytes) -> Optional[str]:
+    """প্রথম ব্লকের ম্যাজিক বাইট থেকে MIME টাইপ (চেনা না গেলে None)"""
+    if not head:
+        return None
+    head = head[:SNIFF_BYTES]
+    if magic is not None:
+        try:
+            return magic.from_buffer(head, mime=True)
+        except Exception as e:
+            logger.warning(f"⚠️ libmagic এরর, বিল্ট-ইন সিগনেচার ব্যবহার: {e}")
+    return _builtin_mime(head)
+
+
+def classify(filename: str, head: bytes = b"") -> str:
+    """ফাইল টাইপ (image, video, document, audio, archive, app, other)"""
+    by_extension = type_from_extension(filename)
+    mime = sniff_mime(head)
+    if not mime or mime in CONTAINER_MIME_TYPES:
+        return by_extension
+
+    major = mime.split('/', 1)[0]
+    if major in ('image', 'video', 'audio'):
+        return major
+    by_content = MIME_TYPES.get(mime)
+    if by_content == 'archive' and by_extension in ('document', 'app'):
+        return by_extension
+    return by_content or by_extension
+
+
+def classify_path(file_path: str) -> str:
+    """ডিস্কের ফাইল ক্লাসিফাই (প্রথম ব্লক হাতে না থাকলে)"""
+    with open(file_path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+    return classify(Path(file_path).name, head)
+
+
+def resource_type_for(file_type: str) -> str:
+    """ক্লাউড আপলোডের নির্দিষ্ট resource_type - প্রোভাইডারকে আর স্নিফ করতে হয় না"""
+    return RESOURCE_TYPES.get(file_type, 'raw')
@@ -0,0 +1,157 @@
+"""
+LIVE_EVENTS.PY - ড্যাশবোর্ডে লাইভ আপডেট (Server-Sent Events)
+
+প্রতি প্রসেসে একটি পাবলিশার চেঞ্জ ফিড (file_changes) থেকে নতুন ইভেন্ট পড়ে
+একবার এনকোড করে সব সাবস্ক্রাইবারের বাফারে দেয়। সাবস্ক্রাইবার যতই হোক,
+DB-তে যায় শুধু পাবলিশার - আর কোনো সাবস্ক্রাইবার না থাকলে একদমই না।
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+import orjson
+
+from config import Config
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+EVENT_FILE_COLUMNS = ['filename', 'file_size', 'file_type', 'upload_date', 'device_name']
+STATS_FIELDS = ('total_files', 'total_size_mb', 'last_backup_time')
+
+
+def encode_event(event: str, data: Dict, event_id: Optional[int] = None) -> bytes:
+    """SSE ফ্রেম (একবার এনকোড, সবার কাছে একই bytes)"""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    return frame.encode() + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+class Subscriber:
+    """একটি ড্যাশবোর্ড কানেকশন - সীমিত বাফার সহ"""
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.lagged = False
+
+    def offer(self, frame: Optional[bytes]):
+        """বাফার ভরা থাকলে পুরনো ইভেন্ট ফেলে resync পাঠানো (স্লো ক্লায়েন্ট অন্যদের আটকায় না)"""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            if self.lagged and frame is not None:
+                return
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(frame if frame is None else encode_event('resync', {}))
+
+
+class EventPublisher:
+    """একক ইন-প্রসেস পাবলিশার → অনেক সাবস্ক্রাইবার"""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.subscribers: Set[Subscriber] = set()
+        self.last_seq: Optional[int] = None
+        self.last_stats: Dict = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def close(self):
+        """সব স্ট্রিম বন্ধ (শাটডাউনের আগে, যাতে কানেকশন ড্রেইন আটকে না থাকে)"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for subscriber in list(self.subscribers):
+            subscriber.offer(None)
+
+    def notify(self):
+        """এই প্রসেসে পরিবর্তন হয়েছে - পোল ইন্টারভালের অপেক্ষা ছাড়াই পাবলিশ (থ্রেড-সেফ)"""
+        if self._loop and self._wake:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(Config.EVENTS_SUBSCRIBER_BUFFER)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def snapshot(self) -> bytes:
+        """নতুন সাবস্ক্রাইবারের জন্য পূর্ণ স্ট্যাটস"""
+        if self.last_seq is None:
+            # পাবলিশার আইডল ছিল - ক্যাশ করা স্ট্যাটস/কার্সর পুরনো হতে পারে
+            await self._resync()
+        elif not self.last_stats:
+            self.last_stats = await self._load_stats()
+        return encode_event('stats', self.last_stats)
+
+    async def _resync(self):
+        """ফিড পজিশন ও স্ট্যাটস নতুন করে - আগে seq, পরে stats, যাতে মাঝের পরিবর্তন বাদ না পড়ে"""
+        state = await asyncio.to_thread(self.db.get_change_feed_state)
+        stats = await self._load_stats()
+        if self.last_seq is None:
+            self.last_seq = state['latest']
+            self.last_stats = stats
+
+    async def _load_stats(self) -> Dict:
+        stats = await asyncio.to_thread(self.db.get_backup_stats)
+        return {field: stats.get(field) for field in STATS_FIELDS}
+
+    def _broadcast(self, frame: bytes):
+        for subscriber in list(self.subscribers):
+            subscriber.offer(frame)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), Config.EVENTS_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            if not self.subscribers:
+                # কেউ শুনছে না - DB-তে না গিয়ে কার্সর ও ক্যাশ করা স্ট্যাটস রিসেট
+                self.last_seq = None
+                self.last_stats = {}
+                continue
+
+            try:
+                await self._publish_changes()
+            except Exception as e:
+                logger.error(f"❌ লাইভ ইভেন্ট পাবলিশ এরর: {e}")
+
+    async def _publish_changes(self):
+        if self.last_seq is None:
+            await self._resync()
+            return
+
+        rows = await asyncio.to_thread(
+            self.db.get_changes, self.last_seq, EVENT_FILE_COLUMNS, Config.CHANGE_FEED_PAGE_SIZE
+        )
+        if not rows:
+            return
+
+        for seq, op, file_hash, *values in rows:
+            data = {'op': op, 'file_hash': file_hash}
+            if op == 'upsert':
+                data.update(zip(EVENT_FILE_COLUMNS, values))
+            self._broadcast(encode_event('file', data, seq))
+            self.last_seq = seq
+
+        # শুধু বদলানো ফিল্ড পাঠানো
+        stats = await self._load_stats()
+        delta = {key: value for key, value in stats.items() if self.last_stats.get(key) != value}
+        self.last_stats = stats
+        if delta:
+            self._broadcast(encode_event('stats', delta))
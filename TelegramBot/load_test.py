@@ -0,0 +1,314 @@
+"""
+LOAD_TEST.PY - অনেক Android ডিভাইসের একসাথে সিঙ্ক সিমুলেশন
+
+লোকাল ফেক ক্লাউড সার্ভার (Cloudinary API-র মতো, কনফিগারযোগ্য লেটেন্সি,
+এরর রেট ও থ্রুপুট ক্যাপ) আর FastAPI অ্যাপ আলাদা প্রসেসে চালিয়ে
+N ডিভাইস register → scan → exists → upload করে।
+
+ব্যবহার:
+    python load_test.py --devices 50 --files-per-device 20 --cloud-latency-ms 300
+    python load_test.py --target http://127.0.0.1:800 --api-key KEY   # চলমান সার্ভারে
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmark import random_file
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# ==================== FAKE CLOUD SERVER ====================
+def serve_fake_cloud(port: int, latency_ms: float, jitter_ms: float,
+                     error_rate: float, mbps: float, seed: int):
+    """Cloudinary upload/destroy API-র মতো লোকাল সার্ভার (আলাদা প্রসেসে)"""
+    from aiohttp import web
+
+    rng = random.Random(seed)
+    bytes_per_second = mbps * 1024 * 1024 / 8 if mbps > 0 else 0
+    pipe = {'next_free': 0.0}
+
+    async def throttle(size: int):
+        # সব কানেকশনের জন্য একটি শেয়ার্ড "পাইপ" - মোট থ্রুপুট ক্যাপ
+        if not bytes_per_second:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, pipe['next_free'])
+        pipe['next_free'] = start + size / bytes_per_second
+        await asyncio.sleep(pipe['next_free'] - now)
+
+    async def simulate_latency():
+        delay = max(0.0, rng.gauss(latency_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+    async def upload(request):
+        fields = {}
+        received = 0
+        reader = await request.multipart()
+        async for part in reader:
+            if part.filename:
+                while True:
+                    chunk = await part.read_chunk(64 * 1024)
+                    if not chunk:
+                        break
+                    received += len(chunk)
+                    await throttle(len(chunk))
+            else:
+                fields[part.name] = await part.text()
+
+        await simulate_latency()
+        if rng.random() < error_rate:
+            return web.json_response({'error': {'message': 'simulated cloud failure'}}, status=500)
+
+        public_id = fields.get('public_id', f"personal_backup/{rng.getrandbits(64):016x}")
+        return web.json_response({
+            'public_id': public_id,
+            'secure_url': f"http://127.0.0.1:{port}/files/{public_id}",
+            'bytes': received,
+            'resource_type': request.match_info['resource_type'],
+            'created_at': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+
+    async def destroy(request):
+        await simulate_latency()
+        return web.json_response({'result': 'ok'})
+
+    app = web.Application(client_max_size=1024 ** 3)
+    app.router.add_post('/v1_1/{cloud}/{resource_type}/upload', upload)
+    app.router.add_post('/v1_1/{cloud}/{resource_type}/destroy', destroy)
+    web.run_app(app, host='127.0.0.1', port=port, print=None)
+
+
+# ==================== API SERVER ====================
+def serve_api(port: int, cloud_url: str, workdir: str):
+    """FastAPI অ্যাপ - ফেক ক্লাউডের দিকে পয়েন্ট করা (আলাদা প্রসেসে)"""
+    os.chdir(workdir)
+
+    from config import Config
+    Config.DATABASE_NAME = os.path.join(workdir, "load_test.db")
+    Config.UPLOAD_SPOOL_DIR = os.path.join(workdir, "spool")
+
+    import cloudinary
+    import uvicorn
+    import api_routes
+
+    # Cloudinary SDK-র API বেস URL ফেক সার্ভারে
+    cloudinary.config(upload_prefix=cloud_url)
+    uvicorn.run(api_routes.app, host='127.0.0.1', port=port, log_level='warning')
+
+
+# ==================== DEVICE SIMULATION ====================
+class Stats:
+    """এন্ডপয়েন্ট অনুযায়ী লেটেন্সি ও এরর"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.uploaded_bytes = 0
+
+    async def call(self, endpoint: str, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[endpoint] += 1
+            return None
+        finally:
+            self.latencies[endpoint].append(time.perf_counter() - start)
+
+        if response.status_code >= 500 or response.status_code in (401, 403):
+            self.errors[endpoint] += 1
+        return response
+
+    def report(self, elapsed: float) -> Dict:
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            quantiles = statistics.quantiles(values, n=100) if len(values) > 1 else values * 99
+            endpoints[endpoint] = {
+                'requests': len(values),
+                'errors': self.errors[endpoint],
+                'rps': len(values) / elapsed,
+                'p50_ms': quantiles[49] * 1000,
+                'p95_ms': quantiles[94] * 1000,
+                'p99_ms': quantiles[98] * 1000,
+                'mean_ms': statistics.fmean(values) * 1000,
+            }
+        return {
+            'elapsed_s': elapsed,
+            'uploaded_mb': self.uploaded_bytes / 1048576,
+            'upload_mb_s': self.uploaded_bytes / 1048576 / elapsed,
+            'endpoints': endpoints,
+        }
+
+
+async def simulate_device(index: int, client: httpx.AsyncClient, args, stats: Stats,
+                          pool: bytes, shared_hashes: List[str]):
+    """একটি ফোন: register → scan → (প্রতি ফাইলে) exists → upload"""
+    rng = random.Random(args.seed + index)
+    await asyncio.sleep(rng.uniform(0, args.ramp_up))
+
+    response = await stats.call('register', client.get(
+        '/api/device/register', params={'device_name': f"loadtest-{index}"}
+    ))
+    device_id = response.json()['device_id'] if response is not None and response.status_code == 200 \
+        else f"loadtest-{index}"
+    headers = {'device-id': device_id}
+
+    await stats.call('scan', client.get('/api/scan', headers=headers))
+
+    for n in range(args.files_per_device):
+        # কিছু ফাইল অন্য ডিভাইসে আগেই আপলোড হয়েছে (ডুপ্লিকেট)
+        if shared_hashes and rng.random() < args.dup_rate:
+            file_hash = rng.choice(shared_hashes)
+            await stats.call('exists', client.get(f'/api/file/{file_hash}'))
+            continue
+
+        item = random_file(rng, index * args.files_per_device + n)
+        size = min(item['file_size'], args.max_file_kb * 1024)
+        offset = rng.randrange(0, max(1, len(pool) - size))
+        # ইউনিক কন্টেন্ট: ডিভাইস/ফাইল প্রিফিক্স + র‍্যান্ডম পুলের অংশ
+        content = f"{index}:{n}:".encode() + pool[offset:offset + size]
+        file_hash = hashlib.sha256(content).hexdigest()
+
+        response = await stats.call('exists', client.get(f'/api/file/{file_hash}'))
+        if response is not None and response.status_code == 200:
+            continue
+
+        response = await stats.call('upload', client.post(
+            '/api/upload',
+            files={'file': (item['filename'], content, 'application/octet-stream')},
+            headers=headers
+        ))
+        if response is not None and response.status_code == 200:
+            stats.uploaded_bytes += len(content)
+            shared_hashes.append(file_hash)
+
+
+async def run_load(args, base_url: str) -> Dict:
+    stats = Stats()
+    pool = os.urandom(args.max_file_kb * 1024 * 2)
+    shared_hashes: List[str] = []
+    limits = httpx.Limits(max_connections=args.devices, max_keepalive_connections=args.devices)
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={'X-API-Key': args.api_key},
+        timeout=args.timeout,
+        limits=limits
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            simulate_device(i, client, args, stats, pool, shared_hashes)
+            for i in range(args.devices)
+        ])
+        elapsed = time.perf_counter() - start
+
+    return stats.report(elapsed)
+
+
+def wait_for_server(base_url: str, api_key: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            response = httpx.get(f"{base_url}/api/status", headers={'X-API-Key': api_key})
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"সার্ভার চালু হয়নি: {base_url}")
+
+
+def print_report(report: Dict):
+    print(f"\n⏱️  মোট সময়: {report['elapsed_s']:.1f}s | "
+          f"আপলোড: {report['uploaded_mb']:.1f} MB ({report['upload_mb_s']:.2f} MB/s)")
+    print(f"{'endpoint':10s} {'req':>7s} {'err':>5s} {'rps':>8s} {'p50':>9s} {'p95':>9s} {'p99':>9s}")
+    for endpoint, row in report['endpoints'].items():
+        print(f"{endpoint:10s} {row['requests']:7d} {row['errors']:5d} {row['rps']:8.1f} "
+              f"{row['p50_ms']:8.1f}ms {row['p95_ms']:8.1f}ms {row['p99_ms']:8.1f}ms")
+
+
+def main():
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Auto Backup Pro end-to-end load test")
+    parser.add_argument('--devices', type=int, default=20)
+    parser.add_argument('--files-per-device', type=int, default=10)
+    parser.add_argument('--max-file-kb', type=int, default=4096, help="একটি ফাইলের সর্বোচ্চ সাইজ")
+    parser.add_argument('--dup-rate', type=float, default=0.1, help="ডুপ্লিকেট ফাইলের অনুপাত")
+    parser.add_argument('--ramp-up', type=float, default=2.0, help="ডিভাইস শুরু ছড়ানোর সময় (s)")
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--cloud-latency-ms', type=float, default=200.0)
+    parser.add_argument('--cloud-jitter-ms', type=float, default=50.0)
+    parser.add_argument('--cloud-error-rate', type=float, default=0.0)
+    parser.add_argument('--cloud-mbps', type=float, default=0.0, help="ফেক ক্লাউডের থ্রুপুট ক্যাপ (0 = সীমাহীন)")
+    parser.add_argument('--target', help="চলমান সার্ভারের URL (দিলে নিজে সার্ভার চালাবে না)")
+    parser.add_argument('--api-key', default=Config.API_ACCESS_TOKEN)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="রিপোর্ট JSON ফাইল")
+    args = parser.parse_args()
+
+    processes = []
+    workdir = None
+    base_url = args.target
+
+    try:
+        if not base_url:
+            workdir = tempfile.mkdtemp(prefix="backup_load_")
+            cloud_port, api_port = free_port(), free_port()
+
+            processes.append(multiprocessing.Process(target=serve_fake_cloud, args=(
+                cloud_port, args.cloud_latency_ms, args.cloud_jitter_ms,
+                args.cloud_error_rate, args.cloud_mbps, args.seed
+            ), daemon=True))
+            processes.append(multiprocessing.Process(target=serve_api, args=(
+                api_port, f"http://127.0.0.1:{cloud_port}", workdir
+            ), daemon=True))
+            for process in processes:
+                process.start()
+
+            base_url = f"http://127.0.0.1:{api_port}"
+
+        wait_for_server(base_url, args.api_key)
+        print(f"🚀 {args.devices} ডিভাইস x {args.files_per_device} ফাইল → {base_url}")
+
+        report = asyncio.run(run_load(args, base_url))
+        report['params'] = vars(args)
+        print_report(report)
+
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+            print(f"✅ রিপোর্ট সেভ: {args.output}")
+
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(timeout=5)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
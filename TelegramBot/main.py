@@ -4,20 +4,30 @@ MAIN.PY - মেইন সার্ভার ফাইল
 
 import asyncio
 import logging
+import os
 import signal
 import sys
-from threading import Thread
 from typing import Optional
 
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
 import uvicorn
 
+try:
+    import uvloop
+except ImportError:  # Windows বা uvloop ইনস্টল না থাকলে স্ট্যান্ডার্ড asyncio
+    uvloop = None
+
 from config import Config
-from bot_commands import (
-    start_command, status_command, files_command,
-    stats_command, help_command, handle_callback
-)
-from api_routes import app as fastapi_app
+from services import log_startup_report, startup_timer
+
+with startup_timer("import", "bot_commands"):
+    from bot_commands import (
+        start_command, status_command, files_command,
+        stats_command, charts_command, help_command, handle_callback,
+        search_message_handler
+    )
+with startup_timer("import", "api_routes"):
+    from api_routes import app as fastapi_app, event_publisher
 
 # লগিং সেটআপ
 logging.basicConfig(
@@ -30,10 +40,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class EmbeddedUvicornServer(uvicorn.Server):
+    """একই ইভেন্ট লুপে চলা uvicorn সার্ভার - সিগনাল BackupServer হ্যান্ডল করে"""
+    
+    def install_signal_handlers(self):
+        pass
+
+
 class BackupServer:
     def __init__(self):
         self.telegram_app: Optional[Application] = None
-        self.fastapi_server: Optional[Thread] = None
+        self.api_server: Optional[EmbeddedUvicornServer] = None
+        self.api_task: Optional[asyncio.Task] = None
+        self.api_process: Optional[asyncio.subprocess.Process] = None
+        self.stop_event: Optional[asyncio.Event] = None
         self.is_running = False
     
     async def start_telegram_bot(self):
@@ -49,11 +69,17 @@ class BackupServer:
             self.telegram_app.add_handler(CommandHandler("status", status_command))
             self.telegram_app.add_handler(CommandHandler("files", files_command))
             self.telegram_app.add_handler(CommandHandler("stats", stats_command))
+            self.telegram_app.add_handler(CommandHandler("charts", charts_command))
             self.telegram_app.add_handler(CommandHandler("help", help_command))
             
             # কলব্যাক হ্যান্ডলার
             self.telegram_app.add_handler(CallbackQueryHandler(handle_callback))
             
+            # সার্চ কিওয়ার্ড মেসেজ হ্যান্ডলার
+            self.telegram_app.add_handler(
+                MessageHandler(filters.TEXT & ~filters.COMMAND, search_message_handler)
+            )
+            
             # বট শুরু
             await self.telegram_app.initialize()
             await self.telegram_app.start()
@@ -65,59 +91,119 @@ class BackupServer:
             logger.error(f"❌ Telegram বট শুরু করতে ব্যর্থ: {e}")
             raise
     
-    def start_fastapi_server(self):
-        """FastAPI সার্ভার শুরু"""
-        try:
-            uvicorn.run(
-                fastapi_app,
-                host=Config.SERVER_HOST,
-                port=Config.SERVER_PORT,
-                log_level="info"
-            )
-        except Exception as e:
-            logger.error(f"❌ FastAPI সার্ভার শুরু করতে ব্যর্থ: {e}")
-            raise
+    async def start_fastapi_server(self):
+        """FastAPI সার্ভার শুরু (বটের সাথে একই ইভেন্ট লুপে)"""
+        config = uvicorn.Config(
+            fastapi_app,
+            host=Config.SERVER_HOST,
+            port=Config.SERVER_PORT,
+            log_level="info",
+            loop="none",
+            timeout_graceful_shutdown=Config.SHUTDOWN_TIMEOUT_SECONDS
+        )
+        self.api_server = EmbeddedUvicornServer(config)
+        self.api_task = asyncio.create_task(self.api_server.serve())
+        
+        # সার্ভার নিজে থেকে থেমে গেলে (যেমন পোর্ট বিজি) পুরো প্রসেস বন্ধ
+        self.api_task.add_done_callback(lambda _: self.request_shutdown())
+    
+    async def start_api_workers(self):
+        """মাল্টি-প্রসেস API সার্ভার আলাদা প্রসেসে শুরু (api_server.py)"""
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_server.py")
+        self.api_process = await asyncio.create_subprocess_exec(
+            sys.executable, script, "--workers", str(Config.API_WORKERS)
+        )
+        logger.info(f"🧵 API ওয়ার্কার মোড: {Config.API_WORKERS} প্রসেস (PID {self.api_process.pid})")
+        
+        async def watch():
+            await self.api_process.wait()
+            self.request_shutdown()
+        
+        self.api_task = asyncio.create_task(watch())
     
     async def start(self):
         """সার্ভার শুরু"""
         logger.info("🚀 Auto Backup Pro সার্ভার শুরু হচ্ছে...")
         logger.info(f"📱 Owner ID: {Config.YOUR_TELEGRAM_USER_ID}")
         logger.info(f"🌐 API Server: http://{Config.SERVER_HOST}:{Config.SERVER_PORT}")
+        logger.info(f"⚡ Event loop: {type(asyncio.get_running_loop()).__module__}")
         
         self.is_running = True
+        self.stop_event = asyncio.Event()
         
-        # FastAPI সার্ভার আলাদা থ্রেডে শুরু
-        self.fastapi_server = Thread(target=self.start_fastapi_server, daemon=True)
-        self.fastapi_server.start()
+        # শাটডাউন সিগনাল হ্যান্ডলিং
+        self.install_signal_handlers()
         
-        # Telegram বট শুরু
-        await self.start_telegram_bot()
+        # FastAPI সার্ভার ও Telegram বট একই লুপে শুরু,
+        # একাধিক ওয়ার্কার হলে API আলাদা প্রসেসে
+        if Config.API_WORKERS > 1:
+            await self.start_api_workers()
+        else:
+            await self.start_fastapi_server()
+        with startup_timer("init", "telegram_bot"):
+            await self.start_telegram_bot()
         
         logger.info("✅ সব সার্ভিস সক্রিয়!")
+        log_startup_report()
         logger.info("📊 কমান্ড ব্যবহার করুন: /start, /status, /files")
+    
+    def install_signal_handlers(self):
+        """লুপ-অ্যাওয়ার সিগনাল হ্যান্ডলার"""
+        loop = asyncio.get_running_loop()
         
-        # শাটডাউন সিগনাল হ্যান্ডলিং
-        signal.signal(signal.SIGINT, self.shutdown)
-        signal.signal(signal.SIGTERM, self.shutdown)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown)
+            except NotImplementedError:
+                # Windows-এ add_signal_handler নেই
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self.request_shutdown))
     
-    def shutdown(self, signum, frame):
-        """সার্ভার বন্ধ"""
+    def request_shutdown(self):
+        """শাটডাউন রিকোয়েস্ট - মেইন লুপ জাগিয়ে তোলে"""
+        if not self.is_running:
+            return
+        
         logger.info("🛑 সার্ভার বন্ধ হচ্ছে...")
         self.is_running = False
+        if self.stop_event:
+            self.stop_event.set()
+    
+    async def shutdown(self):
+        """সার্ভার বন্ধ - নতুন কাজ বন্ধ করে চলমান আপলোড ড্রেইন"""
+        self.is_running = False
         
+        # আগে বট থামানো যাতে নতুন কমান্ড না আসে
         if self.telegram_app:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.telegram_app.stop())
-            loop.run_until_complete(self.telegram_app.shutdown())
+            try:
+                if self.telegram_app.updater and self.telegram_app.updater.running:
+                    await self.telegram_app.updater.stop()
+                if self.telegram_app.running:
+                    await self.telegram_app.stop()
+                await self.telegram_app.shutdown()
+            except Exception as e:
+                logger.error(f"❌ Telegram বট বন্ধ করতে এরর: {e}")
+        
+        # uvicorn নতুন কানেকশন বন্ধ করে চলমান রিকোয়েস্ট শেষ করে,
+        # তারপর shutdown ইভেন্টে আপলোড ড্রেইন ও পেন্ডিং রাইট ফ্লাশ হয়
+        if self.api_server and self.api_task:
+            # SSE স্ট্রিম বন্ধ, নইলে কানেকশন ড্রেইন টাইমআউট পর্যন্ত আটকে থাকে
+            event_publisher.close()
+            self.api_server.should_exit = True
+            try:
+                await self.api_task
+            except BaseException as e:
+                logger.error(f"❌ FastAPI সার্ভার বন্ধ করতে এরর: {e!r}")
+        
+        # ওয়ার্কার মোড - uvicorn সুপারভাইজার SIGTERM পেলে সব ওয়ার্কার ড্রেইন করে
+        if self.api_process and self.api_process.returncode is None:
+            self.api_process.terminate()
+            await self.api_process.wait()
         
         logger.info("👋 সার্ভার বন্ধ হয়েছে")
-        sys.exit(0)
     
     async def run_forever(self):
         """মেইন লুপ"""
-        while self.is_running:
-            await asyncio.sleep(1)
+        await self.stop_event.wait()
 
 async def main():
     """মেইন ফাংশন"""
@@ -126,11 +212,10 @@ async def main():
     try:
         await server.start()
         await server.run_forever()
-    except KeyboardInterrupt:
-        server.shutdown(None, None)
     except Exception as e:
         logger.error(f"❌ মেইন ফাংশন এরর: {e}")
-        server.shutdown(None, None)
+    finally:
+        await server.shutdown()
 
 if __name__ == "__main__":
     # ASCII আর্ট
@@ -142,4 +227,7 @@ if __name__ == "__main__":
     ╚══════════════════════════════════════╝
     """)
     
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     asyncio.run(main())
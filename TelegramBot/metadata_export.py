@@ -0,0 +1,108 @@
+"""
+METADATA_EXPORT.PY - ফাইল ক্যাটালগ ও অ্যাক্টিভিটি লগের স্ট্রিমিং CSV/NDJSON এক্সপোর্ট
+
+ডাটাবেজ কার্সর থেকে ব্যাচে রো এনে সাথে সাথে এনকোড করা হয় - মেমোরিতে একটি
+আউটপুট ব্লকের বেশি থাকে না, তাই দশ লাখ রো-র ক্যাটালগও স্থির মেমোরিতে এক্সপোর্ট হয়।
+"""
+
+import csv
+import io
+import zlib
+from typing import Iterable, Iterator, List, Sequence
+
+import orjson
+
+from config import Config
+from metrics import EXPORT_BYTES
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', '.csv'),
+    'ndjson': ('application/x-ndjson', '.ndjson'),
+}
+GZIP_MEDIA_TYPE = 'application/gzip'
+
+
+def _block_size() -> int:
+    return Config.METADATA_EXPORT_BLOCK_KB * 1024
+
+
+def _encode_csv(columns: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM - Excel-এ বাংলা ফাইলনেম ঠিকমতো দেখায়
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    limit = _block_size()
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= limit:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _encode_ndjson(columns: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    parts: List[bytes] = []
+    size = 0
+    limit = _block_size()
+    tags_index = columns.index('tags') if 'tags' in columns else None
+
+    for row in rows:
+        record = dict(zip(columns, row))
+        if tags_index is not None:
+            # tags কলাম আগে থেকেই JSON - আবার পার্স না করে সরাসরি বসানো
+            record['tags'] = orjson.Fragment(row[tags_index] or '[]')
+        line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        parts.append(line)
+        size += len(line)
+        if size >= limit:
+            yield b"".join(parts)
+            parts = []
+            size = 0
+    yield b"".join(parts)
+
+
+def encode_rows(columns: Sequence[str], rows: Iterable[tuple], export_format: str,
+                compress: bool = False) -> Iterator[bytes]:
+    """টাপল রো থেকে CSV/NDJSON বাইট ব্লক (compress হলে gzip স্ট্রিম)"""
+    encoder = _encode_csv if export_format == 'csv' else _encode_ndjson
+    blocks = encoder(list(columns), rows)
+    if compress:
+        blocks = gzip_blocks(blocks)
+
+    total = 0
+    try:
+        for block in blocks:
+            if block:
+                total += len(block)
+                yield block
+    finally:
+        EXPORT_BYTES.inc(total, format=export_format)
+
+
+def gzip_blocks(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """বাইট ব্লকের স্ট্রিমিং gzip (পুরো আউটপুট মেমোরিতে না রেখে)"""
+    compressor = zlib.compressobj(Config.GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def write_export(dest_path: str, columns: Sequence[str], rows: Iterable[tuple],
+                 export_format: str, compress: bool = True) -> int:
+    """এক্সপোর্ট ফাইলে লেখা (Telegram ডকুমেন্টের জন্য) - লেখা বাইট সংখ্যা রিটার্ন"""
+    written = 0
+    with open(dest_path, 'wb') as f:
+        for block in encode_rows(columns, rows, export_format, compress):
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def export_filename(kind: str, export_format: str, compress: bool, stamp: str) -> str:
+    name = f"{kind}_{stamp}{EXPORT_FORMATS[export_format][1]}"
+    return f"{name}.gz" if compress else name
@@ -0,0 +1,329 @@
+"""
+METRICS.PY - Prometheus টেক্সট ফরম্যাটে মেট্রিক্স (কাউন্টার, গেজ, হিস্টোগ্রাম)
+
+এক্সটার্নাল ডিপেন্ডেন্সি ছাড়া, থ্রেড-সেফ ও কম ওভারহেড।
+মাল্টি-ওয়ার্কার মোডে প্রতিটি প্রসেসের মেট্রিক্স আলাদা।
+"""
+
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CLOUD_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """সব মেট্রিক্সের রেজিস্ট্রি"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+
+    def render(self) -> str:
+        """Prometheus exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+        self._group_functions: List[Tuple[str, Callable[[], Dict[str, float]]]] = []
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], float], **labels):
+        """স্ক্র্যাপের সময় মান হিসাব (কিউ ডেপথ ইত্যাদি)"""
+        self._functions[self._key(labels)] = function
+
+    def set_group_function(self, function: Callable[[], Dict[str, float]], label: str):
+        """একটি হিসাবেই একাধিক সিরিজ - function রিটার্ন করে {label-এর মান: মান}, স্ক্র্যাপে একবার চলে"""
+        self._group_functions.append((label, function))
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        for key, function in self._functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                continue
+        for label, function in self._group_functions:
+            try:
+                group = function()
+            except Exception:
+                continue
+            for label_value, value in group.items():
+                values[self._key({label: label_value})] = value
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [প্রতি বাকেটের কাউন্ট..., sum, count]
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def time(self, **labels) -> '_Timer':
+        """কনটেক্সট ম্যানেজার হিসেবে সময় মাপা"""
+        return _Timer(self, labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+
+        lines = []
+        bucket_labels = self.labelnames + ('le',)
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(bucket_labels, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(bucket_labels, key + ('+Inf',))
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+# ==================== APPLICATION METRICS ====================
+HTTP_REQUEST_SECONDS = Histogram(
+    'backup_http_request_duration_seconds', 'HTTP request latency per route',
+    ('method', 'route', 'status')
+)
+HTTP_RECEIVED_BYTES = Counter(
+    'backup_http_received_bytes_total', 'Request body bytes received per route', ('route',)
+)
+HASH_SECONDS = Histogram(
+    'backup_hash_duration_seconds', 'SHA-256 file hashing time', ('source',)
+)
+HASHED_BYTES = Counter(
+    'backup_hashed_bytes_total', 'Bytes hashed', ('source',)
+)
+CLOUD_REQUEST_SECONDS = Histogram(
+    'backup_cloud_request_duration_seconds', 'Cloud storage call latency',
+    ('operation',), buckets=CLOUD_BUCKETS
+)
+CLOUD_ERRORS = Counter(
+    'backup_cloud_errors_total', 'Failed cloud storage calls', ('operation',)
+)
+DB_QUERY_SECONDS = Histogram(
+    'backup_db_query_duration_seconds', 'DatabaseManager method latency', ('method',)
+)
+UPLOAD_QUEUE_DEPTH = Gauge(
+    'backup_upload_queue_depth', 'Uploads in flight in this process / queued in the shared queue',
+    ('state',)
+)
+CHUNK_BYTES = Counter(
+    'backup_chunk_bytes_total', 'Bytes of chunked uploads, uploaded vs already stored', ('state',)
+)
+DOWNLOAD_CACHE_REQUESTS = Counter(
+    'backup_download_cache_requests_total', 'Download cache lookups', ('result',)
+)
+EXPORT_BYTES = Counter(
+    'backup_export_bytes_total', 'Bytes streamed by archive exports', ('format',)
+)
+THUMBNAIL_RENDER_SECONDS = Histogram(
+    'backup_thumbnail_render_seconds', 'Thumbnail render time in the process pool (incl. queueing)'
+)
+THUMBNAIL_REQUESTS = Counter(
+    'backup_thumbnail_requests_total', 'Thumbnail endpoint cache results', ('result',)
+)
+DELETE_QUEUE_DEPTH = Gauge(
+    'backup_delete_queue_depth', 'Cloud objects waiting for batched deletion', ('state',)
+)
+DELETED_OBJECTS = Counter(
+    'backup_cloud_deleted_objects_total', 'Cloud objects removed by the deletion GC', ('result',)
+)
+RECONCILE_ISSUES = Gauge(
+    'backup_reconcile_open_issues', 'Catalogue/cloud drift found by the last reconciliation', ('kind',)
+)
+BOT_HANDLER_SECONDS = Histogram(
+    'backup_bot_handler_duration_seconds', 'Telegram handler latency', ('handler',)
+)
+BOT_HANDLER_ERRORS = Counter(
+    'backup_bot_handler_errors_total', 'Telegram handler exceptions', ('handler',)
+)
+
+
+def instrument_methods(cls, histogram: Histogram, exclude: Iterable[str] = ()):
+    """ক্লাসের সব পাবলিক মেথডের সময় হিস্টোগ্রামে (method লেবেল)"""
+    excluded = set(exclude)
+    for name, attr in list(vars(cls).items()):
+        if name.startswith('_') or name in excluded or not callable(attr):
+            continue
+
+        def wrap(func, label=name):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start, method=label)
+            return wrapper
+
+        setattr(cls, name, wrap(attr))
+    return cls
+
+
+def track_handler(func):
+    """Telegram হ্যান্ডলারের লেটেন্সি ও এরর"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            BOT_HANDLER_ERRORS.inc(handler=func.__name__)
+            raise
+        finally:
+            BOT_HANDLER_SECONDS.observe(time.perf_counter() - start, handler=func.__name__)
+    return wrapper
+
+
+class MetricsMiddleware:
+    """রাউট টেমপ্লেট অনুযায়ী রিকোয়েস্ট লেটেন্সি ও রিসিভড বাইট (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        received = 0
+        status = 500
+        # আপলোড টাইমলাইনের receive ধাপের জন্য
+        scope['backup.request_start'] = start
+
+        async def receive_wrapper():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            # কাঁচা পাথ নয়, রাউট টেমপ্লেট - হ্যাশ দিয়ে লেবেল বিস্ফোরণ এড়াতে
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope['method'], route=route, status=str(status)
+            )
+            if received:
+                HTTP_RECEIVED_BYTES.inc(received, route=route)
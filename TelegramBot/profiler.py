@@ -0,0 +1,159 @@
+"""
+PROFILER.PY - অপ্ট-ইন রিকোয়েস্ট প্রোফাইলিং (স্যাম্পলিং, flame graph-রেডি আউটপুট)
+
+প্রোফাইল চালু হয় দুইভাবে:
+  1. ভ্যালিড X-API-Key সহ `X-Profile: 1` হেডার
+  2. Config.PROFILE_SAMPLE_RATE অনুযায়ী র‍্যান্ডম স্যাম্পল
+
+আউটপুট "folded stacks" ফরম্যাটে (flamegraph.pl / speedscope সরাসরি পড়ে)।
+স্যাম্পলার প্রসেসের সব থ্রেড দেখে, তাই একসাথে চলা রিকোয়েস্টও মিশে থাকতে পারে।
+"""
+
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# লং-লিভড স্ট্রিম প্রোফাইল করলে লক আটকে থাকে
+PROFILE_EXCLUDE_PATHS = ('/api/events',)
+
+
+class SamplingProfiler:
+    """ব্যাকগ্রাউন্ড থ্রেড থেকে নির্দিষ্ট ইন্টারভালে সব থ্রেডের স্ট্যাক স্যাম্পল"""
+
+    def __init__(self, interval: float = None):
+        self.interval = interval or Config.PROFILE_INTERVAL_MS / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.samples
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                self.samples[self._fold(names.get(ident, str(ident)), frame)] += 1
+
+    @staticmethod
+    def _fold(thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ';'.join(reversed(stack))
+
+
+def write_folded(samples: Counter, path: Path):
+    """folded stacks ফাইল লেখা"""
+    with open(path, 'w') as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def list_profiles() -> List[Dict]:
+    """সেভ করা প্রোফাইল (নতুন আগে)"""
+    folder = Path(Config.PROFILE_DIR)
+    if not folder.exists():
+        return []
+
+    profiles = []
+    for path in sorted(folder.glob("*.folded"), reverse=True):
+        stat = path.stat()
+        profiles.append({
+            'name': path.name,
+            'size': stat.st_size,
+            'created': datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds')
+        })
+    return profiles
+
+
+def _prune_profiles():
+    profiles = sorted(Path(Config.PROFILE_DIR).glob("*.folded"))
+    for path in profiles[:-Config.PROFILE_MAX_FILES]:
+        path.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """প্রতি রিকোয়েস্টে অপ্ট-ইন স্যাম্পলিং প্রোফাইলার (pure ASGI)"""
+
+    def __init__(self, app, verify_api_key):
+        self.app = app
+        self.verify_api_key = verify_api_key
+        # একসাথে একটিই প্রোফাইল - ওভারহেড সীমিত রাখতে
+        self._active = threading.Lock()
+
+    def _wants_profile(self, scope) -> bool:
+        headers = dict(scope.get('headers') or [])
+        if headers.get(b'x-profile') == b'1':
+            api_key = headers.get(b'x-api-key', b'').decode('latin-1')
+            return self.verify_api_key(api_key)
+        return Config.PROFILE_SAMPLE_RATE > 0 and random.random() < Config.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in PROFILE_EXCLUDE_PATHS \
+                or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{scope['method']}"
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                message.setdefault('headers', [])
+                message['headers'] = list(message['headers']) + [
+                    (b'x-profile-id', profile_id.encode())
+                ]
+            await send(message)
+
+        profiler = SamplingProfiler()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            samples = profiler.stop()
+            self._active.release()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            route = getattr(scope.get('route'), 'path', scope['path'])
+            self._save(profile_id, route, elapsed_ms, samples)
+
+    def _save(self, profile_id: str, route: str, elapsed_ms: float, samples: Counter):
+        try:
+            folder = Path(Config.PROFILE_DIR)
+            folder.mkdir(parents=True, exist_ok=True)
+            slug = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+            path = folder / f"{profile_id}_{slug}_{elapsed_ms:.0f}ms.folded"
+            write_folded(samples, path)
+            _prune_profiles()
+            logger.info(f"🔬 প্রোফাইল সেভ: {path.name} ({sum(samples.values())} স্যাম্পল)")
+        except Exception as e:
+            logger.error(f"❌ প্রোফাইল সেভ এরর: {e}")
@@ -0,0 +1,115 @@
+"""
+RECONCILER.PY - ফাইল ক্যাটালগ ও ক্লাউড ইনভেন্টরির ব্যাকগ্রাউন্ড মিলানো
+
+personal_backup/ প্রিফিক্সের সব অবজেক্ট next_cursor দিয়ে পেজ করে আনা হয় (প্রতি
+resource_type আলাদা), প্রতিটি পেজ সাথে সাথে SQLite স্টেজিং টেবিলে যায় - মেমোরিতে
+পুরো লিস্টিং থাকে না। কার্সর প্রতি পেজে সেভ হয়, তাই রেট লিমিট বা রিস্টার্টের পরে
+রান যেখানে থেমেছিল সেখান থেকে চলে। শেষে ইনডেক্সড anti-join-এ দুই দিকের ডিফ
+reconcile_issues টেবিলে রিপেয়ারের জন্য রেকর্ড হয়।
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from config import Config
+from metrics import RECONCILE_ISSUES
+
+if TYPE_CHECKING:
+    from cloudinary_handler import CloudinaryManager
+    from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# "auto" আপলোড তিন ধরনের রিসোর্সেই যেতে পারে - Admin API প্রতিটি আলাদা লিস্ট করে
+RESOURCE_TYPES = ('image', 'video', 'raw')
+ISSUE_KINDS = ('missing_in_cloud', 'untracked_in_cloud')
+
+
+def _db_timestamp(created_at: str) -> Optional[str]:
+    """Cloudinary-র ISO সময় (UTC) → SQLite CURRENT_TIMESTAMP ফরম্যাট"""
+    if not created_at:
+        return None
+    return created_at.replace('T', ' ').rstrip('Z')[:19]
+
+
+class CloudReconciler:
+    """একবারে একটি রান (সব ওয়ার্কারের মধ্যে) - লিজ ডাটাবেজে"""
+
+    def __init__(self, db: "DatabaseManager", cloud: "CloudinaryManager"):
+        self.db = db
+        self.cloud = cloud
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = asyncio.Lock()
+
+    def _fetch_page(self, run: Dict) -> Tuple[List[Tuple], Dict]:
+        resource_type = RESOURCE_TYPES[run['stage']]
+        page = self.cloud.list_resources_page(
+            resource_type, Config.RECONCILE_PREFIX, run['next_cursor'], Config.RECONCILE_PAGE_SIZE
+        )
+        resources = [
+            (item['public_id'], resource_type, item.get('bytes'), _db_timestamp(item.get('created_at')))
+            for item in page['resources']
+        ]
+        return resources, page
+
+    async def run(self, force: bool = False) -> Optional[Dict]:
+        """রান শুরু/রিজিউম করে শেষ পর্যন্ত চালানো - রেট লিমিটে থামলে বা অন্য ওয়ার্কার চালালে None"""
+        async with self._lock:
+            run = await asyncio.to_thread(
+                self.db.claim_reconcile_run, self.worker_id, Config.RECONCILE_LEASE_SECONDS,
+                Config.RECONCILE_INTERVAL_SECONDS, force
+            )
+            if run is None:
+                return None
+            if run['stage'] or run['next_cursor']:
+                logger.info(f"🔁 রিকনসিলিয়েশন #{run['id']} রিজিউম ({run['cloud_objects']}টি অবজেক্ট আগেই দেখা)")
+
+            last_call = 0.0
+            while run['stage'] < len(RESOURCE_TYPES):
+                wait = Config.RECONCILE_MIN_REQUEST_INTERVAL_SECONDS - (time.monotonic() - last_call)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                resources, page = await asyncio.to_thread(self._fetch_page, run)
+                last_call = time.monotonic()
+
+                run['next_cursor'] = page['next_cursor']
+                if not run['next_cursor']:
+                    run['stage'] += 1
+                await asyncio.to_thread(
+                    self.db.save_reconcile_page, run['id'], self.worker_id, resources,
+                    run['stage'], run['next_cursor']
+                )
+
+                remaining = page['rate_limit_remaining']
+                if remaining is not None and remaining <= Config.RECONCILE_RATE_LIMIT_RESERVE:
+                    reset_at = page['rate_limit_reset_at']
+                    reset_text = (
+                        datetime.fromtimestamp(reset_at, timezone.utc).strftime('%H:%M UTC')
+                        if reset_at else "?"
+                    )
+                    logger.warning(
+                        f"⚠️ Admin API কোটা প্রায় শেষ ({remaining} বাকি) - রিকনসিলিয়েশন "
+                        f"#{run['id']} থামানো হল, রিসেট {reset_text}"
+                    )
+                    return None
+
+            result = await asyncio.to_thread(
+                self.db.finish_reconcile_run, run['id'], Config.RECONCILE_GRACE_SECONDS
+            )
+
+        status = await asyncio.to_thread(self.db.get_reconcile_status)
+        for kind in ISSUE_KINDS:
+            RECONCILE_ISSUES.set(status['open_issues'].get(kind, 0), kind=kind)
+
+        logger.info(
+            f"🔍 রিকনসিলিয়েশন #{result['id']}: {result['cloud_objects']}টি ক্লাউড অবজেক্ট, "
+            f"{result['missing']}টি ক্লাউডে নেই, {result['untracked']}টি ট্র্যাক করা নেই, "
+            f"{result['resolved']}টি ঠিক হয়েছে ({result['api_calls']}টি API কল)"
+        )
+        return result
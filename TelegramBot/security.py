@@ -6,6 +6,7 @@ import hashlib
 import hmac
 import base64
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 import jwt
@@ -55,6 +56,17 @@ class SecurityManager:
         """API কি ভেরিফাই"""
         return hmac.compare_digest(api_key, Config.API_ACCESS_TOKEN)
     
+    def sign_path(self, path: str, expires: int) -> str:
+        """একটি রিসোর্স পাথের স্বল্পমেয়াদি সিগনেচার (লিংকে মাস্টার API কি না দিয়ে)"""
+        digest = hmac.new(self.secret_key, f"{path}:{expires}".encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    
+    def verify_path_signature(self, path: str, expires: int, signature: str) -> bool:
+        """সিগনেচার এই পাথেরই এবং মেয়াদ শেষ হয়নি"""
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.sign_path(path, expires), signature)
+    
     def verify_telegram_user(self, user_id: int) -> bool:
         """Telegram ইউজার ভেরিফাই"""
         return user_id == Config.YOUR_TELEGRAM_USER_ID
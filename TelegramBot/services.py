@@ -0,0 +1,122 @@
+"""
+SERVICES.PY - শেয়ার্ড লেজি সার্ভিস কন্টেইনার ও স্টার্টআপ টাইমিং
+
+বট ও API দুজনেই এখান থেকে ম্যানেজার নেয় - একই প্রসেসে প্রতিটির একটিই
+ইনস্ট্যান্স। ম্যানেজার (এবং তার ভারী SDK ইমপোর্ট) প্রথম ব্যবহারের সময় তৈরি হয়,
+তাই ইমপোর্টের সময় ডাটাবেজ DDL বা ক্লাউড SDK লোড হয় না।
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (kind, name, seconds) - kind হলো import বা init
+STARTUP_TIMINGS: List[Tuple[str, str, float]] = []
+
+# সার্ভিস নাম → (মডিউল, ক্লাস, নির্ভরশীল সার্ভিস)
+SERVICE_FACTORIES: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    'db': ('database', 'DatabaseManager', ()),
+    'cloudinary': ('cloudinary_handler', 'CloudinaryManager', ()),
+    'security': ('security', 'SecurityManager', ()),
+    'file_manager': ('file_manager', 'FileManager', ()),
+    'chunk_store': ('chunk_store', 'ChunkStore', ('db', 'cloudinary')),
+}
+
+
+@contextmanager
+def startup_timer(kind: str, name: str):
+    """ব্লকের সময় স্টার্টআপ রিপোর্টে যোগ"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS.append((kind, name, time.perf_counter() - start))
+
+
+def timed_import(module_name: str):
+    """মডিউল ইমপোর্ট (প্রথমবার হলে সময় রেকর্ড)"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with startup_timer("import", module_name):
+        return importlib.import_module(module_name)
+
+
+def startup_report() -> List[Dict]:
+    """ধীর থেকে দ্রুত ক্রমে ইমপোর্ট ও ইনিশিয়ালাইজারের সময়"""
+    return [
+        {'kind': kind, 'name': name, 'ms': round(seconds * 1000, 1)}
+        for kind, name, seconds in sorted(STARTUP_TIMINGS, key=lambda item: item[2], reverse=True)
+    ]
+
+
+def log_startup_report(limit: int = 10):
+    entries = startup_report()
+    if not entries:
+        return
+    lines = "\n".join(
+        f"   {entry['kind']:6s} {entry['name']:24s} {entry['ms']:8.1f} ms" for entry in entries[:limit]
+    )
+    logger.info(f"⏱️ স্টার্টআপ টাইমিং (ধীরতম {min(limit, len(entries))}টি):\n{lines}")
+
+
+class ServiceContainer:
+    """নাম ধরে সার্ভিস - প্রথম get()-এ তৈরি, তারপর সবাই একই ইনস্ট্যান্স পায়"""
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        # RLock - chunk_store তৈরির সময় db/cloudinary-ও তৈরি হতে পারে
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                module_name, class_name, dependencies = SERVICE_FACTORIES[name]
+                args = [self.get(dependency) for dependency in dependencies]
+                factory = getattr(timed_import(module_name), class_name)
+                with startup_timer("init", class_name):
+                    instance = factory(*args)
+                self._instances[name] = instance
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def lazy(self, name: str) -> "LazyService":
+        return LazyService(self, name)
+
+
+class LazyService:
+    """মডিউল-লেভেল ভেরিয়েবলের জন্য প্রক্সি - প্রথম অ্যাট্রিবিউট অ্যাক্সেসে সার্ভিস তৈরি"""
+
+    __slots__ = ('_container', '_name', '_instance')
+
+    def __init__(self, container: ServiceContainer, name: str):
+        object.__setattr__(self, '_container', container)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_instance', None)
+
+    def __getattr__(self, attr: str):
+        instance = self._instance
+        if instance is None:
+            instance = self._container.get(self._name)
+            object.__setattr__(self, '_instance', instance)
+        return getattr(instance, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._container.is_loaded(self._name) else "lazy"
+        return f"<LazyService {self._name} ({state})>"
+
+
+services = ServiceContainer()
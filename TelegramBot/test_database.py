@@ -0,0 +1,81 @@
+"""
+TEST_DATABASE.PY - DatabaseManager-এর রিগ্রেশন টেস্ট (pytest)
+
+ব্যবহার (TelegramBot ফোল্ডার থেকে):
+    python -m pytest -q test_database.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from database import DatabaseManager
+
+
+def _add_files(db: DatabaseManager, count: int):
+    for index in range(count):
+        db.add_file({
+            'file_hash': f'hash-{index}',
+            'original_path': f'/sdcard/DCIM/photo-{index}.jpg',
+            'filename': f'photo-{index}.jpg',
+            'file_size': 1000 + index,
+            'file_type': 'image',
+            'cloudinary_id': f'backup/photo-{index}',
+            'cloudinary_url': f'https://example.invalid/photo-{index}.jpg',
+        })
+
+
+def _consume_alternating(rows) -> list:
+    """StreamingResponse-এর মতো প্রতিটি next() আলাদা থ্রেডে (দুটি থ্রেড পালাক্রমে)"""
+    executors = [ThreadPoolExecutor(max_workers=1), ThreadPoolExecutor(max_workers=1)]
+    collected = []
+    try:
+        step = 0
+        while True:
+            row = executors[step % 2].submit(next, rows, None).result()
+            if row is None:
+                return collected
+            collected.append(row)
+            step += 1
+    finally:
+        for executor in executors:
+            executor.shutdown()
+
+
+def test_iter_file_rows_survives_thread_switches(tmp_path):
+    """batch_size=1 - প্রতিটি fetchmany সীমা অন্য থ্রেডে পার হয়"""
+    db = DatabaseManager(str(tmp_path / 'backup.db'))
+    _add_files(db, 5)
+
+    collected = _consume_alternating(db.iter_file_rows(['file_hash', 'filename'], batch_size=1))
+
+    assert [file_hash for file_hash, _ in collected] == [f'hash-{index}' for index in range(5)]
+
+
+def test_iter_activity_rows_survives_thread_switches(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'backup.db'))
+    for index in range(3):
+        db.log_activity('upload', f'file {index}')
+
+    collected = _consume_alternating(db.iter_activity_rows(batch_size=1))
+
+    assert len(collected) == 3
+
+
+def test_purge_does_not_write_second_tombstone(tmp_path):
+    """সফট-ডিলিটে একবার delete - পার্জে (হার্ড ডিলিট) চেঞ্জ ফিডে নতুন এন্ট্রি নয়"""
+    db = DatabaseManager(str(tmp_path / 'backup.db'))
+    _add_files(db, 2)
+    db.delete_files(['hash-0'])
+    with db.get_connection() as conn:
+        conn.execute("UPDATE files SET deleted_at = datetime('now', '-30 days') WHERE file_hash = 'hash-0'")
+        conn.execute('DELETE FROM delete_queue')
+        conn.commit()
+    latest = db.get_change_feed_state()['latest']
+
+    assert db.purge_deleted_files(retention_days=7) == 1
+    assert db.get_change_feed_state()['latest'] == latest
+
+    # সক্রিয় রো সরাসরি মুছলে আগের মতোই টুম্বস্টোন
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM files WHERE file_hash = 'hash-1'")
+        conn.commit()
+    assert [row[1:3] for row in db.get_changes(latest, [])] == [('delete', 'hash-1')]
@@ -0,0 +1,171 @@
+"""
+THUMBNAILS.PY - সার্ভার-সাইড থাম্বনেইল (Pillow, প্রসেস পুলে, file_hash কী-তে WebP ক্যাশ)
+
+আপলোড শেষে ছবির থাম্বনেইল প্রসেস পুলে তৈরি হয় - আপলোড রেসপন্স অপেক্ষা করে না।
+ক্যাশে না থাকলে (পুরনো ফাইল) প্রথম রিকোয়েস্টে অরিজিনাল নামিয়ে একবারই তৈরি হয়।
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from config import Config
+from metrics import THUMBNAIL_RENDER_SECONDS, THUMBNAIL_REQUESTS
+
+# Pillow শুধু চাইল্ড প্রসেসে ইমপোর্ট হয় - সার্ভারের স্টার্টআপে লোড হয় না
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp')
+
+
+def thumbnail_path(file_hash: str) -> Path:
+    """ক্যাশ পাথ (হ্যাশের প্রথম দুই অক্ষরে সাব-ফোল্ডার)"""
+    return Path(Config.THUMBNAIL_DIR) / file_hash[:2] / f"{file_hash}.webp"
+
+
+def render_thumbnail(source_path: str, dest_path: str, size: int, quality: int) -> int:
+    """থাম্বনেইল তৈরি (চাইল্ড প্রসেসে চলে) - WebP বাইট সাইজ রিটার্ন"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as image:
+        # JPEG ডিকোডারকে ছোট স্কেলে পড়তে বলা - বড় ছবিতে অনেক দ্রুত
+        image.draft('RGB', (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+        temp_path = f"{dest_path}.{os.getpid()}.tmp"
+        image.save(temp_path, 'WEBP', quality=quality, method=4)
+
+    # অ্যাটমিক রিনেম - অর্ধেক লেখা ফাইল কখনো সার্ভ হয় না
+    os.replace(temp_path, dest_path)
+    return os.path.getsize(dest_path)
+
+
+class ThumbnailService:
+    """প্রসেস পুল ও ইন-ফ্লাইট কোয়েলেসিং (একই হ্যাশের জন্য একবারই রেন্ডার)"""
+
+    def __init__(self, fetch_original: Callable[[Dict, str], None]):
+        self.fetch_original = fetch_original
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def available(self) -> bool:
+        return Config.THUMBNAIL_ENABLED and PIL_AVAILABLE
+
+    @staticmethod
+    def supports(filename: str) -> bool:
+        return Path(filename or "").suffix.lower() in THUMBNAIL_EXTENSIONS
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=Config.THUMBNAIL_WORKERS)
+        return self._pool
+
+    def _staging_path(self, file_hash: str, filename: str) -> Path:
+        folder = Path(Config.THUMBNAIL_DIR) / ".incoming"
+        folder.mkdir(parents=True, exist_ok=True)
+        return folder / f"{file_hash}_{uuid.uuid4().hex}{Path(filename).suffix.lower()}"
+
+    def schedule(self, file_hash: str, source_path: str) -> Optional[Future]:
+        """আপলোড শেষে থাম্বনেইল কিউ করা (থ্রেড-সেফ, ব্লক করে না)
+
+        স্পুল ফাইল রিকোয়েস্ট শেষে মুছে যায়, তাই হার্ড লিংক করে রাখা হয় (কপি নয়)।
+        """
+        if not self.available or not self.supports(source_path):
+            return None
+        if thumbnail_path(file_hash).exists():
+            return None
+
+        with self._lock:
+            if file_hash in self._pending:
+                return self._pending[file_hash]
+
+            staged = self._staging_path(file_hash, source_path)
+            try:
+                os.link(source_path, staged)
+            except OSError:
+                shutil.copyfile(source_path, staged)
+            return self._submit(file_hash, staged)
+
+    def _submit(self, file_hash: str, staged: Path) -> Future:
+        """লক ধরে রেখে কল করতে হবে"""
+        dest = thumbnail_path(file_hash)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        future = self._get_pool().submit(
+            render_thumbnail, str(staged), str(dest),
+            Config.THUMBNAIL_SIZE, Config.THUMBNAIL_QUALITY
+        )
+
+        def done(finished: Future):
+            THUMBNAIL_RENDER_SECONDS.observe(time.perf_counter() - start)
+            staged.unlink(missing_ok=True)
+            with self._lock:
+                self._pending.pop(file_hash, None)
+            if not finished.cancelled() and finished.exception():
+                logger.error(f"❌ থাম্বনেইল তৈরি এরর ({file_hash[:12]}): {finished.exception()}")
+
+        self._pending[file_hash] = future
+        future.add_done_callback(done)
+        return future
+
+    async def get(self, file_info: Dict) -> Optional[Path]:
+        """থাম্বনেইল পাথ - ক্যাশে না থাকলে অরিজিনাল নামিয়ে তৈরি (None = সম্ভব নয়)"""
+        file_hash = file_info['file_hash']
+        path = thumbnail_path(file_hash)
+        if path.exists():
+            THUMBNAIL_REQUESTS.inc(result="hit")
+            return path
+
+        if not self.available or not self.supports(file_info['filename']):
+            THUMBNAIL_REQUESTS.inc(result="unsupported")
+            return None
+
+        THUMBNAIL_REQUESTS.inc(result="miss")
+        with self._lock:
+            future = self._pending.get(file_hash)
+
+        if future is None:
+            staged = self._staging_path(file_hash, file_info['filename'])
+            try:
+                await asyncio.to_thread(self.fetch_original, file_info, str(staged))
+            except Exception as e:
+                staged.unlink(missing_ok=True)
+                logger.error(f"❌ থাম্বনেইলের জন্য অরিজিনাল ডাউনলোড এরর: {e}")
+                return None
+
+            with self._lock:
+                future = self._pending.get(file_hash)
+                if future is None:
+                    future = self._submit(file_hash, staged)
+                else:
+                    staged.unlink(missing_ok=True)
+
+        try:
+            await asyncio.wrap_future(future)
+        except Exception:
+            return None
+        return path if path.exists() else None
+
+    def discard(self, file_hash: str):
+        """ফাইল ডিলিট হলে থাম্বনেইলও মোছা"""
+        thumbnail_path(file_hash).unlink(missing_ok=True)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
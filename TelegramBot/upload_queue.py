@@ -0,0 +1,136 @@
+"""
+UPLOAD_QUEUE.PY - শেয়ার্ড আপলোড কিউ ওয়ার্কার (SQLite ভিত্তিক, মাল্টি-প্রসেস সেফ)
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import socket
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def create_spool_path(filename: str) -> str:
+    """ইউনিক স্পুল ডিরেক্টরিতে টেম্প পাথ (ওয়ার্কারদের মধ্যে নাম কলিশন এড়াতে)"""
+    os.makedirs(Config.UPLOAD_SPOOL_DIR, exist_ok=True)
+    spool_dir = tempfile.mkdtemp(prefix="upload_", dir=Config.UPLOAD_SPOOL_DIR)
+    return os.path.join(spool_dir, Path(filename or "upload").name)
+
+
+def remove_spool_path(spool_path: str):
+    """স্পুল ফাইল ও তার ডিরেক্টরি ডিলিট"""
+    shutil.rmtree(os.path.dirname(spool_path), ignore_errors=True)
+
+
+class UploadQueueWorker:
+    """কিউ থেকে জব নিয়ে ক্লাউডে আপলোড করে - প্রতিটি API প্রসেসে একটি করে চলে"""
+    
+    def __init__(self, db: DatabaseManager, handler: Callable[[Dict], Dict],
+                 concurrency: int = None, tracker=None):
+        self.db = db
+        self.handler = handler
+        self.concurrency = concurrency or Config.UPLOAD_QUEUE_CONCURRENCY
+        self.tracker = tracker
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.tasks: List[asyncio.Task] = []
+        self.sweeper: Optional[asyncio.Task] = None
+        self.is_running = False
+    
+    async def start(self):
+        """কিউ কনজিউমার ও stale সুইপার শুরু"""
+        self.is_running = True
+        
+        await self._requeue_stale()
+        self.sweeper = asyncio.create_task(self._sweep())
+        self.tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.concurrency)
+        ]
+        logger.info(f"✅ আপলোড কিউ ওয়ার্কার শুরু ({self.worker_id}, x{self.concurrency})")
+    
+    async def stop(self):
+        """নতুন জব নেওয়া বন্ধ - চলমান জব শেষ হতে দেয়"""
+        self.is_running = False
+        if self.sweeper:
+            self.sweeper.cancel()
+            self.sweeper = None
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+    
+    async def _requeue_stale(self):
+        """হার্টবিট থেমে যাওয়া (ক্র্যাশ করা ওয়ার্কারের) জব আবার কিউতে, সীমা পার হলে failed"""
+        stale_jobs = await asyncio.to_thread(
+            self.db.requeue_stale_upload_jobs, Config.UPLOAD_JOB_STALE_SECONDS,
+            Config.UPLOAD_JOB_MAX_ATTEMPTS
+        )
+        requeued = sum(1 for job in stale_jobs if job['status'] == 'pending')
+        for job in stale_jobs:
+            if job['status'] == 'failed':
+                remove_spool_path(job['spool_path'])
+        if requeued:
+            logger.info(f"♻️ {requeued}টি আটকে থাকা আপলোড জব আবার কিউতে")
+        if len(stale_jobs) > requeued:
+            logger.warning(f"⚠️ {len(stale_jobs) - requeued}টি আটকে থাকা জব চেষ্টার সীমা পার - failed")
+    
+    async def _sweep(self):
+        """চলার সময়ও নিয়মিত সুইপ - মরে যাওয়া ওয়ার্কারের জব বেঁচে থাকা ওয়ার্কার নেয়"""
+        while self.is_running:
+            await asyncio.sleep(Config.UPLOAD_JOB_STALE_SECONDS)
+            try:
+                await self._requeue_stale()
+            except Exception as e:
+                logger.error(f"❌ আটকে থাকা আপলোড জব সুইপ এরর: {e}")
+    
+    async def _run(self):
+        while self.is_running:
+            try:
+                job = await asyncio.to_thread(self.db.claim_upload_job, self.worker_id)
+            except Exception as e:
+                logger.error(f"❌ আপলোড জব ক্লেইম এরর: {e}")
+                job = None
+            
+            if job is None:
+                await asyncio.sleep(Config.UPLOAD_QUEUE_POLL_SECONDS)
+                continue
+            
+            if self.tracker:
+                async with self.tracker.track():
+                    await self._process(job)
+            else:
+                await self._process(job)
+    
+    async def _heartbeat(self, job_id: int):
+        """জব চলাকালীন updated_at নিয়মিত রিফ্রেশ - অন্য ওয়ার্কারের রিস্টার্টে এটি stale নয়"""
+        while True:
+            await asyncio.sleep(Config.UPLOAD_JOB_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(self.db.touch_upload_job, job_id, self.worker_id)
+            except Exception as e:
+                logger.warning(f"⚠️ আপলোড জব #{job_id} হার্টবিট এরর: {e}")
+    
+    async def _process(self, job: Dict):
+        """একটি জব প্রসেস - ব্যর্থ হলে সীমা পর্যন্ত আবার চেষ্টা"""
+        finished = True
+        heartbeat = asyncio.create_task(self._heartbeat(job['id']))
+        try:
+            result = await asyncio.to_thread(self.handler, job)
+            await asyncio.to_thread(
+                self.db.complete_upload_job,
+                job['id'], result['file_hash'], result['cloudinary_url']
+            )
+        except Exception as e:
+            retry = job['attempts'] < Config.UPLOAD_JOB_MAX_ATTEMPTS
+            finished = not retry
+            logger.error(f"❌ আপলোড জব #{job['id']} ব্যর্থ (চেষ্টা {job['attempts']}): {e}")
+            await asyncio.to_thread(self.db.fail_upload_job, job['id'], str(e), retry)
+        finally:
+            heartbeat.cancel()
+            if finished:
+                remove_spool_path(job['spool_path'])
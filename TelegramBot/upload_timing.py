@@ -0,0 +1,106 @@
+"""
+UPLOAD_TIMING.PY - আপলোডের ধাপভিত্তিক টাইমলাইন (Server-Timing ও স্লোয়েস্ট আপলোড ভিউ)
+"""
+
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTimeline:
+    """একটি আপলোডের ধাপ: receive → write → hash → cloud → db"""
+
+    def __init__(self, filename: str, device_id: str, request_start: Optional[float] = None):
+        self.filename = filename
+        self.device_id = device_id
+        self.request_start = request_start
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.file_size = 0
+        self.status = "ok"
+
+        # রিকোয়েস্ট শুরু থেকে হ্যান্ডলার পর্যন্ত = বডি রিসিভ ও multipart পার্স
+        if request_start is not None:
+            self.stages['receive'] = self.start - request_start
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        origin = self.request_start if self.request_start is not None else self.start
+        return time.perf_counter() - origin
+
+    def server_timing(self) -> str:
+        """Server-Timing হেডার মান (মিলিসেকেন্ড)"""
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(parts)
+
+    def finish(self, status: str = None) -> Dict:
+        """টাইমলাইন শেষ - স্ট্রাকচার্ড লগ ও স্লোয়েস্ট ভিউতে যোগ"""
+        if status:
+            self.status = status
+
+        entry = {
+            'event': 'upload_timing',
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'filename': self.filename,
+            'device_id': self.device_id,
+            'file_size': self.file_size,
+            'status': self.status,
+            'total_ms': round(self.total * 1000, 1),
+            'stages_ms': {name: round(seconds * 1000, 1) for name, seconds in self.stages.items()},
+        }
+        logger.info(json.dumps(entry, ensure_ascii=False))
+        slowest_uploads.add(entry)
+        return entry
+
+
+class SlowestUploads:
+    """সাম্প্রতিক আপলোডের রোলিং উইন্ডো থেকে সবচেয়ে ধীরগুলো"""
+
+    def __init__(self, window: int = None):
+        self.entries = deque(maxlen=window or Config.UPLOAD_TIMING_WINDOW)
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict):
+        with self._lock:
+            self.entries.append(entry)
+
+    def slowest(self, limit: int = 20) -> List[Dict]:
+        with self._lock:
+            entries = list(self.entries)
+        return heapq.nlargest(limit, entries, key=lambda entry: entry['total_ms'])
+
+    def stage_summary(self) -> Dict[str, float]:
+        """উইন্ডোতে প্রতিটি ধাপের গড় (ms)"""
+        with self._lock:
+            entries = list(self.entries)
+
+        totals: Dict[str, List[float]] = {}
+        for entry in entries:
+            for name, ms in entry['stages_ms'].items():
+                totals.setdefault(name, []).append(ms)
+        return {name: round(sum(values) / len(values), 1) for name, values in totals.items()}
+
+
+slowest_uploads = SlowestUploads()